@@ -19,6 +19,7 @@ export function Chat() {
   ]);
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const sessionIdRef = useRef<string | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
   const scrollToBottom = () => {
@@ -45,7 +46,10 @@ export function Chat() {
     setIsLoading(true);
 
     try {
-      const response = await fetch(`http://localhost:8000/chat/message?query=${encodeURIComponent(userInput)}`, {
+      const params = new URLSearchParams({ query: userInput });
+      if (sessionIdRef.current) params.set('session_id', sessionIdRef.current);
+
+      const response = await fetch(`http://localhost:8000/chat/message?${params.toString()}`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -57,6 +61,7 @@ export function Chat() {
       }
 
       const data = await response.json();
+      sessionIdRef.current = data.session_id ?? sessionIdRef.current;
       
       const botMsg: Message = {
         id: (Date.now() + 1).toString(),
@@ -1,12 +1,27 @@
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.src.config.logging_config import setup_logging
+from app.src.config.settings import (
+    CHECKPOINT_PRUNE_INTERVAL_SECONDS,
+    GRAPH_ASYNC,
+    METRICS_ENABLED,
+)
 from app.src.core.app_state import app_state
+from app.src.core.http_client import HttpClient
+from app.src.core.metrics import REQUEST_DURATION
+from app.src.graph.checkpointer import create_checkpointer
 from app.src.graph.flow import build_graph
+from app.src.llm.registry import llm_registry
+from app.src.repositories.storage import storage
+from app.src.services.exchange_service import exchange_service
+from app.src.services.limit_request_analytics import limit_request_analytics
+from app.src.services.model_service import session_store
 
 from .src.routers.routers import api_router
 
@@ -16,8 +31,33 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app_state.graph = build_graph()
+    app_state.http_client = HttpClient()
+    exchange_service.http_client = app_state.http_client
+    app_state.checkpointer = create_checkpointer()
+    pruning = None
+    if app_state.checkpointer is not None:
+        app_state.checkpointer.prune_idle()
+        pruning = asyncio.create_task(
+            app_state.checkpointer.prune_idle_every(CHECKPOINT_PRUNE_INTERVAL_SECONDS)
+        )
+    app_state.graph = build_graph(
+        use_async=GRAPH_ASYNC, checkpointer=app_state.checkpointer
+    )
+    if limit_request_analytics is not None:
+        # Snapshot plus the log tail, so queries never parse the whole log
+        limit_request_analytics.refresh()
     yield
+    exchange_service.http_client = None
+    await app_state.http_client.aclose()
+    await llm_registry.aclose()
+    if pruning is not None:
+        pruning.cancel()
+    if app_state.checkpointer is not None:
+        app_state.checkpointer.close()
+    session_store.close()
+    storage.close()
+    if limit_request_analytics is not None:
+        limit_request_analytics.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -30,4 +70,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+async def observe_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        # No route has path parameters; unknown paths share one label
+        route = request.url.path if "route" in request.scope else "unmatched"
+        REQUEST_DURATION.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route,
+            status=status,
+        )
+
+
+if METRICS_ENABLED:
+    app.middleware("http")(observe_request_latency)
+
 app.include_router(api_router)
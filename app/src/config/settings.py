@@ -0,0 +1,147 @@
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATA_DIR = Path(os.getenv("DATA_DIR", "app/src/data"))
+
+# Storage backend: "csv" (files in DATA_DIR) or "sqlite" (run the migrate command first)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "csv").lower()
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR / 'rito.db'}")
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+
+# Client records of the csv backend: "sharded" (DATA_DIR/clients/<CPF prefix>.csv,
+# built from clients.csv on first use) or "journal" (clients.csv + update journal)
+CLIENT_STORE = os.getenv("CLIENT_STORE", "sharded").lower()
+CLIENT_SHARD_PREFIX_DIGITS = int(os.getenv("CLIENT_SHARD_PREFIX_DIGITS", "2"))
+
+# Client updates journal: compacted into clients.csv after this many entries
+CLIENT_JOURNAL_COMPACT_THRESHOLD = int(
+    os.getenv("CLIENT_JOURNAL_COMPACT_THRESHOLD", "1000")
+)
+
+# Limit-request log of the csv backend: rows are queued and written by a background
+# thread every FLUSH_INTERVAL seconds or BATCH_SIZE rows (0 = write inline).
+# FSYNC "batch" fsyncs each write, "off" leaves it to the OS. The file is rotated
+# into a timestamped segment once it reaches SEGMENT_MAX_BYTES (0 = never)
+LIMIT_LOG_FLUSH_INTERVAL_SECONDS = float(
+    os.getenv("LIMIT_LOG_FLUSH_INTERVAL_SECONDS", "1")
+)
+LIMIT_LOG_BATCH_SIZE = int(os.getenv("LIMIT_LOG_BATCH_SIZE", "512"))
+LIMIT_LOG_FSYNC = os.getenv("LIMIT_LOG_FSYNC", "batch").lower()
+LIMIT_LOG_SEGMENT_MAX_BYTES = int(
+    os.getenv("LIMIT_LOG_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+# Limit-request analytics (csv backend): aggregates snapshotted every SNAPSHOT_EVERY
+# new log rows; per-day rejection counts are kept for RETENTION_DAYS
+LIMIT_ANALYTICS_SNAPSHOT_PATH = Path(
+    os.getenv("LIMIT_ANALYTICS_SNAPSHOT_PATH") or DATA_DIR / "limit_analytics.json"
+)
+LIMIT_ANALYTICS_SNAPSHOT_EVERY = int(
+    os.getenv("LIMIT_ANALYTICS_SNAPSHOT_EVERY", "10000")
+)
+LIMIT_ANALYTICS_RETENTION_DAYS = int(os.getenv("LIMIT_ANALYTICS_RETENTION_DAYS", "90"))
+
+# Conversation sessions
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+# "memory" (one worker) or "sqlite" (shared by every uvicorn worker on the host)
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+SESSION_DB_PATH = Path(os.getenv("SESSION_DB_PATH") or DATA_DIR / "sessions.db")
+
+# Graph checkpoints: "sqlite" (conversations survive restarts) or "none"
+CHECKPOINTER = os.getenv("CHECKPOINTER", "sqlite").lower()
+CHECKPOINT_DB_PATH = Path(
+    os.getenv("CHECKPOINT_DB_PATH") or DATA_DIR / "checkpoints.db"
+)
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "10"))
+CHECKPOINT_MAX_AGE_SECONDS = float(os.getenv("CHECKPOINT_MAX_AGE_SECONDS", "604800"))
+# How often idle threads are pruned while the app runs
+CHECKPOINT_PRUNE_INTERVAL_SECONDS = float(
+    os.getenv("CHECKPOINT_PRUNE_INTERVAL_SECONDS", "3600")
+)
+# A turn holds its conversation's lease this long at most (crashed workers)
+CHECKPOINT_TURN_LEASE_SECONDS = float(os.getenv("CHECKPOINT_TURN_LEASE_SECONDS", "300"))
+
+# Graph execution: "async" drives the graph with ainvoke, "sync" with invoke
+GRAPH_EXECUTION_MODE = os.getenv("GRAPH_EXECUTION_MODE", "async").lower()
+GRAPH_ASYNC = GRAPH_EXECUTION_MODE == "async"
+
+# Exchange quotes (awesomeapi). TTL overrides as "BTC=10,ETH=10"
+EXCHANGE_API_BASE_URL = os.getenv(
+    "EXCHANGE_API_BASE_URL", "https://economia.awesomeapi.com.br"
+)
+EXCHANGE_QUOTE_TTL_SECONDS = float(os.getenv("EXCHANGE_QUOTE_TTL_SECONDS", "60"))
+EXCHANGE_QUOTE_TTL_OVERRIDES = {
+    code.strip().upper(): float(ttl)
+    for code, ttl in (
+        item.split("=", 1)
+        for item in os.getenv("EXCHANGE_QUOTE_TTL_OVERRIDES", "BTC=10,ETH=10").split(
+            ","
+        )
+        if "=" in item
+    )
+}
+EXCHANGE_QUOTE_MAX_STALE_SECONDS = float(
+    os.getenv("EXCHANGE_QUOTE_MAX_STALE_SECONDS", "600")
+)
+EXCHANGE_RATE_LIMIT_PER_SECOND = float(os.getenv("EXCHANGE_RATE_LIMIT_PER_SECOND", "1"))
+EXCHANGE_RATE_LIMIT_BURST = int(os.getenv("EXCHANGE_RATE_LIMIT_BURST", "3"))
+
+# Shared outbound HTTP client (owned by the app lifespan)
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+
+# Circuit breaker per upstream host: opens when the failure rate over the last
+# HTTP_BREAKER_WINDOW calls reaches HTTP_BREAKER_FAILURE_RATE
+HTTP_BREAKER_WINDOW = int(os.getenv("HTTP_BREAKER_WINDOW", "20"))
+HTTP_BREAKER_MIN_CALLS = int(os.getenv("HTTP_BREAKER_MIN_CALLS", "5"))
+HTTP_BREAKER_FAILURE_RATE = float(os.getenv("HTTP_BREAKER_FAILURE_RATE", "0.5"))
+HTTP_BREAKER_OPEN_SECONDS = float(os.getenv("HTTP_BREAKER_OPEN_SECONDS", "30"))
+
+# Supervisor: classify unambiguous messages with rules before asking the LLM
+SUPERVISOR_FAST_PATH = os.getenv("SUPERVISOR_FAST_PATH", "true").lower() == "true"
+
+# Fixed transitions (CPF saved, auth success, limit approved...): "template" renders
+# a canned reply, "llm" asks the model. Per transition as "cpf_saved=llm,exit=template"
+RESPONSE_TEMPLATE_MODE = os.getenv("RESPONSE_TEMPLATE_MODE", "template").lower()
+RESPONSE_TEMPLATE_OVERRIDES = {
+    name.strip(): mode.strip().lower()
+    for name, mode in (
+        item.split("=", 1)
+        for item in os.getenv("RESPONSE_TEMPLATE_OVERRIDES", "").split(",")
+        if "=" in item
+    )
+}
+
+# Conversation memory: past MEMORY_MAX_MESSAGES, older messages are folded into a
+# running summary and only the last MEMORY_WINDOW_MESSAGES are kept
+MEMORY_WINDOW_MESSAGES = int(os.getenv("MEMORY_WINDOW_MESSAGES", "20"))
+MEMORY_MAX_MESSAGES = int(os.getenv("MEMORY_MAX_MESSAGES", "40"))
+
+# LLM provider: one shared model and HTTP pool for every node
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.5"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+# Small-talk reply cache for the supervisor's DIRECT branch ("oi", "obrigado"...):
+# each set of small-talk phrases collects RESPONSE_CACHE_VARIANTS LLM replies, then is
+# answered from memory until RESPONSE_CACHE_TTL_SECONDS after it was first seen
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_VARIANTS = int(os.getenv("RESPONSE_CACHE_VARIANTS", "3"))
+
+# Prometheus metrics at GET /metrics (request, node, LLM and tool latencies)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# POST /credit/scores/recalculate rewrites every score it is sent: it answers
+# 404 while this is empty and otherwise requires it as a Bearer token
+SCORE_RECALCULATE_TOKEN = os.getenv("SCORE_RECALCULATE_TOKEN", "")
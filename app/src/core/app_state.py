@@ -3,6 +3,8 @@
 
 class AppState:
     graph: any
+    http_client: any
+    checkpointer: any = None
 
 
 app_state = AppState()
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.src.config.settings import (
+    HTTP_BREAKER_FAILURE_RATE,
+    HTTP_BREAKER_MIN_CALLS,
+    HTTP_BREAKER_OPEN_SECONDS,
+    HTTP_BREAKER_WINDOW,
+    HTTP_KEEPALIVE_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """The upstream host is failing and calls are being rejected without trying."""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate breaker over the last `window` calls.
+    Once open it rejects calls for `open_seconds`, then lets a single probe
+    through (half-open): success closes it again, failure reopens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        open_seconds: float,
+    ):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._rejected = 0
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Raises CircuitOpenError if the call must not reach the upstream."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self._rejected += 1
+                    raise CircuitOpenError("Circuito aberto: upstream indisponível")
+                self.state = self.HALF_OPEN
+                self._probing = False
+
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self._rejected += 1
+                    raise CircuitOpenError("Circuito meio-aberto: aguardando teste")
+                self._probing = True
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if success:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def cancel(self) -> None:
+        """The call was abandoned by the caller: frees the half-open probe slot."""
+        with self._lock:
+            self._probing = False
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._opened += 1
+        logger.warning(f"Circuit breaker aberto por {self.open_seconds:.0f}s")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "recent_calls": len(self._outcomes),
+                "recent_failures": self._outcomes.count(False),
+                "times_opened": self._opened,
+                "rejected": self._rejected,
+            }
+
+
+class _HostPool:
+    """Per-host concurrency cap plus the counters reported in `stats()`."""
+
+    def __init__(self, limit: int, breaker: CircuitBreaker):
+        self.limit = limit
+        self.breaker = breaker
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.asemaphore: asyncio.Semaphore | None = None
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.requests = 0
+        self.errors = 0
+        self.wait_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def acquired(self, waited: float) -> None:
+        with self.lock:
+            self.waiting -= 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.requests += 1
+            self.wait_seconds += waited
+
+    def released(self, success: bool) -> None:
+        with self.lock:
+            self.in_use -= 1
+            if not success:
+                self.errors += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "limit": self.limit,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "utilization": self.in_use / self.limit,
+                "waiting": self.waiting,
+                "requests": self.requests,
+                "errors": self.errors,
+                "avg_wait_ms": 1000 * self.wait_seconds / self.requests
+                if self.requests
+                else 0.0,
+                "breaker": self.breaker.stats(),
+            }
+
+
+class HttpClient:
+    """
+    Outbound HTTP shared by the whole app: one keep-alive pool for async callers
+    and one for sync callers, at most `max_connections_per_host` concurrent
+    requests per host and a circuit breaker per host.
+    Timeouts, transport errors and 5xx answers count as failures; 4xx do not.
+    """
+
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        keepalive_seconds: float = HTTP_KEEPALIVE_SECONDS,
+        breaker_window: int = HTTP_BREAKER_WINDOW,
+        breaker_min_calls: int = HTTP_BREAKER_MIN_CALLS,
+        breaker_failure_rate: float = HTTP_BREAKER_FAILURE_RATE,
+        breaker_open_seconds: float = HTTP_BREAKER_OPEN_SECONDS,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self._breaker_args = (
+            breaker_window,
+            breaker_min_calls,
+            breaker_failure_rate,
+            breaker_open_seconds,
+        )
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_seconds,
+        )
+        self._client = httpx.Client(timeout=timeout, limits=limits)
+        self._aclient = httpx.AsyncClient(timeout=timeout, limits=limits)
+        self._hosts: dict[str, _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        host = self._host(url)
+        host.breaker.allow()
+
+        with host.lock:
+            host.waiting += 1
+        started = time.monotonic()
+        host.semaphore.acquire()
+        host.acquired(time.monotonic() - started)
+
+        success = False
+        try:
+            response = self._client.get(url, **kwargs)
+            success = response.status_code < 500
+            return response
+        finally:
+            host.semaphore.release()
+            host.released(success)
+            host.breaker.record(success)
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        host = self._host(url)
+        host.breaker.allow()
+
+        if host.asemaphore is None:
+            host.asemaphore = asyncio.Semaphore(host.limit)
+        with host.lock:
+            host.waiting += 1
+        started = time.monotonic()
+
+        acquired = False
+        success = None  # stays None if the caller cancels
+        try:
+            async with host.asemaphore:
+                host.acquired(time.monotonic() - started)
+                acquired = True
+                try:
+                    response = await self._aclient.get(url, **kwargs)
+                    success = response.status_code < 500
+                    return response
+                except Exception:
+                    success = False
+                    raise
+                finally:
+                    host.released(success is not False)
+        finally:
+            if not acquired:
+                with host.lock:
+                    host.waiting -= 1
+            if success is None:
+                # Abandoned while waiting or in flight: says nothing about the upstream.
+                host.breaker.cancel()
+            else:
+                host.breaker.record(success)
+
+    async def aclose(self) -> None:
+        self._client.close()
+        await self._aclient.aclose()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {name: host.stats() for name, host in hosts.items()}
+
+    def _host(self, url: str) -> _HostPool:
+        name = urlsplit(url).netloc
+        host = self._hosts.get(name)
+        if host is None:
+            with self._lock:
+                host = self._hosts.setdefault(
+                    name,
+                    _HostPool(
+                        self.max_connections_per_host,
+                        CircuitBreaker(*self._breaker_args),
+                    ),
+                )
+        return host
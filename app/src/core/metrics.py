@@ -0,0 +1,221 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from app.src.config.settings import METRICS_ENABLED
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds: from a cached template reply (~1ms) to a slow provider round trip
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(
+    names: tuple[str, ...], values: tuple[str, ...], extra: str = ""
+) -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set. Names should end in `_total`."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return super().render() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Current value read from `function` at scrape time: no cost on the hot path."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, function: Callable[[], float]):
+        super().__init__(name, help)
+        self.function = function
+
+    def render(self) -> list[str]:
+        return super().render() + [f"{self.name} {_format_value(self.function())}"]
+
+
+class Histogram(_Metric):
+    """Cumulative buckets, sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (+Inf last), sum]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = {
+                key: (list(counts), total)
+                for key, (counts, total) in self._series.items()
+            }
+
+        lines = super().render()
+        for key, (counts, total) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics exposed at /metrics, in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return (
+            "\n".join(line for metric in self._metrics for line in metric.render())
+            + "\n"
+        )
+
+
+metrics = MetricsRegistry()
+
+REQUEST_DURATION = metrics.register(
+    Histogram(
+        "rito_http_request_duration_seconds",
+        "HTTP request latency until the response starts, by route.",
+        labels=("method", "route", "status"),
+    )
+)
+NODE_DURATION = metrics.register(
+    Histogram(
+        "rito_graph_node_duration_seconds",
+        "Duration of each graph node run, tool nodes included.",
+        labels=("node",),
+    )
+)
+LLM_CALLS = metrics.register(
+    Counter(
+        "rito_llm_calls_total",
+        "LLM calls per graph node; outcome is ok or error (fallback reply sent).",
+        labels=("node", "outcome"),
+    )
+)
+LLM_DURATION = metrics.register(
+    Histogram(
+        "rito_llm_call_duration_seconds",
+        "LLM call latency per graph node.",
+        labels=("node",),
+    )
+)
+LLM_TOKENS = metrics.register(
+    Counter(
+        "rito_llm_tokens_total",
+        "Tokens reported by the provider per graph node; kind is input, cached_input or output.",
+        labels=("node", "kind"),
+    )
+)
+TOOL_DURATION = metrics.register(
+    Histogram(
+        "rito_tool_duration_seconds",
+        "Tool execution latency.",
+        labels=("tool",),
+    )
+)
+TOOL_ERRORS = metrics.register(
+    Counter(
+        "rito_tool_errors_total",
+        "Tool calls that raised or returned an error ToolMessage.",
+        labels=("tool",),
+    )
+)
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from app.src.config.settings import SESSION_DB_PATH, SESSION_STORE
+
+logger = logging.getLogger(__name__)
+
+
+class StaleSessionError(Exception):
+    """The session was saved by another request since it was read."""
+
+
+@dataclass
+class Session:
+    state: dict
+    last_access: float
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Version read by get_or_create; 0 means never saved
+    version: int = 0
+
+
+class SessionStore(ABC):
+    """
+    Conversation state keyed by session id. `lock` serializes turns of a session
+    inside one process; across processes `save` is optimistic: it only succeeds
+    if nobody saved the session since it was read.
+    """
+
+    @abstractmethod
+    def get_or_create(self, session_id: str | None = None) -> tuple[str, Session]:
+        """Returns the session for `session_id`, creating it on first use."""
+
+    @abstractmethod
+    def save(self, session_id: str, state: dict, version: int) -> int:
+        """
+        Stores the state produced by a turn that started from `version` and
+        returns the new version. Raises StaleSessionError on a concurrent save.
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Drops a session. Returns False if it did not exist."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Active session count and eviction counters."""
+
+    def close(self) -> None:
+        """Releases resources on shutdown."""
+        return None
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-memory conversation store keyed by session id.
+    Sessions are kept in LRU order, expire after `ttl_seconds` of inactivity
+    and the oldest one is evicted when `max_sessions` is reached.
+    """
+
+    def __init__(
+        self,
+        state_factory: Callable[[], dict],
+        max_sessions: int = 10000,
+        ttl_seconds: float = 1800,
+    ):
+        self.state_factory = state_factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "hits": 0,
+            "evicted_lru": 0,
+            "expired_ttl": 0,
+            "conflicts": 0,
+        }
+
+    def get_or_create(self, session_id: str | None = None) -> tuple[str, Session]:
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+
+            if session_id and session_id in self._sessions:
+                session = self._sessions[session_id]
+                session.last_access = now
+                self._sessions.move_to_end(session_id)
+                self._stats["hits"] += 1
+                return session_id, session
+
+            session_id = session_id or uuid.uuid4().hex
+            self._make_room()
+
+            session = Session(state=self.state_factory(), last_access=now)
+            self._sessions[session_id] = session
+            self._stats["created"] += 1
+            return session_id, session
+
+    def save(self, session_id: str, state: dict, version: int) -> int:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                # Evicted while the turn was running, keep the newest state.
+                self._make_room()
+                session = Session(state=state, last_access=now, version=version)
+                self._sessions[session_id] = session
+            elif session.version != version:
+                self._stats["conflicts"] += 1
+                raise StaleSessionError(session_id)
+            session.state = state
+            session.version = version + 1
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session.version
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            return {
+                "active_sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "store": "memory",
+                **self._stats,
+            }
+
+    def _make_room(self) -> None:
+        """Evicts least recently used sessions until one more fits."""
+        while len(self._sessions) >= self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            self._stats["evicted_lru"] += 1
+            logger.info(f"Session {evicted_id} evicted (max sessions reached)")
+
+    def _purge_expired(self, now: float) -> None:
+        """Drops idle sessions. The dict is in LRU order, so stop at the first fresh one."""
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access < self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+            self._stats["expired_ttl"] += 1
+
+
+def create_session_store(
+    state_factory: Callable[[], dict],
+    max_sessions: int,
+    ttl_seconds: float,
+    backend: str = SESSION_STORE,
+) -> SessionStore:
+    """Builds the store selected by SESSION_STORE ("memory" or "sqlite")."""
+    if backend == "memory":
+        return MemorySessionStore(state_factory, max_sessions, ttl_seconds)
+
+    if backend == "sqlite":
+        from app.src.core.sqlite_session_store import SqliteSessionStore
+
+        return SqliteSessionStore(
+            SESSION_DB_PATH, state_factory, max_sessions, ttl_seconds
+        )
+
+    raise ValueError(f"SESSION_STORE inválido: {backend}")
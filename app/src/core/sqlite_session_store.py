@@ -0,0 +1,198 @@
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+from weakref import WeakValueDictionary
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.src.core.session_store import Session, SessionStore, StaleSessionError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    state BLOB NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access);
+"""
+
+# Expiry and the max_sessions cap are enforced at most this often per worker
+PURGE_INTERVAL_SECONDS = 10.0
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Session store on a SQLite file (WAL) shared by every uvicorn worker on the
+    host, so any worker can serve any turn of a conversation.
+
+    States are stored as msgpack (LangGraph's serializer, messages included)
+    with a version per session: `save` is a compare-and-set on that version, so
+    when two workers run a turn of the same session at once the second save
+    raises StaleSessionError instead of overwriting the first. Inside a worker,
+    turns of a session share one Session object and its lock, as in
+    MemorySessionStore.
+
+    Expiry uses wall-clock time (shared across processes); sessions past
+    `max_sessions` are evicted oldest first. Counters in `stats` are per worker.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        state_factory: Callable[[], dict],
+        max_sessions: int = 10000,
+        ttl_seconds: float = 1800,
+    ):
+        self.path = Path(path)
+        self.state_factory = state_factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._serde = JsonPlusSerializer()
+        self._lock = threading.Lock()
+        # Sessions with a turn in flight in this worker
+        self._live: WeakValueDictionary[str, Session] = WeakValueDictionary()
+        self._next_purge = 0.0
+        self._stats = {
+            "created": 0,
+            "hits": 0,
+            "evicted_lru": 0,
+            "expired_ttl": 0,
+            "conflicts": 0,
+        }
+
+    def get_or_create(self, session_id: str | None = None) -> tuple[str, Session]:
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+
+            if session_id and (session := self._live.get(session_id)) is not None:
+                self._stats["hits"] += 1
+                return session_id, session
+
+            row = None
+            if session_id:
+                row = self._conn.execute(
+                    "SELECT version, type, state, last_access FROM sessions"
+                    " WHERE session_id = ?",
+                    (session_id,),
+                ).fetchone()
+
+            if row is not None and now - row[3] < self.ttl_seconds:
+                version, state_type, state, last_access = row
+                session = Session(
+                    state=self._serde.loads_typed((state_type, state)),
+                    last_access=last_access,
+                    version=version,
+                )
+                self._stats["hits"] += 1
+            else:
+                # Expired rows are replaced on the first save (version 0 upserts)
+                session_id = session_id or uuid.uuid4().hex
+                session = Session(state=self.state_factory(), last_access=now)
+                self._stats["created"] += 1
+
+            self._live[session_id] = session
+            return session_id, session
+
+    def save(self, session_id: str, state: dict, version: int) -> int:
+        now = time.time()
+        state_type, blob = self._serde.dumps_typed(state)
+        with self._lock:
+            if version == 0:
+                # New session, or an expired one being started over
+                saved = self._conn.execute(
+                    "INSERT INTO sessions VALUES (?, 1, ?, ?, ?)"
+                    " ON CONFLICT (session_id) DO UPDATE SET"
+                    " version = version + 1, type = excluded.type,"
+                    " state = excluded.state, last_access = excluded.last_access"
+                    " WHERE last_access < ? RETURNING version",
+                    (session_id, state_type, blob, now, now - self.ttl_seconds),
+                ).fetchone()
+            else:
+                saved = self._conn.execute(
+                    "UPDATE sessions SET version = version + 1, type = ?, state = ?,"
+                    " last_access = ? WHERE session_id = ? AND version = ?"
+                    " RETURNING version",
+                    (state_type, blob, now, session_id, version),
+                ).fetchone()
+                if saved is None:
+                    # Purged while the turn was running, keep the newest state
+                    saved = self._conn.execute(
+                        "INSERT OR IGNORE INTO sessions VALUES (?, ?, ?, ?, ?)"
+                        " RETURNING version",
+                        (session_id, version + 1, state_type, blob, now),
+                    ).fetchone()
+
+            if saved is None:
+                self._stats["conflicts"] += 1
+                raise StaleSessionError(session_id)
+
+            (new_version,) = saved
+            if (session := self._live.get(session_id)) is not None:
+                session.state = state
+                session.version = new_version
+                session.last_access = now
+            return new_version
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            self._live.pop(session_id, None)
+            return bool(
+                self._conn.execute(
+                    "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+                ).rowcount
+            )
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            (active,) = self._conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE last_access >= ?",
+                (now - self.ttl_seconds,),
+            ).fetchone()
+            return {
+                "active_sessions": active,
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "store": "sqlite",
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _purge(self, now: float) -> None:
+        """Drops expired sessions and the oldest ones past max_sessions."""
+        if now < self._next_purge:
+            return
+        self._next_purge = now + PURGE_INTERVAL_SECONDS
+
+        expired = self._conn.execute(
+            "DELETE FROM sessions WHERE last_access < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        evicted = self._conn.execute(
+            "DELETE FROM sessions WHERE session_id IN (SELECT session_id FROM sessions"
+            " ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,),
+        ).rowcount
+        self._stats["expired_ttl"] += expired
+        self._stats["evicted_lru"] += evicted
+        if evicted:
+            logger.info(f"{evicted} sessions evicted (max sessions reached)")
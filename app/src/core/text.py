@@ -0,0 +1,15 @@
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def fold_accents(text: str) -> str:
+    """'Cotação do dólar' -> 'Cotacao do dolar'."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, accent-free, punctuation collapsed to single spaces."""
+    return _NON_WORD.sub(" ", fold_accents(text).lower()).strip()
@@ -0,0 +1,632 @@
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+
+from app.src.config.settings import (
+    CHECKPOINT_DB_PATH,
+    CHECKPOINT_KEEP_LAST,
+    CHECKPOINT_MAX_AGE_SECONDS,
+    CHECKPOINTER,
+)
+from app.src.core.session_store import StaleSessionError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE INDEX IF NOT EXISTS checkpoints_created_at ON checkpoints (created_at);
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS thread_leases (
+    thread_id TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class StaleCheckpointError(StaleSessionError):
+    """Another run added a checkpoint to the thread since this run read it."""
+
+
+def _thread_config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> dict:
+    return {
+        "configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+        }
+    }
+
+
+class SqliteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer on a local SQLite file, so a conversation (thread id =
+    session id) resumes from its last step after a restart.
+
+    Writes are incremental: each step stores the checkpoint header plus only the
+    channels whose version changed, as separate blobs. Every `keep_last` steps a
+    thread is trimmed back to its newest `keep_last` checkpoints (with the blobs
+    they still reference), and threads idle for `max_age_seconds` are dropped by
+    `prune_idle`. The graph has no DeltaChannel, so dropping intermediate
+    checkpoints never breaks reconstruction.
+
+    A run that writes a thread holds its lease (`lease_thread`), shared by
+    every worker on the file, so a second turn of the same conversation is
+    turned away before it runs instead of interleaving its steps with the
+    first. A lease left by a crashed worker expires. As a safety net threads
+    are linear: `put` only accepts a checkpoint whose parent is the thread's
+    newest one, checked inside its write transaction, and raises
+    StaleCheckpointError otherwise, so a run whose lease ran out fails instead
+    of forking the thread.
+
+    The async methods run the same statements in a worker thread
+    (`asyncio.to_thread`): a write waiting on another worker's transaction, or
+    on `prune_idle` holding the lock, never stalls the event loop. A busy
+    database is waited on for at most `busy_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        keep_last: int = 10,
+        max_age_seconds: float = 7 * 24 * 3600,
+        busy_timeout: float = 5.0,
+    ):
+        super().__init__()
+        self.path = Path(path)
+        self.keep_last = keep_last
+        self.max_age_seconds = max_age_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=busy_timeout,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # Puts since the last trim, per (thread_id, checkpoint_ns)
+        self._untrimmed: dict[tuple[str, str], int] = {}
+        self._conflicts = 0
+
+    # --- reads ---
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint,"
+            " metadata_type, metadata FROM checkpoints"
+            " WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: list = [thread_id, checkpoint_ns]
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self._to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+            " type, checkpoint, metadata_type, metadata FROM checkpoints WHERE 1 = 1"
+        )
+        params: list = []
+        if config:
+            query += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            if (
+                checkpoint_ns := config["configurable"].get("checkpoint_ns")
+            ) is not None:
+                query += " AND checkpoint_ns = ?"
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query += " AND checkpoint_id < ?"
+            params.append(before_id)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                return
+            metadata = self.serde.loads_typed((row[4], row[5]))
+            if filter and any(
+                metadata.get(key) != value for key, value in filter.items()
+            ):
+                continue
+            if limit is not None:
+                limit -= 1
+            # Built under the lock, yielded after releasing it: the caller may
+            # call back into the checkpointer between items
+            with self._lock:
+                item = self._to_tuple(thread_id, checkpoint_ns, row)
+            yield item
+
+    def thread_age(self, thread_id: str) -> float | None:
+        """Seconds since the thread's newest checkpoint, or None if it has none."""
+        with self._lock:
+            (newest,) = self._conn.execute(
+                "SELECT MAX(created_at) FROM checkpoints WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+        return None if newest is None else time.time() - newest
+
+    # --- writes ---
+
+    def lease_thread(self, thread_id: str, seconds: float) -> str | None:
+        """
+        Takes the thread's lease for `seconds` and returns its token, or None if
+        another run holds an unexpired one.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "INSERT INTO thread_leases VALUES (?, ?, ?)"
+                " ON CONFLICT (thread_id) DO UPDATE SET"
+                " token = excluded.token, expires_at = excluded.expires_at"
+                " WHERE thread_leases.expires_at < ? RETURNING token",
+                (thread_id, uuid.uuid4().hex, now + seconds, now),
+            ).fetchone()
+        return row[0] if row else None
+
+    def release_thread(self, thread_id: str, token: str) -> None:
+        """Gives the lease back, if it is still the one `token` took."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM thread_leases WHERE thread_id = ? AND token = ?",
+                (thread_id, token),
+            )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        header = checkpoint.copy()
+        values = header.pop("channel_values")
+
+        blobs = [
+            (
+                thread_id,
+                checkpoint_ns,
+                channel,
+                str(version),
+                *(
+                    self.serde.dumps_typed(values[channel])
+                    if channel in values
+                    else ("empty", None)
+                ),
+            )
+            for channel, version in new_versions.items()
+        ]
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(header)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        parent_id = config["configurable"].get("checkpoint_id")
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (newest,) = self._conn.execute(
+                    "SELECT MAX(checkpoint_id) FROM checkpoints"
+                    " WHERE thread_id = ? AND checkpoint_ns = ?",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+                if newest not in (parent_id, checkpoint["id"]):
+                    self._conflicts += 1
+                    raise StaleCheckpointError(thread_id)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO checkpoint_blobs VALUES (?, ?, ?, ?, ?, ?)",
+                    blobs,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        parent_id,
+                        checkpoint_type,
+                        checkpoint_blob,
+                        metadata_type,
+                        metadata_blob,
+                        time.time(),
+                    ),
+                )
+                if self.keep_last:
+                    key = (thread_id, checkpoint_ns)
+                    self._untrimmed[key] = self._untrimmed.get(key, 0) + 1
+                    if self._untrimmed[key] >= self.keep_last:
+                        self._trim(thread_id, checkpoint_ns)
+                        self._untrimmed[key] = 0
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return _thread_config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = {"IGNORE": [], "REPLACE": []}
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            # Regular writes are never overwritten; special ones (errors, interrupts) are
+            rows["IGNORE" if idx >= 0 else "REPLACE"].append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    idx,
+                    channel,
+                    *self.serde.dumps_typed(value),
+                    task_path,
+                )
+            )
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for conflict, batch in rows.items():
+                    if batch:
+                        self._conn.executemany(
+                            f"INSERT OR {conflict} INTO checkpoint_writes"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            batch,
+                        )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._delete_threads([thread_id])
+
+    def prune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        if strategy == "delete":
+            self._delete_threads(thread_ids)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"Estratégia de poda inválida: {strategy}")
+
+        with self._lock:
+            namespaces = self._conn.execute(
+                "SELECT DISTINCT thread_id, checkpoint_ns FROM checkpoints"
+                f" WHERE thread_id IN ({','.join('?' * len(thread_ids))})",
+                list(thread_ids),
+            ).fetchall()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for thread_id, checkpoint_ns in namespaces:
+                    self._trim(thread_id, checkpoint_ns, keep=1)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def prune_idle(self, max_age_seconds: float | None = None) -> int:
+        """
+        Deletes threads with no checkpoint in the last `max_age_seconds`. The
+        threads are picked and deleted in one transaction, so one that gets a
+        new checkpoint meanwhile (from any worker) is kept.
+        """
+        cutoff = time.time() - (max_age_seconds or self.max_age_seconds)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                idle = [
+                    thread_id
+                    for (thread_id,) in self._conn.execute(
+                        "SELECT thread_id FROM checkpoints GROUP BY thread_id"
+                        " HAVING MAX(created_at) < ?",
+                        (cutoff,),
+                    )
+                ]
+                if idle:
+                    self._delete_rows(idle)
+                # Leases left by crashed workers
+                self._conn.execute(
+                    "DELETE FROM thread_leases WHERE expires_at < ?", (time.time(),)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if idle:
+            logger.info(f"Checkpoints: {len(idle)} conversas inativas removidas")
+        return len(idle)
+
+    async def prune_idle_every(self, interval_seconds: float) -> None:
+        """Runs `prune_idle` every `interval_seconds` until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.prune_idle)
+            except Exception as e:
+                logger.error(f"Erro ao remover checkpoints inativos: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            threads, checkpoints = self._conn.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+            ).fetchone()
+            (blobs,) = self._conn.execute(
+                "SELECT COUNT(*) FROM checkpoint_blobs"
+            ).fetchone()
+        return {
+            "path": str(self.path),
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "blobs": blobs,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "keep_last": self.keep_last,
+            "conflicts": self._conflicts,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        # Zero-padded, so versions of a channel sort as text (used by _trim)
+        current_v = int(str(current).split(".")[0]) if current is not None else 0
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # --- async: same statements, in a worker thread ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aprune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        await asyncio.to_thread(self.prune, thread_ids, strategy=strategy)
+
+    # --- internals (callers hold self._lock) ---
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_id, checkpoint_type, blob, metadata_type, metadata = row
+        checkpoint = self.serde.loads_typed((checkpoint_type, blob))
+        versions = checkpoint["channel_versions"]
+
+        channel_values = {}
+        if versions:
+            pairs = list(versions.items())
+            rows = self._conn.execute(
+                "SELECT channel, type, blob FROM checkpoint_blobs"
+                " WHERE thread_id = ? AND checkpoint_ns = ?"
+                f" AND (channel, version) IN (VALUES {','.join(['(?, ?)'] * len(pairs))})",
+                [thread_id, checkpoint_ns]
+                + [
+                    item
+                    for channel, version in pairs
+                    for item in (channel, str(version))
+                ],
+            ).fetchall()
+            channel_values = {
+                channel: self.serde.loads_typed((value_type, value))
+                for channel, value_type, value in rows
+                if value_type != "empty"
+            }
+
+        writes = self._conn.execute(
+            "SELECT task_id, idx, channel, type, blob, task_path FROM checkpoint_writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        writes.sort(key=lambda w: writes_sort_key(w[5], w[0], w[1]))
+
+        return CheckpointTuple(
+            config=_thread_config(thread_id, checkpoint_ns, checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=_thread_config(thread_id, checkpoint_ns, parent_id)
+            if parent_id
+            else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, _, channel, value_type, value, _ in writes
+            ],
+        )
+
+    def _trim(
+        self, thread_id: str, checkpoint_ns: str, keep: int | None = None
+    ) -> None:
+        """Drops all but the newest `keep` checkpoints and what only they used."""
+        oldest_kept = self._conn.execute(
+            "SELECT checkpoint_id, type, checkpoint FROM checkpoints"
+            " WHERE thread_id = ? AND checkpoint_ns = ?"
+            " ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, checkpoint_ns, (keep or self.keep_last) - 1),
+        ).fetchone()
+        if oldest_kept is None:
+            return
+
+        checkpoint_id, checkpoint_type, blob = oldest_kept
+        scope = (thread_id, checkpoint_ns, checkpoint_id)
+        deleted = self._conn.execute(
+            "DELETE FROM checkpoints"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            scope,
+        ).rowcount
+        if not deleted:
+            return
+        self._conn.execute(
+            "DELETE FROM checkpoint_writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            scope,
+        )
+        # Versions only grow, so blobs older than what the oldest kept
+        # checkpoint points to are not referenced by any kept checkpoint.
+        versions = self.serde.loads_typed((checkpoint_type, blob))["channel_versions"]
+        self._conn.executemany(
+            "DELETE FROM checkpoint_blobs WHERE thread_id = ? AND checkpoint_ns = ?"
+            " AND channel = ? AND version < ?",
+            [
+                (thread_id, checkpoint_ns, channel, str(version))
+                for channel, version in versions.items()
+            ],
+        )
+
+    def _delete_threads(self, thread_ids: Sequence[str]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete_rows(thread_ids)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _delete_rows(self, thread_ids: Sequence[str]) -> None:
+        """Deletes every row of the threads, inside the caller's transaction."""
+        placeholders = ",".join("?" * len(thread_ids))
+        deleted = set(thread_ids)
+        self._untrimmed = {
+            key: count
+            for key, count in self._untrimmed.items()
+            if key[0] not in deleted
+        }
+        for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE thread_id IN ({placeholders})",
+                list(thread_ids),
+            )
+
+
+def create_checkpointer(kind: str = CHECKPOINTER) -> SqliteCheckpointer | None:
+    """The checkpointer selected by CHECKPOINTER ("sqlite" or "none")."""
+    if kind == "none":
+        return None
+    if kind == "sqlite":
+        return SqliteCheckpointer(
+            CHECKPOINT_DB_PATH,
+            keep_last=CHECKPOINT_KEEP_LAST,
+            max_age_seconds=CHECKPOINT_MAX_AGE_SECONDS,
+        )
+    raise ValueError(f"CHECKPOINTER inválido: {kind}")
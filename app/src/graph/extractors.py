@@ -0,0 +1,82 @@
+import re
+from datetime import date
+
+from app.src.core.text import normalize_text
+
+# 000.000.000-00 or 11 bare digits, not glued to other digits
+_CPF = re.compile(r"(?<!\d)(\d{3})\.?(\d{3})\.?(\d{3})-?(\d{2})(?!\d)")
+
+# 15/05/1990, 15-05-1990, 15.05.1990, 15051990
+_NUMERIC_DATE = re.compile(r"(?<!\d)(\d{1,2})[/.-]?(\d{1,2})[/.-]?(\d{4})(?!\d)")
+# "15 de maio de 1990", after normalize_text
+_WRITTEN_DATE = re.compile(r"\b(\d{1,2}) de ([a-z]+) de (\d{4})\b")
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        [
+            "janeiro",
+            "fevereiro",
+            "marco",
+            "abril",
+            "maio",
+            "junho",
+            "julho",
+            "agosto",
+            "setembro",
+            "outubro",
+            "novembro",
+            "dezembro",
+        ],
+        start=1,
+    )
+}
+
+
+def is_valid_cpf(cpf: str) -> bool:
+    """Checks the two CPF verification digits (mod 11)."""
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+
+    digits = [int(char) for char in cpf]
+    for position in (9, 10):
+        total = sum(
+            digit * weight
+            for digit, weight in zip(
+                digits[:position], range(position + 1, 1, -1), strict=True
+            )
+        )
+        if (total * 10 % 11) % 10 != digits[position]:
+            return False
+    return True
+
+
+def find_cpf(text: str) -> str | None:
+    """The CPF digits in `text`, or None if there is none or more than one."""
+    found = {"".join(match.groups()) for match in _CPF.finditer(text)}
+    return found.pop() if len(found) == 1 else None
+
+
+def find_birth_date(text: str) -> str | None:
+    """
+    A plausible birth date in `text`, formatted DD/MM/YYYY (the format
+    `save_birth_date` accepts), or None if there is none or more than one.
+    """
+    candidates = [match.groups() for match in _NUMERIC_DATE.finditer(text)]
+    candidates += [
+        (day, MONTHS[month], year)
+        for day, month, year in _WRITTEN_DATE.findall(normalize_text(text))
+        if month in MONTHS
+    ]
+
+    found = set()
+    for day, month, year in candidates:
+        try:
+            parsed = date(int(year), int(month), int(day))
+        except ValueError:
+            continue
+        if 1900 <= parsed.year and parsed <= date.today():
+            found.add(parsed)
+
+    if len(found) != 1:
+        return None
+    return found.pop().strftime("%d/%m/%Y")
@@ -1,11 +1,13 @@
 from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import ToolNode
 
-from app.src.graph.nodes.credit import credit_agent_node
-from app.src.graph.nodes.currency import currency_agent_node
-from app.src.graph.nodes.interview import interview_agent_node
-from app.src.graph.nodes.supervisor import supervisor_node
-from app.src.graph.nodes.triage import triage_node
+from app.src.graph.nodes.credit import acredit_agent_node, credit_agent_node
+from app.src.graph.nodes.currency import acurrency_agent_node, currency_agent_node
+from app.src.graph.nodes.interview import ainterview_agent_node, interview_agent_node
+from app.src.graph.nodes.memory import acompact_history_node, compact_history_node
+from app.src.graph.nodes.supervisor import asupervisor_node, supervisor_node
+from app.src.graph.nodes.triage import atriage_node, triage_node
+from app.src.graph.runner import aobserve_tool_call, observe_tool_call, timed_node
 from app.src.graph.state import AgentState
 from app.src.llm.tools import *
 import dotenv
@@ -13,20 +15,43 @@ import dotenv
 dotenv.load_dotenv()
 
 
-def build_graph():
+def build_graph(use_async: bool = False, checkpointer=None):
+    """
+    Builds the agent graph. With `use_async` the nodes call `llm.ainvoke` and the
+    graph must be driven by `graph.ainvoke`; otherwise nodes block on `llm.invoke`.
+    Every node is timed for /metrics and tool nodes also report each tool call.
+    With a `checkpointer` the state is saved after every step under the
+    `thread_id` of the run config.
+    """
     workflow = StateGraph(AgentState)
 
-    workflow.add_node("supervisor", supervisor_node)
-    workflow.add_node("triage_agent", triage_node)
-    workflow.add_node("currency_agent", currency_agent_node)
-    workflow.add_node("currency_tools", ToolNode(tools=[get_exchange_rate_tool]))
+    def add_node(name, action):
+        workflow.add_node(name, timed_node(name, action, use_async))
+
+    def tool_node(tools):
+        return ToolNode(
+            tools=tools,
+            wrap_tool_call=observe_tool_call,
+            awrap_tool_call=aobserve_tool_call,
+        )
+
+    add_node("memory", acompact_history_node if use_async else compact_history_node)
+    add_node("supervisor", asupervisor_node if use_async else supervisor_node)
+    add_node("triage_agent", atriage_node if use_async else triage_node)
+    add_node(
+        "currency_agent", acurrency_agent_node if use_async else currency_agent_node
+    )
+    add_node(
+        "currency_tools",
+        tool_node([get_exchange_rate_tool, get_exchange_rates_tool]),
+    )
 
-    workflow.add_node("credit_agent", credit_agent_node)
+    add_node("credit_agent", acredit_agent_node if use_async else credit_agent_node)
 
-    workflow.add_node(
+    add_node(
         "credit_tools",
-        ToolNode(
-            tools=[
+        tool_node(
+            [
                 process_limit_increase_request,
                 get_score_and_or_limit,
                 submit_credit_interview,
@@ -34,9 +59,12 @@ def build_graph():
         ),
     )
 
-    workflow.add_node("interview_agent", interview_agent_node)
+    add_node(
+        "interview_agent", ainterview_agent_node if use_async else interview_agent_node
+    )
 
-    workflow.set_entry_point("supervisor")
+    workflow.set_entry_point("memory")
+    workflow.add_edge("memory", "supervisor")
 
     workflow.add_conditional_edges(
         "supervisor",
@@ -78,7 +106,7 @@ def build_graph():
     )
     workflow.add_edge("credit_tools", "credit_agent")
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 
 def route_credit_logic(state: AgentState) -> str:
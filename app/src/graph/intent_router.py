@@ -0,0 +1,107 @@
+import logging
+import re
+import threading
+
+from app.src.core.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Patterns run against normalize_text() output: lowercase, no accents, no punctuation.
+INTENT_PATTERNS: dict[str, list[str]] = {
+    "INTERVIEW": [
+        r"\bentrevista\b",
+        r"\bresponder (algumas |umas )?perguntas\b",
+    ],
+    "CREDIT": [
+        r"\blimite\b",
+        r"\bscore\b",
+        r"\bcredito\b",
+        r"\bcartao\b",
+    ],
+    "CURRENCY": [
+        r"\bcotac(ao|oes)\b",
+        r"\bcambio\b",
+        r"\bconver(ter|sao|te)\b",
+        r"\b(dolar|dolares|euro|euros|libra|libras|bitcoin|iene|ienes|peso|pesos|franco|francos)\b",
+        r"\b(usd|eur|gbp|btc|eth|jpy|ars|chf|cad|aud)\b",
+    ],
+    "EXIT": [
+        r"^(sair|fechar|encerrar|finalizar)( (o )?atendimento)?$",
+        r"\b(tchau|flw|falou)\b",
+        r"^(ate (logo|mais|a proxima))$",
+    ],
+}
+
+# Small talk: only when the whole message is made of these (DIRECT still calls the LLM
+# for the reply, but skips the classification round trip).
+SMALL_TALK_PHRASES = (
+    r"oi|ola|opa|e ai|bom dia|boa tarde|boa noite|tudo bem|tudo bom|"
+    r"obrigad[oa]|muito obrigad[oa]|brigad[oa]|ok|certo|entendi|beleza"
+)
+SMALL_TALK = re.compile(rf"^(({SMALL_TALK_PHRASES})\s*)+$")
+
+# Anything that flips or questions the intent goes to the LLM.
+AMBIGUOUS = re.compile(r"\b(nao|nem|mas|porem|antes|depois)\b")
+
+# Long messages tend to carry more than one request.
+MAX_WORDS = 14
+
+
+class IntentRouter:
+    """
+    Deterministic fast path for the supervisor: a message is classified only
+    when exactly one intent matches; anything else returns None so the caller
+    falls back to the LLM. Counts both outcomes to report the hit rate.
+    """
+
+    def __init__(self, patterns: dict[str, list[str]] = INTENT_PATTERNS):
+        self._patterns = {
+            intent: [re.compile(pattern) for pattern in intent_patterns]
+            for intent, intent_patterns in patterns.items()
+        }
+        self._stats = {"rule_hits": 0, "llm_fallbacks": 0}
+        self._by_intent: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, message: str) -> str | None:
+        intent = (
+            self._match(normalize_text(message)) if isinstance(message, str) else None
+        )
+        with self._lock:
+            if intent is None:
+                self._stats["llm_fallbacks"] += 1
+            else:
+                self._stats["rule_hits"] += 1
+                self._by_intent[intent] = self._by_intent.get(intent, 0) + 1
+        return intent
+
+    def _match(self, text: str) -> str | None:
+        if not text or len(text.split()) > MAX_WORDS or AMBIGUOUS.search(text):
+            return None
+        if SMALL_TALK.match(text):
+            return "DIRECT"
+
+        matched = {
+            intent
+            for intent, patterns in self._patterns.items()
+            if any(pattern.search(text) for pattern in patterns)
+        }
+        # Asking for an interview always mentions the limit too.
+        if "INTERVIEW" in matched:
+            matched.discard("CREDIT")
+        if len(matched) == 1:
+            return matched.pop()
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._stats["rule_hits"] + self._stats["llm_fallbacks"]
+            return {
+                **self._stats,
+                "total": total,
+                "hit_rate": self._stats["rule_hits"] / total if total else 0.0,
+                "rule_hits_by_intent": dict(self._by_intent),
+            }
+
+
+intent_router = IntentRouter()
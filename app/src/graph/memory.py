@@ -0,0 +1,67 @@
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+# Fixed id: the running summary is replaced in place instead of piling up.
+SUMMARY_MESSAGE_ID = "conversation_summary"
+
+
+def is_summary(message: BaseMessage) -> bool:
+    return message.id == SUMMARY_MESSAGE_ID
+
+
+def prompt_window(messages: list, limit: int) -> list:
+    """
+    The last `limit` messages for a prompt, preceded by the running summary if
+    there is one. Leading ToolMessages whose tool call fell outside the window
+    are dropped, since the provider rejects them without the call.
+    """
+    window = messages[-limit:]
+    start = 0
+    while start < len(window) and isinstance(window[start], ToolMessage):
+        start += 1
+    window = window[start:]
+
+    summary = messages[0] if messages and is_summary(messages[0]) else None
+    if summary is not None and (not window or window[0] is not summary):
+        window = [summary, *window]
+    return window
+
+
+def split_history(messages: list, max_messages: int, keep: int):
+    """
+    Splits the conversation into (summary, to_fold, to_keep) once it exceeds
+    `max_messages`, keeping the last `keep` messages. The cut never separates an
+    AIMessage with tool calls from its ToolMessages. Returns None if nothing
+    needs folding.
+    """
+    summary = messages[0] if messages and is_summary(messages[0]) else None
+    body = messages[1:] if summary else messages
+    if len(body) <= max_messages:
+        return None
+
+    cut = len(body) - keep
+    while cut > 0 and isinstance(body[cut], ToolMessage):
+        cut -= 1
+    if cut <= 0:
+        return None
+    return summary, body[:cut], body[cut:]
+
+
+def transcript(messages: list, max_chars: int = 500) -> str:
+    """Plain-text rendering of messages for the summarization prompt."""
+    lines = []
+    for message in messages:
+        content = message.content
+        if not isinstance(content, str):
+            content = str(content)
+        if isinstance(message, HumanMessage):
+            lines.append(f"Cliente: {content}")
+        elif isinstance(message, ToolMessage):
+            lines.append(
+                f"Ferramenta ({message.name or 'tool'}): {content[:max_chars]}"
+            )
+        elif isinstance(message, AIMessage):
+            for call in message.tool_calls:
+                lines.append(f"Rito chamou {call['name']}({call['args']})")
+            if content:
+                lines.append(f"Rito: {content}")
+    return "\n".join(lines)
@@ -1,5 +1,6 @@
-from .credit import credit_agent_node
-from .currency import currency_agent_node
-from .interview import interview_agent_node
-from .supervisor import supervisor_node
-from .triage import triage_node
+from .credit import acredit_agent_node, credit_agent_node
+from .currency import acurrency_agent_node, currency_agent_node
+from .interview import ainterview_agent_node, interview_agent_node
+from .memory import acompact_history_node, compact_history_node
+from .supervisor import asupervisor_node, supervisor_node
+from .triage import atriage_node, triage_node
@@ -1,31 +1,46 @@
+import json
 import logging
 
-from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, ToolMessage
 
+from app.src.graph.memory import prompt_window
+from app.src.graph.runner import LLMCall, NodeSteps, async_node, sync_node
 from app.src.graph.state import AgentState
-from app.src.llm.base_llm import llm
-from app.src.llm.credit_llm import credit_llm
-from app.src.llm.prompts import SYSTEM_PROMPT_BANK, SYSTEM_PROMPT_FINAL_INSTRUCTION
-from app.src.llm.tools import get_score_and_or_limit, process_limit_increase_request
+from app.src.llm.prompts import CREDIT_AGENT, CREDIT_APPROVED, CREDIT_REJECTED
+from app.src.llm.registry import llm_registry
+from app.src.llm.templates import format_brl, response_templates
 
 logger = logging.getLogger(__name__)
 
 
-def credit_agent_node(state: AgentState) -> AgentState:
+def _templated_decision_reply(tool_content: str, is_rejected: bool) -> str | None:
+    """Canned reply for a limit decision, or None to let the LLM phrase it."""
+    transition = "limit_rejected" if is_rejected else "limit_approved"
+    if not response_templates.enabled(transition):
+        return None
+
+    try:
+        result = json.loads(tool_content)
+    except (TypeError, ValueError):
+        return None
+
+    if is_rejected:
+        return response_templates.render(transition, message=result["message"])
+    if not result.get("limit_updated"):
+        # Approved but not saved: the LLM explains the technical error.
+        return None
+    return response_templates.render(
+        transition, new_limit=format_brl(float(result["new_limit"]))
+    )
+
+
+def _credit_agent_steps(state: AgentState) -> NodeSteps:
     """
     Credit Agent: Handles limit and score queries
     """
     logger.info("Entering Credit Agent Node")
     messages = state["messages"]
 
-    client_context = f"""
-    LOGGED CLIENT DATA:
-    Name: {state.get("name", "N/A")}
-    CPF: {state.get("cpf_input", "N/A")}
-    Current Score: {state.get("score", 0)}
-    Current Limit: R$ {state.get("credit_limit", 0)}
-    """
-
     last_message = messages[-1]
 
     if isinstance(last_message, ToolMessage):
@@ -36,71 +51,34 @@ def credit_agent_node(state: AgentState) -> AgentState:
         ):
             is_rejected = "rejeitado" in tool_output
 
-            if is_rejected:
-                system_prompt = f"""{SYSTEM_PROMPT_BANK}
-                You are a Credit Agent. Request REJECTED.
-                
-                MISSION:
-                1. Inform rejection professionally.
-                2. MANDATORY: Offer "Credit Profile Interview" YOURSELF.
-                - Phrase: "If you wish, I can start a profile analysis interview now to try to adjust your score."
-                3. If agreed: Respond "Vou iniciar a entrevista agora."
-                
-                {SYSTEM_PROMPT_FINAL_INSTRUCTION}
-                Respond in Portuguese.
-                """
-            else:
-                system_prompt = f"""{SYSTEM_PROMPT_BANK}
-                Request APPROVED.
-                MISSION: Congratulate and confirm new limit.
-                {SYSTEM_PROMPT_FINAL_INSTRUCTION}
-                Respond in Portuguese.
-                """
-            try:
-                response = llm.invoke(
-                    [SystemMessage(content=system_prompt), *messages[-10:]],
-                    temperature=0.3,
-                )
-            except Exception as e:
-                logger.error(f"Error in Credit Agent LLM invocation: {e}")
-                response = AIMessage(
-                    content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
-                )
+            reply = _templated_decision_reply(last_message.content, is_rejected)
+            if reply is not None:
+                return {"messages": [AIMessage(content=reply)]}
+
+            prompt = CREDIT_REJECTED if is_rejected else CREDIT_APPROVED
+            response = yield LLMCall(
+                llm_registry.base,
+                prompt.build(prompt_window(messages, 10)),
+                {"temperature": 0.3},
+                label="Credit Agent LLM",
+            )
             return {"messages": [response]}
 
-    credit_llm_with_tools = credit_llm.bind_tools(
-        [process_limit_increase_request, get_score_and_or_limit]
+    response = yield LLMCall(
+        llm_registry.credit,
+        CREDIT_AGENT.build(
+            prompt_window(messages, 10),
+            name=state.get("name", "N/A"),
+            cpf=state.get("cpf_input", "N/A"),
+            score=state.get("score", 0),
+            credit_limit=state.get("credit_limit", 0),
+        ),
+        {"temperature": 0.3, "max_tokens": 300},
+        label="Credit Agent LLM",
     )
 
-    system_prompt = f"""{SYSTEM_PROMPT_BANK}
-    
-    CLIENT CONTEXT: {client_context}
-    
-    RESPONSIBILITIES:
-    1. Consult Limit/Score: Use `get_score_and_or_limit`.
-    
-    2. Limit Increase Request, when user wants to increase limit:
-        - Check desired value.
-        - If missing value -> Ask.
-        - If present -> CALL `process_limit_increase_request`.
-    
-    3. If customer accepts Interview (after rejection):
-        - Respond: "Vou iniciar a entrevista agora." (Router detects INTERVIEW).
-        
-    Be direct.
-    {SYSTEM_PROMPT_FINAL_INSTRUCTION}
-    Respond in Portuguese.
-    """
-    try:
-        response = credit_llm_with_tools.invoke(
-            [SystemMessage(content=system_prompt), *messages[-10:]],
-            temperature=0.3,
-            max_tokens=300,
-        )
-    except Exception as e:
-        logger.error(f"Error in Credit Agent LLM invocation: {e}")
-        response = AIMessage(
-            content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
-        )
-
     return {"messages": [response]}
+
+
+credit_agent_node = sync_node(_credit_agent_steps)
+acredit_agent_node = async_node(_credit_agent_steps)
@@ -1,18 +1,18 @@
 import json
 import logging
 
-from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, ToolMessage
 
+from app.src.graph.memory import prompt_window
+from app.src.graph.runner import LLMCall, NodeSteps, async_node, sync_node
 from app.src.graph.state import AgentState
-from app.src.llm.base_llm import llm
-from app.src.llm.interview_llm import interview_llm
-from app.src.llm.prompts import SYSTEM_PROMPT_BANK, SYSTEM_PROMPT_FINAL_INSTRUCTION
-from app.src.llm.tools import submit_credit_interview
+from app.src.llm.prompts import INTERVIEW_AGENT, INTERVIEW_COMPLETED
+from app.src.llm.registry import llm_registry
 
 logger = logging.getLogger(__name__)
 
 
-def interview_agent_node(state: AgentState) -> AgentState:
+def _interview_agent_steps(state: AgentState) -> NodeSteps:
     """
     Interview Agent: Conducts financial interview
     """
@@ -30,66 +30,20 @@ def interview_agent_node(state: AgentState) -> AgentState:
         except:
             new_score = "atualizado"
 
-        system_prompt = f"""{SYSTEM_PROMPT_BANK}
-        
-        Interview successful! New score: {new_score}.
-        
-        MISSION:
-        1. Thank customer.
-        2. Inform score recalculated.
-        3. Say: "Agora vou transferir você de volta para o Agente de Crédito para reanalisar seu pedido de limite."
-        4. IMPORTANT: Use keyword "REDIRECT_CREDIT".
-        
-        {SYSTEM_PROMPT_FINAL_INSTRUCTION}
-        REMEMBER: Respond in Portuguese.
-        """
-        try:
-            response = llm.invoke(
-                [SystemMessage(content=system_prompt), *messages[-30:]]
-            )
-        except Exception as e:
-            logger.error(f"Error in Interview Agent LLM invocation: {e}")
-            response = AIMessage(
-                content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
-            )
+        response = yield LLMCall(
+            llm_registry.base,
+            INTERVIEW_COMPLETED.build(prompt_window(messages, 30), new_score=new_score),
+            label="Interview Agent LLM",
+        )
 
         return {"messages": [response], "credit_interview": False}
 
     else:
-        interview_llm_with_tools = interview_llm.bind_tools([submit_credit_interview])
-
-        system_prompt = f"""{SYSTEM_PROMPT_BANK}
-        
-        You are the Credit Interview Agent.
-        OBJECTIVE: Collect data for `submit_credit_interview`.
-        
-        REQUIRED DATA (Ask ONE at a time):
-        1. Monthly Income (R$)
-        2. Employment Type (Formal, Autonomous, Unemployed)
-        3. Fixed Expenses (R$)
-        4. Dependents
-        5. Active Debts (Yes/No)
-        
-        INSTRUCTIONS:
-        - Customer CPF: {cpf_user}
-        - Don't ask all at once.
-        - If answered all -> CALL TOOL.
-        
-        If user wants to quit: respond "ENCERRAR".
-        
-        {SYSTEM_PROMPT_FINAL_INSTRUCTION}
-        REMEMBER: Respond in Portuguese.
-        """
-
-        try:
-            response = interview_llm_with_tools.invoke(
-                [SystemMessage(content=system_prompt), *messages[-30:]]
-            )
-        except Exception as e:
-            logger.error(f"Error in Interview Agent LLM invocation: {e}")
-            response = AIMessage(
-                content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
-            )
+        response = yield LLMCall(
+            llm_registry.interview,
+            INTERVIEW_AGENT.build(prompt_window(messages, 30), cpf=cpf_user),
+            label="Interview Agent LLM",
+        )
 
         if "ENCERRAR" in response.content.upper():
             return {
@@ -100,3 +54,7 @@ def interview_agent_node(state: AgentState) -> AgentState:
             }
 
         return {"messages": [response], "credit_interview": True}
+
+
+interview_agent_node = sync_node(_interview_agent_steps)
+ainterview_agent_node = async_node(_interview_agent_steps)
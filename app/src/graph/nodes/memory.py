@@ -0,0 +1,64 @@
+import logging
+
+from langchain_core.messages import RemoveMessage, SystemMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from app.src.config.settings import MEMORY_MAX_MESSAGES, MEMORY_WINDOW_MESSAGES
+from app.src.graph.memory import SUMMARY_MESSAGE_ID, split_history, transcript
+from app.src.graph.runner import (
+    FALLBACK_MESSAGE,
+    LLMCall,
+    NodeSteps,
+    async_node,
+    sync_node,
+)
+from app.src.graph.state import AgentState
+from app.src.llm.prompts import MEMORY_SUMMARY
+from app.src.llm.registry import llm_registry
+
+logger = logging.getLogger(__name__)
+
+
+def _compact_history_steps(state: AgentState) -> NodeSteps:
+    """
+    Memory: once the conversation passes MEMORY_MAX_MESSAGES, folds everything
+    but the last MEMORY_WINDOW_MESSAGES into a running summary message.
+    """
+    split = split_history(
+        state["messages"], MEMORY_MAX_MESSAGES, MEMORY_WINDOW_MESSAGES
+    )
+    if split is None:
+        return {}
+
+    summary, to_fold, to_keep = split
+    logger.info(f"Compacting history: folding {len(to_fold)} messages into the summary")
+
+    response = yield LLMCall(
+        llm_registry.base,
+        MEMORY_SUMMARY.build(
+            summary=summary.content if summary else "(none)",
+            transcript=transcript(to_fold),
+        ),
+        {"temperature": 0, "max_tokens": 400},
+        label="Memory LLM",
+        stream=False,
+    )
+    if response.content == FALLBACK_MESSAGE:
+        # Keep the full history and try again on the next turn.
+        return {}
+
+    summary_message = SystemMessage(
+        content=f"Resumo da conversa até aqui:\n{response.content}",
+        id=SUMMARY_MESSAGE_ID,
+    )
+    return {
+        "messages": [
+            RemoveMessage(id=REMOVE_ALL_MESSAGES),
+            summary_message,
+            *to_keep,
+        ]
+    }
+
+
+compact_history_node = sync_node(_compact_history_steps)
+acompact_history_node = async_node(_compact_history_steps)
@@ -1,24 +1,48 @@
 import json
 import logging
 
-from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.messages import AIMessage
 from langgraph.graph import END
 
+from app.src.config.settings import SUPERVISOR_FAST_PATH
+from app.src.graph.intent_router import intent_router
+from app.src.graph.memory import prompt_window
+from app.src.graph.response_cache import response_cache
+from app.src.graph.runner import (
+    FALLBACK_MESSAGE,
+    LLMCall,
+    NodeSteps,
+    async_node,
+    sync_node,
+)
 from app.src.graph.state import AgentState
-from app.src.llm.base_llm import llm
-from app.src.llm.prompts import SYSTEM_PROMPT_BANK, SYSTEM_PROMPT_FINAL_INSTRUCTION
+from app.src.llm.prompts import SUPERVISOR_CLASSIFY, SUPERVISOR_DIRECT
+from app.src.llm.registry import llm_registry
+from app.src.llm.templates import response_templates
+from app.src.services.user_service import get_client_name
 
 logger = logging.getLogger(__name__)
 
 
-def supervisor_node(state: AgentState) -> AgentState:
+def _personal_values(state: AgentState) -> tuple[str, ...]:
+    """Customer data a cached small-talk reply must never contain."""
+    cpf = state.get("cpf_input")
+    name = get_client_name(cpf) if cpf else None
+    return tuple(
+        value
+        for value in (cpf, state.get("birth_date"), *(name or "").split())
+        if value
+    )
+
+
+def _supervisor_steps(state: AgentState) -> NodeSteps:
     """
     Supervisor: analyzes message and decides whether to call triage or respond directly
     """
     logger.info("Entering Supervisor Node")
 
     messages = state["messages"]
-    recent_messages = messages[-20:] if len(messages) > 20 else messages
+    recent_messages = prompt_window(messages, 20)
 
     if not state.get("authenticated"):
         state["next_agent"] = "triage_agent"
@@ -28,56 +52,20 @@ def supervisor_node(state: AgentState) -> AgentState:
         state["next_agent"] = "interview_agent"
         return state
 
-    system_prompt = f""" {SYSTEM_PROMPT_BANK}
-
-Analyze the customer's message:
-
-If the customer explicitly says they want to know the value of a currency, conversion or something similar:
-- "qual a cotação do dólar?"
-- "me informe o valor do euro"
-- "qual o valor do bitcoin hoje?"
-- "quero saber a cotação da libra"
-Or similar variations → respond ONLY: CURRENCY
-
-if the customer explicitly talks about "limit", "credit increase", "score", "credit card":
-- "quero aumentar meu limite"
-- "qual meu limite atual?"
-- "liberar mais crédito"
-- "quero aumentar meu limite de crédito"
-or other similar variations → respond ONLY: CREDIT
-
-if the customer explicitly wants to an interview, just when he wants an 'interview':
-- "quero fazer uma entrevista para aumentar meu limite"
-- "gostaria de responder algumas perguntas para aumentar meu limite"
-- "preciso aumentar meu limite de crédito"
-→ respond ONLY: INTERVIEW
-
-If the customer wants to EXIT, quit, say goodbye or end the conversation:
-- "sair"
-- "tchau"
-- "encerrar atendimento"
-- "obrigado, tchau"
-- "fechar"
-- "valeu, flw"
-Or similar variations → respond ONLY: EXIT
-
-For ANY other message (greetings, questions, farewells, etc) → respond ONLY: DIRECT
-
-Customer's message: "{recent_messages[-1].content if recent_messages else ""}"
-
-{SYSTEM_PROMPT_FINAL_INSTRUCTION}
-
-Respond with ONLY ONE WORD (CURRENCY, CREDIT, INTERVIEW, EXIT or DIRECT):"""
-
-    try:
-        response = llm.invoke([SystemMessage(content=system_prompt), *recent_messages])
-    except Exception as e:
-        logger.error(f"Error in Supervisor LLM invocation: {e}")
-        response = AIMessage(
-            content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
+    last_content = recent_messages[-1].content if recent_messages else ""
+    decision = intent_router.classify(last_content) if SUPERVISOR_FAST_PATH else None
+
+    if decision is None:
+        response = yield LLMCall(
+            llm_registry.base,
+            SUPERVISOR_CLASSIFY.build(recent_messages, message=last_content),
+            label="Supervisor LLM",
+            stream=False,
         )
 
-    decision = response.content.strip().upper()
+        decision = response.content.strip().upper()
+    else:
+        logger.info(f"Supervisor fast path: {decision}")
 
     if "CURRENCY" in decision:
         state["next_agent"] = "currency_agent"
@@ -92,9 +80,7 @@ Respond with ONLY ONE WORD (CURRENCY, CREDIT, INTERVIEW, EXIT or DIRECT):"""
         return state
 
     elif "EXIT" in decision:
-        goodbye_message = AIMessage(
-            content="O Rito Bank agradece seu contato! Sessão encerrada com segurança. Até a próxima!"
-        )
+        goodbye_message = AIMessage(content=response_templates.render("exit"))
 
         return {
             "messages": [goodbye_message],
@@ -105,37 +91,37 @@ Respond with ONLY ONE WORD (CURRENCY, CREDIT, INTERVIEW, EXIT or DIRECT):"""
         }
 
     else:
+        cache_key = response_cache.key(last_content)
+        cached = response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            logger.info("Supervisor direct reply served from cache")
+            state["messages"].append(AIMessage(content=cached))
+            state["next_agent"] = END
+            return state
+
         state_for_prompt = state.copy()
         state_for_prompt.pop("messages", None)
 
         state_context_str = json.dumps(state_for_prompt, indent=2, ensure_ascii=False)
-        direct_prompt = f"""{SYSTEM_PROMPT_BANK}
-        
-        ROLE: You are a friendly banking assistant handling general conversation (Direct Interaction).
-        OBJECTIVE: Respond politely and professionally to greetings, thanks, or random comments.
-        CLIENT INFO: {state_context_str}
-
-        INSTRUCTIONS:
-        1. **Personalize:** Use client name if available.
-        2. **Be Natural:** Respond to greeting/thanks.
-        3. **No Auth Block:** Do NOT ask for CPF here.
-        4. **Style:** Be brief, professional, and warm.
-        
-        {SYSTEM_PROMPT_FINAL_INSTRUCTION}
-        """
-
-        try:
-            direct_response = llm.invoke(
-                [SystemMessage(content=direct_prompt), *recent_messages],
-                temperature=0.5,
-                max_tokens=100,
-            )
-        except Exception as e:
-            logger.error(f"Error in Supervisor LLM invocation: {e}")
-            direct_response = AIMessage(
-                content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
+
+        direct_response = yield LLMCall(
+            llm_registry.base,
+            SUPERVISOR_DIRECT.build(recent_messages, client_info=state_context_str),
+            {"temperature": 0.5, "max_tokens": 100},
+            label="Supervisor LLM",
+        )
+
+        # The fallback stands in for a failed LLM call, never a reply to reuse
+        if cache_key and direct_response.content != FALLBACK_MESSAGE:
+            response_cache.put(
+                cache_key, direct_response.content, personal=_personal_values(state)
             )
 
-        state["messages"].append(AIMessage(content=direct_response.content))
+        # Appended as is: keeping its id tells the stream these tokens were already sent.
+        state["messages"].append(direct_response)
         state["next_agent"] = END
         return state
+
+
+supervisor_node = sync_node(_supervisor_steps)
+asupervisor_node = async_node(_supervisor_steps)
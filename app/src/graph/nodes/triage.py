@@ -1,23 +1,54 @@
 import logging
+import uuid
 
-from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, ToolMessage
 from langgraph.graph import END
 
+from app.src.graph.extractors import find_birth_date, find_cpf, is_valid_cpf
+from app.src.graph.runner import LLMCall, NodeSteps, async_node, sync_node
 from app.src.graph.state import AgentState
-from app.src.llm.base_llm import llm
 from app.src.llm.prompts import (
-    SYSTEM_PROMPT_BANK,
-    SYSTEM_PROMPT_FINAL_INSTRUCTION,
-    TRIAGE_PROMPT,
+    TRIAGE_AUTH_SUCCESS,
+    TRIAGE_BIRTH_DATE_INVALID,
+    TRIAGE_COLLECT_BIRTH_DATE,
+    TRIAGE_COLLECT_CPF,
+    TRIAGE_CPF_INVALID,
+    TRIAGE_CPF_SAVED,
 )
+from app.src.llm.registry import llm_registry
+from app.src.llm.templates import response_templates
 from app.src.llm.tools import save_birth_date, save_cpf
-from app.src.llm.triage_llm import triage_llm
-from app.src.services.user_service import authenticate_user
+from app.src.services.user_service import authenticate_user, is_registered_cpf
 
 logger = logging.getLogger(__name__)
 
 
-def triage_node(state: AgentState) -> AgentState:
+def _last_user_text(messages: list) -> str:
+    content = messages[-1].content if messages else ""
+    return content if isinstance(content, str) else ""
+
+
+def _local_tool_call(name: str, args: dict) -> AIMessage:
+    """Stands in for the triage LLM when the data was extracted locally."""
+    logger.info(f"Triage fast path: {name}")
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": args, "id": f"local_{uuid.uuid4().hex}"}],
+    )
+
+
+def _extract_cpf(text: str) -> str | None:
+    """
+    A CPF the save/authenticate path can use without asking the LLM: valid
+    check digits, or a registered client (seed data predates the validation).
+    """
+    cpf = find_cpf(text)
+    if cpf and (is_valid_cpf(cpf) or is_registered_cpf(cpf)):
+        return cpf
+    return None
+
+
+def _triage_steps(state: AgentState) -> NodeSteps:
     """
     Triage Agent: Handles authentication
     """
@@ -27,32 +58,15 @@ def triage_node(state: AgentState) -> AgentState:
     recent_messages = messages[-20:] if len(messages) > 20 else messages
 
     if not state.get("cpf_input"):
-        system_prompt = f"""{SYSTEM_PROMPT_BANK}
-{TRIAGE_PROMPT}
-
-Your current context is to collect the customer's CPF for authentication.
-Objective: Collect CPF (11 digits).
-
-Instructions:
-- If CPF provided -> CALL `save_cpf`.
-- If not provided -> Ask politely.
-- Only accept valid CPFs (11 digits).
-- Always answer the customer asking the cpf if not provided.
-
-In this stage, always conduct the customer to provide the CPF first. Dont say how can i help you today?, but request the user cpf.
-
-REMEMBER: Respond in Portuguese.
-"""
-        try:
-            response = triage_llm.invoke(
-                [SystemMessage(content=system_prompt), *recent_messages],
-                max_tokens=100,
-                temperature=0.3,
-            )
-        except Exception as e:
-            logger.error(f"Error in Triage LLM invocation: {e}")
-            response = AIMessage(
-                content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
+        cpf = _extract_cpf(_last_user_text(recent_messages))
+        if cpf:
+            response = _local_tool_call("save_cpf", {"cpf": cpf})
+        else:
+            response = yield LLMCall(
+                llm_registry.triage,
+                TRIAGE_COLLECT_CPF.build(recent_messages),
+                {"max_tokens": 100, "temperature": 0.3},
+                label="Triage LLM",
             )
 
         if response.tool_calls:
@@ -69,15 +83,18 @@ REMEMBER: Respond in Portuguese.
                     ]
                 )
 
-                prompt = f"""{SYSTEM_PROMPT_BANK}
-                    The provided CPF is invalid. Please inform a valid CPF with 11 digits politely.
-                    {SYSTEM_PROMPT_FINAL_INSTRUCTION}"""
-
-                response_llm = llm.invoke(
-                    [SystemMessage(content=prompt), *recent_messages], max_tokens=50
-                )
+                if response_templates.enabled("cpf_invalid"):
+                    reply = response_templates.render("cpf_invalid")
+                else:
+                    response_llm = yield LLMCall(
+                        llm_registry.base,
+                        TRIAGE_CPF_INVALID.build(recent_messages),
+                        {"max_tokens": 50},
+                        label="Triage LLM",
+                    )
+                    reply = response_llm.content
 
-                state["messages"].append(AIMessage(content=response_llm.content))
+                state["messages"].append(AIMessage(content=reply))
                 state["next_agent"] = END
                 return state
 
@@ -89,42 +106,33 @@ REMEMBER: Respond in Portuguese.
                 ]
             )
 
-            prompt = f"""{SYSTEM_PROMPT_BANK}
-                CPF saved. Confirm politely and ask for DATE OF BIRTH briefly.
-                {SYSTEM_PROMPT_FINAL_INSTRUCTION}"""
-
-            final_response = llm.invoke(
-                [SystemMessage(content=prompt), *recent_messages], max_tokens=50
-            )
-            state["messages"].append(AIMessage(content=final_response.content))
+            if response_templates.enabled("cpf_saved"):
+                reply = response_templates.render("cpf_saved")
+            else:
+                final_response = yield LLMCall(
+                    llm_registry.base,
+                    TRIAGE_CPF_SAVED.build(recent_messages),
+                    {"max_tokens": 50},
+                    label="Triage LLM",
+                )
+                reply = final_response.content
+            state["messages"].append(AIMessage(content=reply))
 
         else:
             state["messages"].append(response)
 
     elif not state.get("birth_date"):
-        system_prompt = f"""{SYSTEM_PROMPT_BANK}
-{TRIAGE_PROMPT}
-
-Context: CPF collected: {state["cpf_input"]}
-Objective: Collect DATE OF BIRTH.
-
-Instructions:
-- If date provided -> CALL `save_birth_date`.
-- If not -> Ask politely.
-
-{SYSTEM_PROMPT_FINAL_INSTRUCTION}
-REMEMBER: Respond in Portuguese.
-"""
-        try:
-            response = triage_llm.invoke(
-                [SystemMessage(content=system_prompt), *recent_messages],
-                max_tokens=100,
-                temperature=0.3,
-            )
-        except Exception as e:
-            logger.error(f"Error in Triage LLM invocation: {e}")
-            response = AIMessage(
-                content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
+        birth_date = find_birth_date(_last_user_text(recent_messages))
+        if birth_date:
+            response = _local_tool_call("save_birth_date", {"birth_date": birth_date})
+        else:
+            response = yield LLMCall(
+                llm_registry.triage,
+                TRIAGE_COLLECT_BIRTH_DATE.build(
+                    recent_messages, cpf=state["cpf_input"]
+                ),
+                {"max_tokens": 100, "temperature": 0.3},
+                label="Triage LLM",
             )
 
         if response.tool_calls:
@@ -140,9 +148,7 @@ REMEMBER: Respond in Portuguese.
                     state["authentication_attempts"] += 1
                     if state["authentication_attempts"] >= 3:
                         state["messages"].append(
-                            AIMessage(
-                                content="Número máximo de tentativas atingido. Encerrando atendimento."
-                            )
+                            AIMessage(content=response_templates.render("auth_blocked"))
                         )
                         return {
                             **state,
@@ -152,9 +158,7 @@ REMEMBER: Respond in Portuguese.
                         }
                     else:
                         state["messages"].append(
-                            AIMessage(
-                                content="Autenticação falhou. Dados incorretos. Reiniciando processo."
-                            )
+                            AIMessage(content=response_templates.render("auth_failed"))
                         )
                         return {**state, "birth_date": None, "cpf_input": None}
 
@@ -168,42 +172,40 @@ REMEMBER: Respond in Portuguese.
                     ]
                 )
 
-                prompt = f"""{SYSTEM_PROMPT_BANK}
-                    Authentication successful. Confirm to customer politely. Be brief.
-                    {SYSTEM_PROMPT_FINAL_INSTRUCTION}"""
-
-                try:
-                    final_response = llm.invoke(
-                        [SystemMessage(content=prompt), *recent_messages],
-                        max_tokens=100,
-                        temperature=0.3,
-                    )
-                except Exception as e:
-                    logger.error(f"Error in LLM invocation: {e}")
-                    final_response = AIMessage(
-                        content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
+                if response_templates.enabled("auth_success"):
+                    reply = response_templates.render("auth_success")
+                else:
+                    final_response = yield LLMCall(
+                        llm_registry.base,
+                        TRIAGE_AUTH_SUCCESS.build(recent_messages),
+                        {"max_tokens": 100, "temperature": 0.3},
+                        label="LLM",
                     )
+                    reply = final_response.content
 
-                state["messages"].append(AIMessage(content=final_response.content))
+                state["messages"].append(AIMessage(content=reply))
                 state["authenticated"] = True
                 return state
             else:
                 state["messages"].append(response)
-                try:
-                    retry_resp = llm.invoke(
-                        f"""{SYSTEM_PROMPT_BANK} Invalid date. Ask again politely. {SYSTEM_PROMPT_FINAL_INSTRUCTION}""",
-                        max_tokens=50,
-                        temperature=0.2,
-                    )
-                except Exception as e:
-                    logger.error(f"Error in LLM invocation: {e}")
-                    retry_resp = AIMessage(
-                        content="Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
+                if response_templates.enabled("birth_date_invalid"):
+                    reply = response_templates.render("birth_date_invalid")
+                else:
+                    retry_resp = yield LLMCall(
+                        llm_registry.base,
+                        TRIAGE_BIRTH_DATE_INVALID.build(),
+                        {"max_tokens": 50, "temperature": 0.2},
+                        label="LLM",
                     )
+                    reply = retry_resp.content
 
-                state["messages"].append(AIMessage(content=retry_resp.content))
+                state["messages"].append(AIMessage(content=reply))
         else:
             state["messages"].append(response)
 
     state["next_agent"] = END
     return state
+
+
+triage_node = sync_node(_triage_steps)
+atriage_node = async_node(_triage_steps)
@@ -0,0 +1,141 @@
+import itertools
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from app.src.config.settings import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_VARIANTS,
+)
+from app.src.core.text import normalize_text
+from app.src.graph.intent_router import SMALL_TALK, SMALL_TALK_PHRASES
+
+_PHRASE = re.compile(rf"\b({SMALL_TALK_PHRASES})\b")
+# "obrigada" and "obrigado" get the same reply
+_FEMININE = re.compile(r"\b(obrigad|brigad)a\b")
+
+
+@dataclass
+class _Entry:
+    variants: list[str] = field(default_factory=list)
+    samples: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    served: itertools.count = field(default_factory=itertools.count)
+
+
+class ResponseCache:
+    """
+    Replies to small talk ("oi", "obrigado", "bom dia") keyed by the set of
+    phrases in the message, so punctuation, order and repeats don't matter but
+    a different greeting or time of day ("boa tarde" / "boa noite") never
+    shares a reply. Each key samples `variants` LLM replies (duplicates are kept
+    once) and is only served after that, rotating through the distinct ones, so
+    customers don't all get the same sentence. Entries expire `ttl` seconds after creation; past `max_entries` the least
+    recently used key is evicted.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl: float = 3600,
+        max_entries: int = 256,
+        variants: int = 3,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.variants = variants
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stored": 0,
+            "skipped_personal": 0,
+            "expired": 0,
+            "evicted": 0,
+        }
+        self._lock = threading.Lock()
+
+    def key(self, message) -> str | None:
+        """The cache key for `message`, or None if it is not cacheable small talk."""
+        if not self.enabled or not isinstance(message, str):
+            return None
+        text = normalize_text(message)
+        if not text or not SMALL_TALK.match(text):
+            return None
+        phrases = {_FEMININE.sub(r"\1o", phrase) for phrase in _PHRASE.findall(text)}
+        return " ".join(sorted(phrases))
+
+    def get(self, key: str) -> str | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is None or entry.samples < self.variants:
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.variants[next(entry.served) % len(entry.variants)]
+
+    def put(self, key: str, reply: str, personal: tuple[str, ...] = ()) -> None:
+        """
+        Adds `reply` to the key's pool. Replies that mention any of the
+        `personal` values (name, CPF...) are never shared with other customers.
+        """
+        if not reply or any(value and value in reply for value in personal):
+            with self._lock:
+                self._stats["skipped_personal"] += 1
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evicted"] += 1
+            if entry.samples < self.variants:
+                entry.samples += 1
+                if reply not in entry.variants:
+                    entry.variants.append(reply)
+                    self._stats["stored"] += 1
+            self._entries.move_to_end(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "enabled": self.enabled,
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "full_entries": sum(
+                    entry.samples >= self.variants for entry in self._entries.values()
+                ),
+            }
+
+    def _live(self, key: str, now: float) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is not None and now - entry.created_at >= self.ttl:
+            del self._entries[key]
+            self._stats["expired"] += 1
+            return None
+        return entry
+
+
+response_cache = ResponseCache(
+    enabled=RESPONSE_CACHE_ENABLED,
+    ttl=RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    variants=RESPONSE_CACHE_VARIANTS,
+)
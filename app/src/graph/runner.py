@@ -0,0 +1,240 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generator
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+from langgraph.constants import TAG_NOSTREAM
+
+from app.src.core.metrics import (
+    LLM_CALLS,
+    LLM_DURATION,
+    LLM_TOKENS,
+    NODE_DURATION,
+    TOOL_DURATION,
+    TOOL_ERRORS,
+)
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_MESSAGE = "Desculpe, ocorreu um erro ao processar sua solicitação. Tente novamente mais tarde."
+
+
+@dataclass
+class LLMCall:
+    """
+    An LLM invocation requested by a node. The node receives the response back.
+    `stream=False` keeps internal calls (e.g. routing decisions) out of the
+    token stream sent to the customer.
+    """
+
+    llm: Any
+    input: Any
+    kwargs: dict = field(default_factory=dict)
+    label: str = "LLM"
+    stream: bool = True
+
+    def runnable(self) -> Any:
+        if self.stream:
+            return self.llm
+        return self.llm.with_config(tags=[TAG_NOSTREAM])
+
+
+NodeSteps = Generator[LLMCall, AIMessage, dict]
+
+
+class LLMUsageStats:
+    """
+    Token usage per LLMCall label, as reported in the responses' usage metadata.
+    `cached_input_tokens` are prompt tokens served from the provider's prompt cache.
+    """
+
+    def __init__(self):
+        self._labels: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, response: AIMessage) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return
+        cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        with self._lock:
+            entry = self._labels.setdefault(
+                label,
+                {
+                    "calls": 0,
+                    "input_tokens": 0,
+                    "cached_input_tokens": 0,
+                    "output_tokens": 0,
+                },
+            )
+            entry["calls"] += 1
+            entry["input_tokens"] += usage.get("input_tokens", 0)
+            entry["cached_input_tokens"] += cached
+            entry["output_tokens"] += usage.get("output_tokens", 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            labels = {label: dict(entry) for label, entry in self._labels.items()}
+        for entry in labels.values():
+            entry["cached_ratio"] = (
+                entry["cached_input_tokens"] / entry["input_tokens"]
+                if entry["input_tokens"]
+                else 0.0
+            )
+        input_tokens = sum(entry["input_tokens"] for entry in labels.values())
+        cached = sum(entry["cached_input_tokens"] for entry in labels.values())
+        return {
+            "input_tokens": input_tokens,
+            "cached_input_tokens": cached,
+            "cached_ratio": cached / input_tokens if input_tokens else 0.0,
+            "by_label": labels,
+        }
+
+
+usage_stats = LLMUsageStats()
+
+
+def _fallback(call: LLMCall, error: Exception) -> AIMessage:
+    logger.error(f"Error in {call.label} invocation: {error}")
+    return AIMessage(content=FALLBACK_MESSAGE)
+
+
+def _node_name(config: RunnableConfig | None, default: str) -> str:
+    return ((config or {}).get("metadata") or {}).get("langgraph_node", default)
+
+
+def _observe_llm(node: str, started: float, response: AIMessage | None) -> None:
+    """Prometheus counters for one LLM call; `response` is None when it failed."""
+    LLM_DURATION.observe(time.perf_counter() - started, node=node)
+    LLM_CALLS.inc(node=node, outcome="ok" if response is not None else "error")
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        LLM_TOKENS.inc(usage.get("input_tokens", 0), node=node, kind="input")
+        LLM_TOKENS.inc(cached, node=node, kind="cached_input")
+        LLM_TOKENS.inc(usage.get("output_tokens", 0), node=node, kind="output")
+
+
+def sync_node(steps_fn: Callable[[dict], NodeSteps]) -> Callable[[dict], dict]:
+    """
+    Builds a graph node that drives `steps_fn` with blocking `llm.invoke` calls.
+    """
+
+    def node(state: dict, config: RunnableConfig | None = None) -> dict:
+        name = _node_name(config, node.__name__)
+        steps = steps_fn(state)
+        try:
+            call = next(steps)
+            while True:
+                started = time.perf_counter()
+                try:
+                    response = call.runnable().invoke(call.input, **call.kwargs)
+                    usage_stats.record(call.label, response)
+                    _observe_llm(name, started, response)
+                except Exception as e:
+                    _observe_llm(name, started, None)
+                    response = _fallback(call, e)
+                call = steps.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+    node.__name__ = steps_fn.__name__.removeprefix("_").removesuffix("_steps")
+    return node
+
+
+def async_node(steps_fn: Callable[[dict], NodeSteps]) -> Callable[[dict], Any]:
+    """
+    Builds a graph node that drives `steps_fn` with `await llm.ainvoke` calls,
+    so a slow LLM call never blocks the event loop.
+    """
+
+    async def node(state: dict, config: RunnableConfig | None = None) -> dict:
+        name = _node_name(config, node.__name__)
+        steps = steps_fn(state)
+        try:
+            call = next(steps)
+            while True:
+                started = time.perf_counter()
+                try:
+                    response = await call.runnable().ainvoke(call.input, **call.kwargs)
+                    usage_stats.record(call.label, response)
+                    _observe_llm(name, started, response)
+                except Exception as e:
+                    _observe_llm(name, started, None)
+                    response = _fallback(call, e)
+                call = steps.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+    node.__name__ = "a" + steps_fn.__name__.removeprefix("_").removesuffix("_steps")
+    return node
+
+
+def timed_node(name: str, action: Callable | Runnable, use_async: bool) -> Callable:
+    """
+    Wraps a graph node (a `sync_node`/`async_node` function or a Runnable such as
+    ToolNode) so every run is observed in the node duration histogram.
+    """
+    if isinstance(action, Runnable):
+        run, arun = action.invoke, action.ainvoke
+    else:
+        run = arun = action
+
+    if use_async:
+
+        async def anode(state: dict, config: RunnableConfig) -> Any:
+            started = time.perf_counter()
+            try:
+                return await arun(state, config)
+            finally:
+                NODE_DURATION.observe(time.perf_counter() - started, node=name)
+
+        anode.__name__ = name
+        return anode
+
+    def node(state: dict, config: RunnableConfig) -> Any:
+        started = time.perf_counter()
+        try:
+            return run(state, config)
+        finally:
+            NODE_DURATION.observe(time.perf_counter() - started, node=name)
+
+    node.__name__ = name
+    return node
+
+
+def _tool_failed(result: Any) -> bool:
+    return isinstance(result, ToolMessage) and result.status == "error"
+
+
+def observe_tool_call(request, execute):
+    """ToolNode `wrap_tool_call`: latency and errors per tool."""
+    tool = request.tool_call["name"]
+    started = time.perf_counter()
+    failed = True
+    try:
+        result = execute(request)
+        failed = _tool_failed(result)
+        return result
+    finally:
+        TOOL_DURATION.observe(time.perf_counter() - started, tool=tool)
+        if failed:
+            TOOL_ERRORS.inc(tool=tool)
+
+
+async def aobserve_tool_call(request, execute):
+    """ToolNode `awrap_tool_call`: latency and errors per tool."""
+    tool = request.tool_call["name"]
+    started = time.perf_counter()
+    failed = True
+    try:
+        result = await execute(request)
+        failed = _tool_failed(result)
+        return result
+    finally:
+        TOOL_DURATION.observe(time.perf_counter() - started, tool=tool)
+        if failed:
+            TOOL_ERRORS.inc(tool=tool)
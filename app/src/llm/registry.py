@@ -0,0 +1,70 @@
+import httpx
+from langchain_openai import ChatOpenAI
+
+from app.src.config.settings import (
+    LLM_MAX_CONNECTIONS,
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    LLM_TIMEOUT_SECONDS,
+    OPENAI_API_KEY,
+)
+from app.src.llm.tools import (
+    authenticate_customer,
+    get_exchange_rate_tool,
+    get_exchange_rates_tool,
+    get_score_and_or_limit,
+    process_limit_increase_request,
+    save_birth_date,
+    save_cpf,
+    submit_credit_interview,
+)
+
+
+class LLMRegistry:
+    """
+    Every model the graph uses, built once: a single ChatOpenAI on one pooled
+    HTTP client (sync and async), plus its tool-bound variants, so tool schemas
+    are converted at startup instead of on every turn.
+    """
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        temperature: float = LLM_TEMPERATURE,
+        api_key: str | None = OPENAI_API_KEY,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+    ):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._http_client = httpx.Client(limits=limits, timeout=timeout)
+        self._http_async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+
+        self.base = ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            http_client=self._http_client,
+            http_async_client=self._http_async_client,
+            # Token usage (and prompt cache reads) also when the graph is streamed
+            stream_usage=True,
+        )
+        self.triage = self.base.bind_tools(
+            [save_cpf, save_birth_date, authenticate_customer]
+        )
+        self.credit = self.base.bind_tools(
+            [process_limit_increase_request, get_score_and_or_limit]
+        )
+        self.currency = self.base.bind_tools(
+            [get_exchange_rate_tool, get_exchange_rates_tool]
+        )
+        self.interview = self.base.bind_tools([submit_credit_interview])
+
+    async def aclose(self) -> None:
+        self._http_client.close()
+        await self._http_async_client.aclose()
+
+
+llm_registry = LLMRegistry()
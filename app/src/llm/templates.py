@@ -0,0 +1,99 @@
+import itertools
+import threading
+
+from app.src.config.settings import (
+    RESPONSE_TEMPLATE_MODE,
+    RESPONSE_TEMPLATE_OVERRIDES,
+)
+
+# Fixed transitions of the flow. Variants are rotated so consecutive customers
+# don't all read the same sentence.
+RESPONSE_TEMPLATES: dict[str, list[str]] = {
+    "cpf_saved": [
+        "CPF registrado! ✅ Agora, por favor, me informe sua data de nascimento (DD/MM/AAAA).",
+        "Obrigado, CPF recebido. Para continuar, qual é a sua data de nascimento?",
+        "Perfeito, já tenho seu CPF. Agora preciso da sua data de nascimento, no formato DD/MM/AAAA.",
+        "CPF anotado! Só falta a sua data de nascimento para concluir a autenticação.",
+    ],
+    "cpf_invalid": [
+        "Esse CPF não parece válido. Pode me enviar novamente os 11 dígitos?",
+        "Não consegui validar esse CPF. Por favor, informe um CPF com 11 dígitos.",
+        "Hmm, o CPF informado é inválido. Confere e me envia de novo, por favor?",
+    ],
+    "birth_date_invalid": [
+        "Não entendi essa data. Pode informar sua data de nascimento no formato DD/MM/AAAA?",
+        "Essa data parece inválida. Por favor, envie sua data de nascimento como DD/MM/AAAA.",
+        "Não consegui reconhecer a data. Pode tentar novamente, por exemplo 15/05/1990?",
+    ],
+    "auth_success": [
+        "Autenticação concluída com sucesso! 🔒 Como posso te ajudar hoje: crédito, limite ou câmbio?",
+        "Pronto, você está autenticado. Em que posso ajudar? Posso consultar seu limite, score ou cotações.",
+        "Tudo certo, identidade confirmada! ✅ Quer consultar seu crédito ou alguma cotação?",
+        "Autenticado com sucesso. Posso ajudar com limite, score, entrevista de crédito ou câmbio.",
+    ],
+    "auth_failed": [
+        "Autenticação falhou. Dados incorretos. Reiniciando processo.",
+    ],
+    "auth_blocked": [
+        "Número máximo de tentativas atingido. Encerrando atendimento.",
+    ],
+    "exit": [
+        "O Rito Bank agradece seu contato! Sessão encerrada com segurança. Até a próxima!",
+        "Obrigado por falar com o Rito Bank! Sua sessão foi encerrada com segurança. Até logo! 👋",
+        "Atendimento finalizado com segurança. O Rito Bank agradece e fica à disposição. Até mais!",
+    ],
+    "limit_approved": [
+        "Parabéns! 🎉 Seu limite foi aumentado para R$ {new_limit} e já está disponível. Posso ajudar em algo mais?",
+        "Boa notícia: seu pedido foi aprovado e seu novo limite é de R$ {new_limit}. ✅ Precisa de mais alguma coisa?",
+        "Aumento aprovado! Seu limite agora é R$ {new_limit}. Se quiser, posso consultar seu score ou alguma cotação.",
+    ],
+    "limit_rejected": [
+        "{message} Se quiser, posso iniciar agora uma entrevista de análise de perfil para tentar ajustar seu score.",
+        "{message} Uma alternativa é fazer uma entrevista rápida de perfil financeiro, que pode melhorar seu score. Quer começar agora?",
+        "{message} Posso te ajudar com uma entrevista de análise de crédito para reavaliar seu score. Deseja iniciar?",
+    ],
+}
+
+
+def format_brl(value: float) -> str:
+    """1234.5 -> '1.234,50'."""
+    return f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+class ResponseTemplates:
+    """
+    Canned replies for fixed transitions. Each transition is rendered from its
+    templates or left to the LLM according to `mode` and `overrides`
+    ("template" or "llm"). Transitions that never had an LLM phrasing
+    (exit, auth_failed, auth_blocked) are rendered unconditionally.
+    """
+
+    def __init__(
+        self,
+        templates: dict[str, list[str]],
+        mode: str = "template",
+        overrides: dict[str, str] | None = None,
+    ):
+        self.templates = templates
+        self.mode = mode
+        self.overrides = overrides or {}
+        self._counters = {name: itertools.count() for name in templates}
+        self._lock = threading.Lock()
+
+    def enabled(self, transition: str) -> bool:
+        if transition not in self.templates:
+            return False
+        return self.overrides.get(transition, self.mode) == "template"
+
+    def render(self, transition: str, **values) -> str:
+        variants = self.templates[transition]
+        with self._lock:
+            index = next(self._counters[transition]) % len(variants)
+        return variants[index].format(**values)
+
+
+response_templates = ResponseTemplates(
+    RESPONSE_TEMPLATES,
+    mode=RESPONSE_TEMPLATE_MODE,
+    overrides=RESPONSE_TEMPLATE_OVERRIDES,
+)
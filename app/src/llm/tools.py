@@ -1,15 +1,18 @@
 import logging
 import re
-import time
 from datetime import datetime
 from typing import Literal
-from zipfile import Path
 
-import pandas as pd
-import requests
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
 
 from app.src.services.credit_service import CreditService
+from app.src.services.exchange_service import (
+    ExchangeRateError,
+    Quote,
+    cross_rates,
+    exchange_service,
+)
+from app.src.services.user_service import authenticate_user
 
 credit_service = CreditService()
 
@@ -182,7 +185,7 @@ def save_birth_date(birth_date: str) -> dict:
 @tool
 def authenticate_customer(cpf: str, birth_date: str) -> dict:
     """
-    Authenticates the customer by validating CPF and birth date against the clients CSV.
+    Authenticates the customer by validating CPF and birth date against the client index.
 
     Args:
         cpf: Customer's CPF (11 digits, numbers only)
@@ -194,42 +197,7 @@ def authenticate_customer(cpf: str, birth_date: str) -> dict:
     logger.debug(
         f"Authenticate customer called with CPF: {cpf} and Birth Date: {birth_date}"
     )
-    try:
-        csv_path = Path("app/src/data/clients.csv")
-        if not csv_path.exists():
-            return {"authenticated": False, "message": "Base de dados não encontrada"}
-
-        cpf_clean = "".join(filter(str.isdigit, cpf))
-        if len(cpf_clean) != 11:
-            return {
-                "authenticated": False,
-                "message": "CPF inválido. Deve conter 11 dígitos",
-            }
-
-        df = pd.read_csv(csv_path, dtype={"cpf": str})
-        df["cpf"] = df["cpf"].astype(str).str.strip()
-        df["birth_date"] = df["birth_date"].astype(str).str.strip()
-
-        match = df[(df["cpf"] == cpf_clean) & (df["birth_date"] == birth_date)]
-
-        if not match.empty:
-            return {
-                "authenticated": True,
-                "cpf": cpf_clean,
-                "message": "Cliente autenticado com sucesso",
-            }
-        else:
-            cpf_exists = df[df["cpf"] == cpf_clean]
-            if not cpf_exists.empty:
-                return {
-                    "authenticated": False,
-                    "message": "Data de nascimento não confere",
-                }
-            else:
-                return {"authenticated": False, "message": "CPF não encontrado"}
-
-    except Exception as e:
-        return {"authenticated": False, "message": f"Erro ao autenticar: {str(e)}"}
+    return authenticate_user(cpf, birth_date)
 
 
 @tool
@@ -277,8 +245,14 @@ def submit_credit_interview(
         }
 
 
-@tool
-def get_exchange_rate_tool(coin_code: str) -> str:
+def _format_quote(quote: Quote) -> str:
+    message = f"{quote.code} custa R$ {quote.bid} (BRL)."
+    if quote.stale:
+        message += " (Cotação em cache: a API está indisponível no momento.)"
+    return message
+
+
+def get_exchange_rate(coin_code: str) -> str:
     """
     Queries the exchange rate of a currency against the Brazilian Real (BRL).
     Use this tool to fetch currency values like USD, EUR, BTC, etc.
@@ -291,23 +265,73 @@ def get_exchange_rate_tool(coin_code: str) -> str:
     """
     try:
         logger.info(f"Tool exchange called with coin_code: {coin_code}")
-        time.sleep(3)
-        clean_code = coin_code.replace("-BRL", "").strip().upper()
+        return _format_quote(exchange_service.get_quote(coin_code))
+    except ExchangeRateError as e:
+        return f"Erro: {e}"
+    except Exception as e:
+        return f"Erro técnico: {str(e)}"
+
+
+async def aget_exchange_rate(coin_code: str) -> str:
+    """Async version of `get_exchange_rate`, used when the graph runs with ainvoke."""
+    try:
+        logger.info(f"Tool exchange called with coin_code: {coin_code}")
+        return _format_quote(await exchange_service.aget_quote(coin_code))
+    except ExchangeRateError as e:
+        return f"Erro: {e}"
+    except Exception as e:
+        return f"Erro técnico: {str(e)}"
 
-        url = f"https://economia.awesomeapi.com.br/last/{clean_code}-BRL"
-        response = requests.get(url, timeout=5)
-        if response.status_code != 200:
-            return f"Erro: Não consegui cotação para {clean_code}."
 
-        data = response.json()
-        key = f"{clean_code}BRL"
+get_exchange_rate_tool = StructuredTool.from_function(
+    func=get_exchange_rate,
+    coroutine=aget_exchange_rate,
+    name="get_exchange_rate_tool",
+)
 
-        if key not in data:
-            return f"Erro: Moeda {clean_code} não encontrada na API."
 
-        info = data[key]
-        valor = info["bid"]
-        return f"{clean_code} custa R$ {valor} (BRL)."
+def _format_quotes(
+    quotes: dict[str, Quote], errors: dict[str, ExchangeRateError]
+) -> dict:
+    return {
+        "quotes_brl": {code: quote.bid for code, quote in quotes.items()},
+        "cross_rates": cross_rates(quotes),
+        "stale": sorted(code for code, quote in quotes.items() if quote.stale),
+        "errors": {code: str(error) for code, error in errors.items()},
+    }
+
 
+def get_exchange_rates(coin_codes: list[str]) -> dict:
+    """
+    Queries several currencies at once and returns every conversion between them.
+    Use this tool when the customer asks about more than one currency or wants
+    to convert between two foreign currencies (e.g. USD to EUR).
+
+    Args:
+        coin_codes: Currency codes (e.g., ['USD', 'EUR', 'BTC']).
+    Returns:
+        Dict with quotes_brl (bid of each currency in BRL), cross_rates
+        (cross_rates[A][B] = how many B one A buys, BRL included), stale
+        (codes served from cache) and errors (per currency).
+    """
+    try:
+        logger.info(f"Tool exchange batch called with coin_codes: {coin_codes}")
+        return _format_quotes(*exchange_service.get_quotes(coin_codes))
     except Exception as e:
-        return f"Erro técnico: {str(e)}"
+        return {"errors": {"*": f"Erro técnico: {str(e)}"}}
+
+
+async def aget_exchange_rates(coin_codes: list[str]) -> dict:
+    """Async version of `get_exchange_rates`, used when the graph runs with ainvoke."""
+    try:
+        logger.info(f"Tool exchange batch called with coin_codes: {coin_codes}")
+        return _format_quotes(*await exchange_service.aget_quotes(coin_codes))
+    except Exception as e:
+        return {"errors": {"*": f"Erro técnico: {str(e)}"}}
+
+
+get_exchange_rates_tool = StructuredTool.from_function(
+    func=get_exchange_rates,
+    coroutine=aget_exchange_rates,
+    name="get_exchange_rates_tool",
+)
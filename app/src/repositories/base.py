@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+
+from app.src.repositories.client_repository import normalize_cpf
+
+
+class StorageBackend(ABC):
+    """
+    Persistence used by CreditService and authenticate_user: client records,
+    score-to-limit rules and the limit-request log.
+    """
+
+    @abstractmethod
+    def exists(self) -> bool:
+        """True if the client base is available."""
+
+    @abstractmethod
+    def get_client(self, cpf: str) -> dict | None:
+        """Client record (cpf, birth_date, name, score, credit_limit) or None."""
+
+    def authenticate(self, cpf: str, birth_date: str) -> dict:
+        """Validates CPF and birth date (YYYY-MM-DD) with a single indexed lookup."""
+        cpf_clean = normalize_cpf(cpf)
+        if len(cpf_clean) != 11:
+            return {
+                "authenticated": False,
+                "message": "CPF inválido. Deve conter 11 dígitos",
+            }
+
+        record = self.get_client(cpf_clean)
+        if record is None:
+            return {"authenticated": False, "message": "CPF não encontrado"}
+
+        if str(record["birth_date"]).strip() != str(birth_date).strip():
+            return {"authenticated": False, "message": "Data de nascimento não confere"}
+
+        return {
+            "authenticated": True,
+            "cpf": cpf_clean,
+            "message": "Cliente autenticado com sucesso",
+        }
+
+    @abstractmethod
+    def update_client(self, cpf: str, field: str, value) -> bool:
+        """Updates one client field. Returns False if the CPF is unknown."""
+
+    def update_clients(self, field: str, values: dict[str, object]) -> int:
+        """
+        Sets `field` for many clients ({cpf: value}) in one bulk write.
+        Returns how many CPFs were found; backends override the per-client loop.
+        """
+        return sum(
+            self.update_client(cpf, field, value) for cpf, value in values.items()
+        )
+
+    @abstractmethod
+    def get_score_rules(self) -> list[dict]:
+        """Rules as dicts with min_score, max_score and max_limit. Empty if missing."""
+
+    def score_rules_version(self):
+        """
+        Cheap token that changes when the rules change, or None when the backend
+        cannot tell (callers then re-read the rules periodically).
+        """
+        return None
+
+    @abstractmethod
+    def log_limit_request(
+        self, cpf: str, current: float, requested: float, status: str
+    ) -> None:
+        """Records one limit-increase decision."""
+
+    def close(self) -> None:
+        """Flushes pending writes and releases resources on shutdown."""
+        return None
@@ -0,0 +1,270 @@
+import csv
+import io
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CLIENT_FIELD_TYPES = {"score": lambda v: int(float(v or 0)), "credit_limit": float}
+
+
+def normalize_cpf(cpf) -> str:
+    """Keeps only the digits of a CPF ("123.456.789-00" -> "12345678900")."""
+    cpf = str(cpf).strip()
+    if cpf.endswith(".0"):
+        cpf = cpf[:-2]
+    return "".join(filter(str.isdigit, cpf))
+
+
+def coerce_client_field(field: str, value):
+    """Converts a stored value to the type the services expect for `field`."""
+    if field in CLIENT_FIELD_TYPES:
+        return CLIENT_FIELD_TYPES[field](value)
+    return str(value).strip()
+
+
+def parse_client_row(row: dict) -> dict:
+    """Converts a clients.csv row to the types used by the services."""
+    record = {key: (value or "").strip() for key, value in row.items()}
+    record["cpf"] = normalize_cpf(record["cpf"])
+    record["score"] = coerce_client_field("score", record["score"] or 0)
+    record["credit_limit"] = coerce_client_field(
+        "credit_limit", record["credit_limit"] or 0
+    )
+    return record
+
+
+class ClientRepository:
+    """
+    In-memory CPF index over clients.csv.
+    The file is parsed once and re-parsed only when its mtime or size changes,
+    so lookups are O(1) dict accesses.
+
+    Updates are appended to a journal (cpf, field, value, timestamp) next to the
+    base file and applied to the index, instead of rewriting the whole CSV.
+    The journal is replayed on load (crash recovery) and folded back into the
+    base file by a background compaction once it grows past a threshold.
+    """
+
+    def __init__(self, path: Path, compact_threshold: int = 1000):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.compact_threshold = compact_threshold
+        self._index: dict[str, dict] = {}
+        self._fieldnames: list[str] = []
+        self._signature: tuple[int, int] | None = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._lock = threading.RLock()
+        self._compacting = False
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def get(self, cpf: str) -> dict | None:
+        """Returns a copy of the client record, or None if the CPF is unknown."""
+        record = self._current_index().get(normalize_cpf(cpf))
+        return dict(record) if record else None
+
+    def records(self) -> list[dict]:
+        """Copies of every client record (base file plus journal)."""
+        return [dict(record) for record in self._current_index().values()]
+
+    def update(self, cpf: str, field: str, value) -> bool:
+        """
+        Appends one update to the journal and applies it to the index.
+        Returns False if the CPF is unknown.
+        """
+        cpf_clean = normalize_cpf(cpf)
+        with self._lock:
+            record = self._current_index().get(cpf_clean)
+            if record is None:
+                return False
+
+            value = coerce_client_field(field, value)
+            self._append_journal([(cpf_clean, field, value)])
+            record[field] = value
+            if field not in self._fieldnames:
+                self._fieldnames.append(field)
+            self._maybe_compact()
+        return True
+
+    def update_many(self, field: str, values: dict[str, object]) -> int:
+        """
+        Appends {cpf: value} to the journal in one write and fsync and applies it
+        to the index. Returns how many CPFs were found.
+        """
+        with self._lock:
+            index = self._current_index()
+            entries = []
+            for cpf, value in values.items():
+                cpf_clean = normalize_cpf(cpf)
+                if cpf_clean in index:
+                    entries.append(
+                        (cpf_clean, field, coerce_client_field(field, value))
+                    )
+            if not entries:
+                return 0
+
+            self._append_journal(entries)
+            for cpf_clean, _, value in entries:
+                index[cpf_clean][field] = value
+            if field not in self._fieldnames:
+                self._fieldnames.append(field)
+            self._maybe_compact()
+        return len(entries)
+
+    def compact(self) -> None:
+        """
+        Writes the current index to the base file and drops the journal entries
+        it already contains. Safe against crashes at any point: replaying an
+        entry that is already in the base file is a no-op.
+        """
+        with self._lock:
+            self._current_index()
+            if self._journal_entries == 0:
+                return
+            rows = [dict(record) for record in self._index.values()]
+            fieldnames = list(self._fieldnames)
+            compacted_offset = self._journal_offset
+
+        tmp_path = self.path.with_suffix(".csv.tmp")
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self._lock:
+            os.replace(tmp_path, self.path)
+
+            # Keep only the entries appended while the snapshot was being written.
+            with open(self.journal_path, "rb") as f:
+                f.seek(compacted_offset)
+                pending = f.read()
+            journal_tmp = self.journal_path.with_suffix(".journal.tmp")
+            with open(journal_tmp, "wb") as f:
+                f.write(pending)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(journal_tmp, self.journal_path)
+
+            stat = self.path.stat()
+            self._signature = (stat.st_mtime_ns, stat.st_size)
+            self._journal_offset = len(pending)
+            self._journal_entries = pending.count(b"\n")
+
+        logger.info(f"Journal de clientes compactado em {self.path}")
+
+    def invalidate(self) -> None:
+        """Forces a reload on the next access (used right after writing the file)."""
+        with self._lock:
+            self._signature = None
+
+    def _maybe_compact(self) -> None:
+        """Starts a background compaction past the threshold. Caller holds the lock."""
+        if self._journal_entries >= self.compact_threshold and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self._compact_in_background, daemon=True).start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"Erro ao compactar journal de clientes: {e}")
+        finally:
+            self._compacting = False
+
+    def _append_journal(self, entries: list[tuple[str, str, object]]) -> None:
+        """Appends (cpf, field, value) entries with a single write and fsync."""
+        timestamp = datetime.now().isoformat()
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(
+            [cpf, field, value, timestamp] for cpf, field, value in entries
+        )
+        line = buffer.getvalue().encode("utf-8")
+
+        with open(self.journal_path, "ab") as f:
+            if f.tell() > self._journal_offset:
+                # Torn line left by a crash: terminate it so ours stays intact.
+                line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_offset = f.tell()
+
+        self._journal_entries += len(entries)
+
+    def _current_index(self) -> dict[str, dict]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            logger.error(f"Arquivo {self.path} não encontrado.")
+            return {}
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        journal_size = self._journal_size()
+        if signature != self._signature or journal_size != self._journal_offset:
+            with self._lock:
+                if signature != self._signature or journal_size < self._journal_offset:
+                    self._load(signature)
+                elif journal_size > self._journal_offset:
+                    # Entries appended by another process: replay only the tail.
+                    self._replay_journal(self._index, self._journal_offset)
+        return self._index
+
+    def _journal_size(self) -> int:
+        try:
+            return self.journal_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _load(self, signature: tuple[int, int]) -> None:
+        index = {}
+        with open(self.path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            fieldnames = list(reader.fieldnames or [])
+            for row in reader:
+                record = parse_client_row(row)
+                index[record["cpf"]] = record
+
+        self._fieldnames = fieldnames
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._replay_journal(index, 0)
+
+        self._index = index
+        self._signature = signature
+        logger.info(
+            f"Índice de clientes carregado: {len(index)} registros, "
+            f"{self._journal_entries} atualizações do journal"
+        )
+
+    def _replay_journal(self, index: dict[str, dict], offset: int) -> None:
+        """Applies journal entries from `offset` on. A torn last line is ignored."""
+        if not self.journal_path.exists():
+            return
+
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        # Only complete lines are applied, a partial write is retried on next read.
+        complete = data[: data.rfind(b"\n") + 1]
+        for row in csv.reader(io.StringIO(complete.decode("utf-8"))):
+            if len(row) != 4:
+                logger.warning(f"Entrada inválida no journal ignorada: {row}")
+                continue
+            cpf, field, value, _ = row
+            record = index.get(cpf)
+            if record is not None:
+                record[field] = coerce_client_field(field, value)
+                if field not in self._fieldnames:
+                    self._fieldnames.append(field)
+            self._journal_entries += 1
+
+        self._journal_offset = offset + len(complete)
@@ -0,0 +1,75 @@
+import csv
+import logging
+from pathlib import Path
+
+from app.src.repositories.base import StorageBackend
+from app.src.repositories.client_repository import ClientRepository
+from app.src.repositories.limit_request_log import LimitRequestLog
+from app.src.repositories.sharded_client_store import ShardedClientStore
+
+logger = logging.getLogger(__name__)
+
+
+def read_score_rules(path: Path) -> list[dict]:
+    """Rows of score_limit.csv, or [] if the file does not exist."""
+    if not path.exists():
+        return []
+
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            {
+                "min_score": int(row["min_score"]),
+                "max_score": int(row["max_score"]),
+                "max_limit": float(row["max_limit"]),
+            }
+            for row in csv.DictReader(f)
+        ]
+
+
+class CsvStorage(StorageBackend):
+    """
+    File backend: client records (CPF-prefix shards, or clients.csv + journal),
+    score_limit.csv and the request log CSV, written in the background by
+    LimitRequestLog.
+    """
+
+    def __init__(
+        self,
+        clients: ClientRepository | ShardedClientStore,
+        rules_path: Path,
+        limit_log: LimitRequestLog,
+    ):
+        self.clients = clients
+        self.rules_path = Path(rules_path)
+        self.limit_log = limit_log
+
+    def exists(self) -> bool:
+        return self.clients.exists()
+
+    def get_client(self, cpf: str) -> dict | None:
+        return self.clients.get(cpf)
+
+    def update_client(self, cpf: str, field: str, value) -> bool:
+        return self.clients.update(cpf, field, value)
+
+    def update_clients(self, field: str, values: dict[str, object]) -> int:
+        return self.clients.update_many(field, values)
+
+    def get_score_rules(self) -> list[dict]:
+        return read_score_rules(self.rules_path)
+
+    def score_rules_version(self):
+        try:
+            stat = self.rules_path.stat()
+        except FileNotFoundError:
+            return 0
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def log_limit_request(
+        self, cpf: str, current: float, requested: float, status: str
+    ) -> None:
+        self.limit_log.append(cpf, current, requested, status)
+
+    def close(self) -> None:
+        self.limit_log.close()
+        self.clients.compact()
@@ -0,0 +1,230 @@
+import atexit
+import csv
+import io
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: rotation is only safe within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LIMIT_REQUEST_HEADER = [
+    "cpf_cliente",
+    "data_hora_solicitacao",
+    "limite_atual",
+    "novo_limite_solicitado",
+    "status_pedido",
+]
+
+
+class LimitRequestLog:
+    """
+    Buffered writer for the limit-request audit log (increase_limits_request.csv).
+
+    `append` only stamps the row and queues it; a background thread writes the
+    queue in one append per batch, every `flush_interval` seconds or as soon as
+    `batch_size` rows are waiting, and fsyncs each batch when `fsync` is
+    "batch". A crash therefore loses at most the last `flush_interval` seconds
+    of requests ("off" leaves durability to the OS page cache). With
+    `flush_interval` 0 every append is written inline, as before.
+
+    Once the active file reaches `segment_max_bytes` it is renamed to
+    `<name>.<timestamp>.csv` and a new one is started; `segments()` lists every
+    file in order. Writes and rotation hold an flock on `<name>.lock`, so
+    several uvicorn workers can share the log. `close` drains the queue; rows
+    appended after it are written inline.
+    Listeners added with `add_listener` are called with the rows of every
+    batch once it is on disk.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = 1.0,
+        batch_size: int = 512,
+        fsync: str = "batch",
+        segment_max_bytes: int = 64 * 1024 * 1024,
+    ):
+        if fsync not in ("batch", "off"):
+            raise ValueError(f"LIMIT_LOG_FSYNC inválido: {fsync}")
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".lock")
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.segment_max_bytes = segment_max_bytes
+        self._pending: list[list] = []
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closing = False
+        self._listeners: list[Callable[[list[list]], None]] = []
+        self._stats = {
+            "appended": 0,
+            "written": 0,
+            "batches": 0,
+            "fsyncs": 0,
+            "rotations": 0,
+            "write_errors": 0,
+        }
+
+    def append(self, cpf: str, current: float, requested: float, status: str) -> list:
+        """Queues one decision, stamped now, and returns the row."""
+        row = [cpf, datetime.now().isoformat(), current, requested, status]
+        if self.flush_interval > 0:
+            with self._cond:
+                if not self._closing:
+                    if self._thread is None:
+                        self._start()
+                    self._pending.append(row)
+                    self._stats["appended"] += 1
+                    if len(self._pending) >= self.batch_size:
+                        self._cond.notify()
+                    return row
+
+        # Inline with no interval, and after close (the writer thread is gone)
+        self._write([row])
+        self._stats["appended"] += 1
+        return row
+
+    def flush(self) -> None:
+        """Writes every queued row now, in the calling thread."""
+        with self._cond:
+            rows, self._pending = self._pending, []
+        if rows:
+            self._write_or_requeue(rows)
+
+    def close(self) -> None:
+        """Stops the background writer after draining the queue."""
+        with self._cond:
+            self._closing = True
+            thread = self._thread
+            self._cond.notify()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def add_listener(self, listener: Callable[[list[list]], None]) -> None:
+        """Calls `listener(rows)` from the writing thread after each batch."""
+        self._listeners.append(listener)
+
+    @contextmanager
+    def locked(self):
+        """Holds off every writer of the log, in this process and in others."""
+        with self._write_lock, self._file_lock():
+            yield
+
+    def segments(self) -> list[Path]:
+        """Rotated segments, oldest first, followed by the active file."""
+        rotated = sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"))
+        return rotated + ([self.path] if self.path.exists() else [])
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending = len(self._pending)
+        try:
+            active_bytes = self.path.stat().st_size
+        except FileNotFoundError:
+            active_bytes = 0
+        return {
+            "pending": pending,
+            "flush_interval_seconds": self.flush_interval,
+            "fsync": self.fsync,
+            "active_bytes": active_bytes,
+            "segments": len(self.segments()),
+            **self._stats,
+        }
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="limit-request-log", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closing or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                rows, self._pending = self._pending, []
+                closing = self._closing
+            if rows:
+                self._write_or_requeue(rows)
+            if closing:
+                return
+
+    def _write_or_requeue(self, rows: list[list]) -> None:
+        try:
+            self._write(rows)
+        except Exception as e:
+            self._stats["write_errors"] += 1
+            logger.error(
+                f"Erro ao gravar log de solicitações ({len(rows)} linhas): {e}"
+            )
+            with self._cond:
+                # Retried on the next flush, ahead of newer rows
+                self._pending[:0] = rows
+
+    def _write(self, rows: list[list]) -> None:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        data = buffer.getvalue().encode("utf-8")
+
+        with self.locked():
+            self._rotate_if_full()
+            with open(self.path, "ab") as f:
+                if f.tell() == 0:
+                    data = (",".join(LIMIT_REQUEST_HEADER) + "\n").encode() + data
+                f.write(data)
+                f.flush()
+                if self.fsync == "batch":
+                    os.fsync(f.fileno())
+                    self._stats["fsyncs"] += 1
+        self._stats["written"] += len(rows)
+        self._stats["batches"] += 1
+
+        for listener in self._listeners:
+            try:
+                listener(rows)
+            except Exception as e:
+                logger.error(f"Erro em listener do log de solicitações: {e}")
+
+    def _rotate_if_full(self) -> None:
+        if not self.segment_max_bytes:
+            return
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size < self.segment_max_bytes:
+            return
+        segment = self.path.with_name(
+            f"{self.path.stem}.{datetime.now():%Y%m%dT%H%M%S%f}{self.path.suffix}"
+        )
+        os.rename(self.path, segment)
+        self._stats["rotations"] += 1
+        logger.info(f"Log de solicitações rotacionado para {segment.name}")
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,93 @@
+"""
+Imports the CSV data into the SQLite database used by STORAGE_BACKEND=sqlite.
+
+    python -m app.src.repositories.migrate [--database-url URL] [--data-dir DIR]
+
+Clients are upserted from the CLIENT_STORE layout (shards, or clients.csv plus
+its journal), score rules are replaced and the limit-request log (every rotated
+segment, oldest first) is imported only into an empty table, so the command can be re-run safely.
+The files are only read: no shards are built and the journal is not compacted.
+"""
+
+import argparse
+import csv
+import logging
+from pathlib import Path
+
+from sqlmodel import Session, delete, func, select
+
+from app.src.config.logging_config import setup_logging
+from app.src.config.settings import CLIENT_STORE, DATA_DIR, DATABASE_URL
+from app.src.repositories.client_repository import ClientRepository
+from app.src.repositories.csv_storage import read_score_rules
+from app.src.repositories.limit_request_log import LimitRequestLog
+from app.src.repositories.sharded_client_store import ShardedClientStore
+from app.src.repositories.sqlite_storage import (
+    Client,
+    LimitRequest,
+    ScoreRule,
+    SqliteStorage,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def read_client_records(data_dir: Path, layout: str = CLIENT_STORE) -> list[dict]:
+    """
+    Client records as the csv backend would serve them, without building its
+    store: the shards once they exist, else clients.csv plus its journal (what
+    the shards would be built from).
+    """
+    shards = data_dir / "clients"
+    if layout == "sharded" and shards.is_dir():
+        return ShardedClientStore(shards).records()
+    return ClientRepository(data_dir / "clients.csv").records()
+
+
+def migrate(database_url: str, data_dir: Path) -> dict:
+    # Only used to list segments: its writer thread starts on the first append
+    limit_log = LimitRequestLog(data_dir / "increase_limits_request.csv")
+    sqlite_storage = SqliteStorage(database_url)
+    counts = {"clients": 0, "score_rules": 0, "limit_requests": 0}
+
+    try:
+        with Session(sqlite_storage.engine) as session:
+            for record in read_client_records(data_dir):
+                session.merge(Client(**{k: record[k] for k in Client.model_fields}))
+                counts["clients"] += 1
+
+            rules = read_score_rules(data_dir / "score_limit.csv")
+            if rules:
+                session.exec(delete(ScoreRule))
+                session.add_all(ScoreRule(**rule) for rule in rules)
+                counts["score_rules"] = len(rules)
+
+            has_requests = session.exec(
+                select(func.count()).select_from(LimitRequest)
+            ).one()
+            if not has_requests:
+                for segment in limit_log.segments():
+                    with open(segment, newline="", encoding="utf-8") as f:
+                        for row in csv.DictReader(f):
+                            session.add(LimitRequest(**row))
+                            counts["limit_requests"] += 1
+
+            session.commit()
+    finally:
+        sqlite_storage.close()
+    return counts
+
+
+def main():
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Import CSV data into SQLite.")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    counts = migrate(args.database_url, args.data_dir)
+    logger.info(f"Migração concluída para {args.database_url}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import csv
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.src.repositories.client_repository import (
+    ClientRepository,
+    coerce_client_field,
+    normalize_cpf,
+    parse_client_row,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover the threads of one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CLIENT_FIELDNAMES = ["cpf", "birth_date", "name", "score", "credit_limit"]
+
+
+class _Shard:
+    """One CPF-prefix file with its parsed records and the lock for writing it."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_path = path.with_suffix(".lock")
+        self.lock = threading.Lock()
+        self.records: dict[str, dict] = {}
+        self.fieldnames: list[str] = list(CLIENT_FIELDNAMES)
+        self.signature: tuple[int, int, int] | None = None
+
+
+class ShardedClientStore:
+    """
+    Client records split by CPF prefix into small CSV files
+    (`<root>/<prefix>.csv`), so an update rewrites only its shard and updates
+    of clients in different shards run in parallel.
+
+    Each shard has a thread lock and, on POSIX, an flock on `<prefix>.lock`
+    held across processes (uvicorn workers). A write re-reads the shard under
+    both locks, applies the change and replaces the file atomically (temp file,
+    fsync, rename), so concurrent writers never overwrite each other's updates
+    and readers see either the old or the new shard.
+
+    Reads use the parsed shard and only re-parse it when the file's inode,
+    mtime or size change. On first use the shards are built from `seed_path`
+    (clients.csv plus its journal), which is not read again afterwards.
+    """
+
+    def __init__(
+        self, root: Path, seed_path: Path | None = None, prefix_digits: int = 2
+    ):
+        self.root = Path(root)
+        self.seed_path = Path(seed_path) if seed_path else None
+        self.prefix_digits = prefix_digits
+        self._shards: dict[str, _Shard] = {}
+        self._lock = threading.Lock()
+        self._split = False
+
+    def exists(self) -> bool:
+        return self.root.is_dir() or bool(self.seed_path and self.seed_path.exists())
+
+    def get(self, cpf: str) -> dict | None:
+        """Returns a copy of the client record, or None if the CPF is unknown."""
+        cpf_clean = normalize_cpf(cpf)
+        shard = self._shard(cpf_clean)
+        with shard.lock:
+            record = self._refresh(shard).get(cpf_clean)
+            return dict(record) if record else None
+
+    def records(self) -> list[dict]:
+        """Copies of every client record, shard by shard."""
+        self._ensure_split()
+        records = []
+        for path in sorted(self.root.glob("*.csv")):
+            shard = self._shard_for_prefix(path.stem)
+            with shard.lock:
+                records.extend(dict(record) for record in self._refresh(shard).values())
+        return records
+
+    def update(self, cpf: str, field: str, value) -> bool:
+        """
+        Rewrites the client's shard with the new value.
+        Returns False if the CPF is unknown.
+        """
+        cpf_clean = normalize_cpf(cpf)
+        shard = self._shard(cpf_clean)
+        with shard.lock, self._file_lock(shard):
+            record = self._refresh(shard).get(cpf_clean)
+            if record is None:
+                return False
+            record[field] = coerce_client_field(field, value)
+            if field not in shard.fieldnames:
+                shard.fieldnames.append(field)
+            self._write(shard)
+        return True
+
+    def update_many(self, field: str, values: dict[str, object]) -> int:
+        """
+        Applies {cpf: value} with one rewrite per affected shard, each under the
+        same locks as `update`. Returns how many CPFs were found.
+        """
+        by_prefix: dict[str, dict[str, object]] = {}
+        for cpf, value in values.items():
+            cpf_clean = cpf if cpf.isdigit() else normalize_cpf(cpf)
+            prefix = cpf_clean[: self.prefix_digits].ljust(self.prefix_digits, "0")
+            by_prefix.setdefault(prefix, {})[cpf_clean] = coerce_client_field(
+                field, value
+            )
+
+        self._ensure_split()
+        updated = 0
+        for prefix, changes in by_prefix.items():
+            shard = self._shard_for_prefix(prefix)
+            with shard.lock, self._file_lock(shard):
+                records = self._refresh(shard)
+                found = 0
+                for cpf_clean, value in changes.items():
+                    record = records.get(cpf_clean)
+                    if record is not None:
+                        record[field] = value
+                        found += 1
+                if found:
+                    if field not in shard.fieldnames:
+                        shard.fieldnames.append(field)
+                    self._write(shard)
+                updated += found
+        return updated
+
+    def compact(self) -> None:
+        """Nothing to fold: every update is already in its shard file."""
+
+    def invalidate(self) -> None:
+        """Forces every shard to be re-read on its next access."""
+        with self._lock:
+            for shard in self._shards.values():
+                shard.signature = None
+
+    def prefix(self, cpf: str) -> str:
+        return normalize_cpf(cpf)[: self.prefix_digits].ljust(self.prefix_digits, "0")
+
+    def _shard(self, cpf_clean: str) -> _Shard:
+        self._ensure_split()
+        return self._shard_for_prefix(self.prefix(cpf_clean))
+
+    def _shard_for_prefix(self, prefix: str) -> _Shard:
+        shard = self._shards.get(prefix)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.setdefault(
+                    prefix, _Shard(self.root / f"{prefix}.csv")
+                )
+        return shard
+
+    @contextmanager
+    def _file_lock(self, shard: _Shard):
+        if fcntl is None:
+            yield
+            return
+        with open(shard.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self, shard: _Shard) -> dict[str, dict]:
+        """Re-parses the shard if the file changed. Caller holds shard.lock."""
+        try:
+            stat = shard.path.stat()
+        except FileNotFoundError:
+            shard.records, shard.signature = {}, None
+            return shard.records
+
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature != shard.signature:
+            with open(shard.path, newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                shard.fieldnames = list(reader.fieldnames or CLIENT_FIELDNAMES)
+                shard.records = {
+                    record["cpf"]: record for record in map(parse_client_row, reader)
+                }
+            shard.signature = signature
+        return shard.records
+
+    def _write(self, shard: _Shard) -> None:
+        """Atomically replaces the shard file. Caller holds both shard locks."""
+        tmp_path = shard.path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=shard.fieldnames)
+                writer.writeheader()
+                writer.writerows(shard.records.values())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, shard.path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            shard.signature = None  # in-memory change not persisted: re-read
+            raise
+
+        stat = shard.path.stat()
+        shard.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _ensure_split(self) -> None:
+        """
+        Builds the shard directory from the seed file on first use. Shards are
+        written to a temporary directory that is renamed into place, so other
+        processes see either no shards or all of them.
+        """
+        if self._split:
+            return
+        if self.root.is_dir() or not (self.seed_path and self.seed_path.exists()):
+            self._split = self.root.is_dir()
+            return
+
+        seed = ClientRepository(self.seed_path)
+        by_prefix: dict[str, list[dict]] = {}
+        for record in seed.records():
+            by_prefix.setdefault(self.prefix(record["cpf"]), []).append(record)
+
+        self.root.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(
+            tempfile.mkdtemp(prefix=f".{self.root.name}-", dir=self.root.parent)
+        )
+        staging.chmod(0o755)
+        try:
+            for prefix, records in by_prefix.items():
+                fieldnames = list(CLIENT_FIELDNAMES)
+                for record in records:
+                    fieldnames += [key for key in record if key not in fieldnames]
+                with open(
+                    staging / f"{prefix}.csv", "w", newline="", encoding="utf-8"
+                ) as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(records)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.rename(staging, self.root)
+            logger.info(
+                f"Clientes de {self.seed_path} divididos em {len(by_prefix)} shards"
+                f" em {self.root}"
+            )
+        except OSError:
+            if not self.root.is_dir():
+                raise
+            # Another process finished the split first
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self._split = True
@@ -0,0 +1,143 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import bindparam, event, update
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+from app.src.repositories.base import StorageBackend
+from app.src.repositories.client_repository import coerce_client_field, normalize_cpf
+
+logger = logging.getLogger(__name__)
+
+
+class Client(SQLModel, table=True):
+    __tablename__ = "clients"
+
+    cpf: str = Field(primary_key=True, max_length=11)
+    birth_date: str
+    name: str
+    score: int = 0
+    credit_limit: float = 0.0
+
+
+class ScoreRule(SQLModel, table=True):
+    __tablename__ = "score_rules"
+
+    id: int | None = Field(default=None, primary_key=True)
+    min_score: int = Field(index=True)
+    max_score: int
+    max_limit: float
+
+
+class LimitRequest(SQLModel, table=True):
+    __tablename__ = "limit_requests"
+
+    id: int | None = Field(default=None, primary_key=True)
+    cpf_cliente: str = Field(index=True)
+    data_hora_solicitacao: str
+    limite_atual: float
+    novo_limite_solicitado: float
+    status_pedido: str
+
+
+CLIENT_COLUMNS = set(Client.model_fields) - {"cpf"}
+
+
+def create_sqlite_engine(database_url: str, pool_size: int = 5):
+    """
+    Engine with a connection pool and WAL journaling, so readers never block
+    on the single writer.
+    """
+    engine = create_engine(
+        database_url,
+        pool_size=pool_size,
+        max_overflow=pool_size,
+        pool_pre_ping=True,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return engine
+
+
+class SqliteStorage(StorageBackend):
+    """SQLModel backend over a SQLite file (see `migrate.py` to import the CSVs)."""
+
+    def __init__(self, database_url: str, pool_size: int = 5):
+        self.engine = create_sqlite_engine(database_url, pool_size)
+        SQLModel.metadata.create_all(self.engine)
+
+    def exists(self) -> bool:
+        return True
+
+    def get_client(self, cpf: str) -> dict | None:
+        with Session(self.engine) as session:
+            client = session.get(Client, normalize_cpf(cpf))
+            return client.model_dump() if client else None
+
+    def update_client(self, cpf: str, field: str, value) -> bool:
+        if field not in CLIENT_COLUMNS:
+            raise ValueError(f"Campo de cliente inválido: {field}")
+
+        with Session(self.engine) as session:
+            result = session.exec(
+                update(Client)
+                .where(Client.cpf == normalize_cpf(cpf))
+                .values({field: coerce_client_field(field, value)})
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def update_clients(self, field: str, values: dict[str, object]) -> int:
+        if field not in CLIENT_COLUMNS:
+            raise ValueError(f"Campo de cliente inválido: {field}")
+
+        table = Client.__table__
+        statement = (
+            update(table)
+            .where(table.c.cpf == bindparam("cpf_key"))
+            .values({field: bindparam("new_value")})
+        )
+        params = [
+            {
+                "cpf_key": normalize_cpf(cpf),
+                "new_value": coerce_client_field(field, value),
+            }
+            for cpf, value in values.items()
+        ]
+        # One transaction, one executemany
+        with self.engine.begin() as connection:
+            return connection.execute(statement, params).rowcount
+
+    def get_score_rules(self) -> list[dict]:
+        with Session(self.engine) as session:
+            rules = session.exec(select(ScoreRule).order_by(ScoreRule.min_score))
+            return [
+                rule.model_dump(include={"min_score", "max_score", "max_limit"})
+                for rule in rules
+            ]
+
+    def log_limit_request(
+        self, cpf: str, current: float, requested: float, status: str
+    ) -> None:
+        with Session(self.engine) as session:
+            session.add(
+                LimitRequest(
+                    cpf_cliente=cpf,
+                    data_hora_solicitacao=datetime.now().isoformat(),
+                    limite_atual=current,
+                    novo_limite_solicitado=requested,
+                    status_pedido=status,
+                )
+            )
+            session.commit()
+
+    def close(self) -> None:
+        self.engine.dispose()
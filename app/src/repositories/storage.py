@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from app.src.config.settings import (
+    CLIENT_JOURNAL_COMPACT_THRESHOLD,
+    CLIENT_SHARD_PREFIX_DIGITS,
+    CLIENT_STORE,
+    DATA_DIR,
+    DATABASE_POOL_SIZE,
+    DATABASE_URL,
+    LIMIT_LOG_BATCH_SIZE,
+    LIMIT_LOG_FLUSH_INTERVAL_SECONDS,
+    LIMIT_LOG_FSYNC,
+    LIMIT_LOG_SEGMENT_MAX_BYTES,
+    STORAGE_BACKEND,
+)
+from app.src.repositories.base import StorageBackend
+from app.src.repositories.client_repository import ClientRepository
+from app.src.repositories.csv_storage import CsvStorage
+from app.src.repositories.limit_request_log import LimitRequestLog
+from app.src.repositories.sharded_client_store import ShardedClientStore
+
+
+def create_client_store(
+    layout: str = CLIENT_STORE, data_dir: Path = DATA_DIR
+) -> ClientRepository | ShardedClientStore:
+    """Client records of the csv backend, laid out as CLIENT_STORE says."""
+    if layout == "sharded":
+        return ShardedClientStore(
+            data_dir / "clients",
+            seed_path=data_dir / "clients.csv",
+            prefix_digits=CLIENT_SHARD_PREFIX_DIGITS,
+        )
+
+    if layout == "journal":
+        return ClientRepository(
+            data_dir / "clients.csv", compact_threshold=CLIENT_JOURNAL_COMPACT_THRESHOLD
+        )
+
+    raise ValueError(f"CLIENT_STORE inválido: {layout}")
+
+
+def create_limit_request_log(data_dir: Path = DATA_DIR) -> LimitRequestLog:
+    """The csv backend's limit-request log, buffered as the LIMIT_LOG_* settings say."""
+    return LimitRequestLog(
+        data_dir / "increase_limits_request.csv",
+        flush_interval=LIMIT_LOG_FLUSH_INTERVAL_SECONDS,
+        batch_size=LIMIT_LOG_BATCH_SIZE,
+        fsync=LIMIT_LOG_FSYNC,
+        segment_max_bytes=LIMIT_LOG_SEGMENT_MAX_BYTES,
+    )
+
+
+def create_storage(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    """Builds the storage selected by STORAGE_BACKEND ("csv" or "sqlite")."""
+    if backend == "csv":
+        return CsvStorage(
+            clients=create_client_store(),
+            rules_path=DATA_DIR / "score_limit.csv",
+            limit_log=create_limit_request_log(),
+        )
+
+    if backend == "sqlite":
+        from app.src.repositories.sqlite_storage import SqliteStorage
+
+        return SqliteStorage(DATABASE_URL, pool_size=DATABASE_POOL_SIZE)
+
+    raise ValueError(f"STORAGE_BACKEND inválido: {backend}")
+
+
+storage = create_storage()
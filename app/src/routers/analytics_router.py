@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.src.repositories.client_repository import normalize_cpf
+from app.src.services.limit_request_analytics import limit_request_analytics
+
+analytics_router = APIRouter()
+
+
+@analytics_router.get("/limit-requests")
+async def get_limit_request_analytics(
+    cpf: str | None = Query(default=None, max_length=32),
+    days: int = Query(default=30, ge=1),
+):
+    """
+    Limit-request counts, approval rate, average requested and current limits
+    and rejections in the last `days` days, for every client or one CPF.
+    """
+    if limit_request_analytics is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Análise de solicitações disponível apenas com STORAGE_BACKEND=csv",
+        )
+
+    if cpf is None:
+        return limit_request_analytics.summary(days)
+
+    result = limit_request_analytics.client(normalize_cpf(cpf), days)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Nenhuma solicitação de limite para este CPF",
+        )
+    return result
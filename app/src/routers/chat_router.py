@@ -1,13 +1,36 @@
-from fastapi import APIRouter
+import json
 
-from app.src.services.model_service import get_model_message
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.src.services.model_service import get_model_message, stream_model_message
 
 chat_router = APIRouter()
 
 
 @chat_router.post("/message")
-async def send_message(query: str):
+async def send_message(
+    query: str, session_id: str | None = Query(default=None, max_length=128)
+):
     # try:
-    return {"response": await get_model_message(query)}
+    session_id, response = await get_model_message(query, session_id)
+    return {"response": response, "session_id": session_id}
     # except Exception as e:
     # raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno do servidor")
+
+
+@chat_router.post("/stream")
+async def stream_message(
+    query: str, session_id: str | None = Query(default=None, max_length=128)
+):
+    """Same turn as /message, sent as Server-Sent Events while the graph runs."""
+
+    async def events():
+        async for event, data in stream_model_message(query, session_id):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
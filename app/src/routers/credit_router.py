@@ -0,0 +1,48 @@
+import asyncio
+import io
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.src.config.settings import SCORE_RECALCULATE_TOKEN
+from app.src.services.credit_service import CreditService, read_interview_csv
+
+credit_router = APIRouter()
+credit_service = CreditService()
+
+
+def require_recalculate_token(request: Request) -> None:
+    """Hides the endpoint unless a token is set, then requires it as Bearer."""
+    if not SCORE_RECALCULATE_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), SCORE_RECALCULATE_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Token inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@credit_router.post(
+    "/scores/recalculate", dependencies=[Depends(require_recalculate_token)]
+)
+async def recalculate_scores(request: Request):
+    """
+    Re-scores a cohort from a CSV body (cpf, renda, emprego, despesas,
+    dependentes, tem_dividas) and writes every new score in one bulk update.
+    """
+    body = await request.body()
+
+    def run() -> dict:
+        return credit_service.recalculate_scores(read_interview_csv(io.BytesIO(body)))
+
+    try:
+        # Parsing and scoring a large cohort would otherwise block the event loop
+        return await asyncio.to_thread(run)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422, detail=f"Arquivo de entrevistas inválido: {e}"
+        ) from e
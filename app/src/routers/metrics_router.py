@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from app.src.core.metrics import CONTENT_TYPE, metrics
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("")
+async def get_metrics():
+    """Prometheus scrape endpoint."""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
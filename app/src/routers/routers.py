@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from .analytics_router import analytics_router
 from .chat_router import chat_router
+from .credit_router import credit_router
+from .metrics_router import metrics_router
+from .stats_router import stats_router
 
 api_router = APIRouter()
 """
@@ -9,3 +13,7 @@ home, clients, products, orders, and payments.
 """
 
 api_router.include_router(chat_router, prefix="/chat", tags=["chat"])
+api_router.include_router(credit_router, prefix="/credit", tags=["credit"])
+api_router.include_router(stats_router, prefix="/stats", tags=["stats"])
+api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
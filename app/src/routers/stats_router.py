@@ -0,0 +1,54 @@
+from fastapi import APIRouter
+
+from app.src.core.app_state import app_state
+from app.src.graph.intent_router import intent_router
+from app.src.graph.response_cache import response_cache
+from app.src.graph.runner import usage_stats
+from app.src.repositories.storage import storage
+from app.src.services.exchange_service import exchange_service
+from app.src.services.model_service import session_store
+
+stats_router = APIRouter()
+
+
+@stats_router.get("/sessions")
+async def get_session_stats():
+    """Active session count and eviction counters, used for pod sizing."""
+    return session_store.stats()
+
+
+@stats_router.get("/exchange")
+async def get_exchange_stats():
+    """Quote cache hits, coalesced misses and upstream calls."""
+    return exchange_service.stats()
+
+
+@stats_router.get("/http")
+async def get_http_stats():
+    """Connection slots in use per upstream host, waiters and circuit breaker state."""
+    return app_state.http_client.stats()
+
+
+@stats_router.get("/intents")
+async def get_intent_stats():
+    """How many supervisor turns were classified by rules instead of the LLM."""
+    return intent_router.stats()
+
+
+@stats_router.get("/llm")
+async def get_llm_stats():
+    """Prompt/completion tokens per node call and the share served from the prompt cache."""
+    return usage_stats.stats()
+
+
+@stats_router.get("/responses")
+async def get_response_cache_stats():
+    """Small-talk replies answered from the response cache instead of the LLM."""
+    return response_cache.stats()
+
+
+@stats_router.get("/limit-log")
+async def get_limit_log_stats():
+    """Limit-request log rows queued and written, fsyncs and segment rotations (csv backend)."""
+    limit_log = getattr(storage, "limit_log", None)
+    return limit_log.stats() if limit_log else {"buffered": False}
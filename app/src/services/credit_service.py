@@ -1,18 +1,117 @@
-import csv
 import logging
-from datetime import datetime
-from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from app.src.repositories.base import StorageBackend
+from app.src.repositories.storage import storage as default_storage
+from app.src.services.score_limit_table import ScoreLimitRules
+
 logger = logging.getLogger(__name__)
 
+# Interview score weights, shared by the single and the batch recalculation
+PESO_RENDA = 30
+PESO_EMPREGO = {
+    "formal": 300,
+    "autonomo": 200,
+    "autônomo": 200,
+    "desempregado": 0,
+}
+PESO_DEPENDENTES = {0: 100, 1: 80, 2: 60}
+PESO_DEPENDENTES_DEMAIS = 30
+PESO_DIVIDAS = {True: -100, False: 100}
+
+INTERVIEW_COLUMNS = [
+    "cpf",
+    "renda",
+    "emprego",
+    "despesas",
+    "dependentes",
+    "tem_dividas",
+]
+
+BOOLEAN_ANSWERS = {
+    "true": True,
+    "1": True,
+    "sim": True,
+    "s": True,
+    "false": False,
+    "0": False,
+    "nao": False,
+    "não": False,
+    "n": False,
+}
+
+
+def score_components(
+    renda: float, emprego: str, despesas: float, dependentes: int, tem_dividas: bool
+) -> tuple[float, int, int, int]:
+    """Weighted parts of the interview score: (financeiro, emprego, dependentes, dívidas)."""
+    fator_financeiro = (renda / (despesas + 1)) * PESO_RENDA
+    score_emprego = PESO_EMPREGO.get(emprego.lower().strip(), 0)
+    score_dependentes = PESO_DEPENDENTES.get(dependentes, PESO_DEPENDENTES_DEMAIS)
+    score_dividas = PESO_DIVIDAS[tem_dividas]
+    return fator_financeiro, score_emprego, score_dependentes, score_dividas
+
+
+def _as_boolean(value) -> bool | None:
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    return BOOLEAN_ANSWERS.get(str(value).strip().lower())
+
+
+def read_interview_csv(source) -> pd.DataFrame:
+    """Interview answers CSV (path or file object); CPFs are kept as text."""
+    return pd.read_csv(source, dtype={"cpf": str, "emprego": str, "tem_dividas": str})
+
+
+def compute_scores(answers: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized `calculate_and_update_score` over a table with INTERVIEW_COLUMNS.
+    Returns cpf, score and valid; rows with a missing or non-numeric answer, or
+    a score that is not finite (despesas == -1), are marked invalid.
+    Employment types and debt answers are mapped once per distinct value.
+    """
+    renda = pd.to_numeric(answers["renda"], errors="coerce").to_numpy(dtype=float)
+    despesas = pd.to_numeric(answers["despesas"], errors="coerce").to_numpy(dtype=float)
+    dependentes = pd.to_numeric(answers["dependentes"], errors="coerce").to_numpy(
+        dtype=float
+    )
+
+    emprego_codes, kinds = pd.factorize(answers["emprego"])
+    weights = np.array(
+        [PESO_EMPREGO.get(str(kind).lower().strip(), 0) for kind in kinds] + [0],
+        dtype=float,
+    )
+    score_emprego = weights[emprego_codes]  # code -1 (missing): trailing 0, invalid
+
+    score_dependentes = np.full(len(answers), PESO_DEPENDENTES_DEMAIS, dtype=float)
+    for count, weight in PESO_DEPENDENTES.items():
+        score_dependentes[dependentes == count] = weight
+
+    codes, values = pd.factorize(answers["tem_dividas"])
+    parsed = [_as_boolean(value) for value in values] + [None]
+    known = np.array([flag is not None for flag in parsed])[codes]
+    score_dividas = np.array(
+        [PESO_DIVIDAS[bool(flag)] for flag in parsed], dtype=float
+    )[codes]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fator_financeiro = (renda / (despesas + 1)) * PESO_RENDA
+    # Same addition order as the single path, so both truncate identically
+    raw = fator_financeiro + score_emprego + score_dependentes + score_dividas
+
+    valid = known & (emprego_codes >= 0) & np.isfinite(raw) & ~np.isnan(dependentes)
+    scores = np.clip(np.where(valid, raw, 0.0), 0, 1000).astype(np.int64)
+    return pd.DataFrame(
+        {"cpf": answers["cpf"].to_numpy(), "score": scores, "valid": valid}
+    )
+
 
 class CreditService:
-    def __init__(self):
-        self.rules_path = Path("app/src/data/score_limit.csv")
-        self.log_path = Path("app/src/data/increase_limits_request.csv")
-        self.clients_path = Path("app/src/data/clients.csv")
+    def __init__(self, storage: StorageBackend | None = None):
+        self.storage = storage or default_storage
+        self.score_rules = ScoreLimitRules(self.storage)
 
     def process_limit_request(
         self, cpf: str, current_limit: float, requested_limit: float, score: int
@@ -21,7 +120,7 @@ class CreditService:
         Orchestrates the validation, decision, and logging process for credit limit increases.
         """
         try:
-            if not self.rules_path.exists():
+            if self.score_rules.table() is None:
                 return {
                     "status": "erro",
                     "message": "Erro interno: Tabela de regras de crédito não encontrada.",
@@ -51,23 +150,20 @@ class CreditService:
 
     def update_client_limit(self, cpf: str, new_limit: float) -> bool:
         """
-        Updates the client's credit limit in the clients.csv file.
+        Updates the client's credit limit in the client storage.
         """
         try:
-            if not self.clients_path.exists():
+            if not self.storage.exists():
                 logger.error("Arquivo clients.csv não encontrado.")
                 return False
 
-            df = pd.read_csv(self.clients_path, dtype={"cpf": str})
             cpf_clean = str(cpf).strip()
-            df["cpf"] = df["cpf"].str.strip()
-
-            if cpf_clean not in df["cpf"].values:
+            if not self.storage.update_client(
+                cpf_clean, "credit_limit", float(new_limit)
+            ):
                 logger.error(f"Cliente {cpf_clean} não encontrado para atualização.")
                 return False
 
-            df.loc[df["cpf"] == cpf_clean, "credit_limit"] = float(new_limit)
-            df.to_csv(self.clients_path, index=False)
             logger.info(
                 f"Limite atualizado com sucesso para CPF {cpf_clean}: R$ {new_limit}"
             )
@@ -79,26 +175,15 @@ class CreditService:
 
     def get_client_data(self, cpf: str) -> dict:
         """
-        Retrieves complete client data (Score, Limit, Name) from the CSV.
+        Retrieves complete client data (Score, Limit, Name) from the client storage.
         Returns a dictionary or None if not found.
         """
         try:
-            if not self.clients_path.exists():
+            if not self.storage.exists():
                 logger.error("Arquivo clients.csv não encontrado.")
                 return None
 
-            df = pd.read_csv(self.clients_path, dtype={"cpf": str})
-
-            cpf_clean = str(cpf).strip()
-            df["cpf"] = df["cpf"].str.strip()
-            client_row = df[df["cpf"] == cpf_clean]
-
-            print(client_row)
-
-            if client_row.empty:
-                return None
-
-            return client_row.to_dict(orient="records")[0]
+            return self.storage.get_client(cpf)
 
         except Exception as e:
             logger.error(f"Erro ao buscar dados do cliente: {e}")
@@ -114,30 +199,12 @@ class CreditService:
         tem_dividas: bool,
     ) -> dict:
         """
-        Calculates the new score based on a weighted formula and updates the CSV.
+        Calculates the new score based on a weighted formula and updates the client storage.
         """
         try:
-            PESO_RENDA = 30
-            PESO_EMPREGO = {
-                "formal": 300,
-                "autonomo": 200,
-                "autônomo": 200,
-                "desempregado": 0,
-            }
-            PESO_DEPENDENTES = {0: 100, 1: 80, 2: 60}
-
-            def get_peso_dep(n):
-                return PESO_DEPENDENTES.get(n, 30)
-
-            PESO_DIVIDAS = {True: -100, False: 100}
-
-            fator_financeiro = (renda / (despesas + 1)) * PESO_RENDA
-
-            emprego_clean = emprego.lower().strip()
-            score_emprego = PESO_EMPREGO.get(emprego_clean, 0)
-
-            score_dependentes = get_peso_dep(dependentes)
-            score_dividas = PESO_DIVIDAS[tem_dividas]
+            fator_financeiro, score_emprego, score_dependentes, score_dividas = (
+                score_components(renda, emprego, despesas, dependentes, tem_dividas)
+            )
 
             novo_score_raw = (
                 fator_financeiro + score_emprego + score_dependentes + score_dividas
@@ -158,69 +225,63 @@ class CreditService:
             logger.error(f"Erro ao calcular score: {e}")
             return {"success": False, "error": str(e)}
 
+    def recalculate_scores(self, answers: pd.DataFrame) -> dict:
+        """
+        Scores a whole table of interview answers (INTERVIEW_COLUMNS) at once and
+        writes the new scores to the client storage in one bulk update.
+        Invalid rows are skipped; when a CPF repeats, its last row wins.
+        """
+        missing = [column for column in INTERVIEW_COLUMNS if column not in answers]
+        if missing:
+            raise ValueError(f"Colunas ausentes na entrevista: {', '.join(missing)}")
+
+        scored = compute_scores(answers)
+        valid = scored[scored["valid"]]
+        scores = dict(
+            zip(valid["cpf"].astype(str), valid["score"].tolist(), strict=True)
+        )
+        updated = self.storage.update_clients("score", scores) if scores else 0
+
+        result = {
+            "rows": len(answers),
+            "invalid_rows": int(len(scored) - len(valid)),
+            "clients_scored": len(scores),
+            "clients_updated": updated,
+            "unknown_clients": len(scores) - updated,
+        }
+        logger.info(f"Recálculo de score em lote: {result}")
+        return result
+
     def _update_client_field(self, cpf: str, field: str, value) -> bool:
-        """Generic method to update a field in clients.csv"""
+        """Generic method to update a client field in the client storage"""
         try:
-            if not self.clients_path.exists():
-                return False
-
-            df = pd.read_csv(self.clients_path, dtype=str)
-
-            cpf_clean = str(cpf).replace(".", "").replace("-", "").strip()
-            df["cpf_clean"] = (
-                df["cpf"]
-                .astype(str)
-                .str.replace(r"\.0$", "", regex=True)
-                .str.replace(".", "", regex=False)
-                .str.replace("-", "", regex=False)
-                .str.strip()
-            )
-
-            if cpf_clean not in df["cpf_clean"].values:
+            if not self.storage.exists():
                 return False
 
-            df.loc[df["cpf_clean"] == cpf_clean, field] = str(value)
-
-            df = df.drop(columns=["cpf_clean"])
-            df.to_csv(self.clients_path, index=False)
-            return True
+            return self.storage.update_client(cpf, field, value)
         except Exception as e:
             logger.error(f"Erro ao atualizar CSV: {e}")
             return False
 
+    def max_allowed_limits(self, scores) -> np.ndarray:
+        """Maps a whole array of scores to their maximum limits in one call."""
+        table = self.score_rules.table()
+        if table is None:
+            return np.zeros(np.shape(scores), dtype=float)
+        return table.max_limits(scores)
+
     def _get_max_allowed_limit(self, score: int) -> float:
-        """Reads the rules CSV and returns the maximum limit for the given score."""
+        """Returns the maximum limit for the given score from the compiled rules."""
         try:
-            df_rules = pd.read_csv(self.rules_path)
-            for _, row in df_rules.iterrows():
-                if row["min_score"] <= score <= row["max_score"]:
-                    return float(row["max_limit"])
-            return 0.0
+            table = self.score_rules.table()
+            return table.max_limit(score) if table else 0.0
         except Exception as e:
             logger.error(f"Erro ao ler tabela de score: {e}")
             raise e
 
     def _log_transaction(self, cpf: str, current: float, requested: float, status: str):
-        """Records the request in the CSV log file."""
+        """Records the request in the limit-request log."""
         try:
-            self.log_path.parent.mkdir(parents=True, exist_ok=True)
-            file_exists = self.log_path.exists()
-
-            with open(self.log_path, "a", newline="") as f:
-                writer = csv.writer(f)
-                if not file_exists:
-                    writer.writerow(
-                        [
-                            "cpf_cliente",
-                            "data_hora_solicitacao",
-                            "limite_atual",
-                            "novo_limite_solicitado",
-                            "status_pedido",
-                        ]
-                    )
-
-                writer.writerow(
-                    [cpf, datetime.now().isoformat(), current, requested, status]
-                )
+            self.storage.log_limit_request(cpf, current, requested, status)
         except Exception as e:
             logger.error(f"Erro ao salvar log de solicitação: {e}")
@@ -0,0 +1,357 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal, localcontext
+
+from app.src.config.settings import (
+    EXCHANGE_API_BASE_URL,
+    EXCHANGE_QUOTE_MAX_STALE_SECONDS,
+    EXCHANGE_QUOTE_TTL_OVERRIDES,
+    EXCHANGE_QUOTE_TTL_SECONDS,
+    EXCHANGE_RATE_LIMIT_BURST,
+    EXCHANGE_RATE_LIMIT_PER_SECOND,
+)
+from app.src.core.http_client import CircuitOpenError, HttpClient
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeRateError(Exception):
+    """The quote could not be fetched and there is no usable cached value."""
+
+
+class CurrencyNotFoundError(ExchangeRateError):
+    """The upstream API does not know the currency."""
+
+
+class UnknownPairError(ExchangeRateError):
+    """The upstream answered 404: at least one requested pair does not exist."""
+
+
+@dataclass
+class Quote:
+    code: str
+    bid: str
+    fetched_at: float
+    stale: bool = False
+
+
+def cross_rates(
+    quotes: dict[str, Quote], precision: int = 12
+) -> dict[str, dict[str, str]]:
+    """
+    Full conversion matrix between the quoted currencies and BRL:
+    `rates[a][b]` is how many units of `b` one unit of `a` buys.
+    Computed with Decimal so the values match the upstream bids digit for digit.
+    """
+    bids = {"BRL": Decimal(1)}
+    bids.update({code: Decimal(quote.bid) for code, quote in quotes.items()})
+
+    with localcontext() as ctx:
+        ctx.prec = precision
+        return {
+            source: {
+                target: str(+(source_bid / target_bid))
+                for target, target_bid in bids.items()
+                if target != source
+            }
+            for source, source_bid in bids.items()
+        }
+
+
+class RateLimiter:
+    """Token bucket shared by sync and async callers."""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes one token and returns how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class ExchangeRateService:
+    """
+    Quotes against BRL with a per-currency TTL cache.
+    Concurrent misses for the same currency share one upstream request, and if
+    the upstream fails a quote up to `max_stale_seconds` past its TTL is served.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        default_ttl: float,
+        ttl_overrides: dict[str, float],
+        max_stale_seconds: float,
+        rate_limiter: RateLimiter,
+        http_client: HttpClient | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.default_ttl = default_ttl
+        self.ttl_overrides = ttl_overrides
+        self.max_stale_seconds = max_stale_seconds
+        self.rate_limiter = rate_limiter
+        self._http_client = http_client
+        self._cache: dict[str, Quote] = {}
+        self._inflight: dict[str, Future] = {}
+        self._ainflight: dict[str, asyncio.Future] = {}
+        # Strong references to settling tasks; the loop only keeps weak ones
+        self._settling: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stale_served": 0,
+            "upstream_calls": 0,
+            "upstream_errors": 0,
+        }
+
+    @property
+    def http_client(self) -> HttpClient:
+        """The app lifespan injects its shared client; scripts get a private one."""
+        if self._http_client is None:
+            self._http_client = HttpClient()
+        return self._http_client
+
+    @http_client.setter
+    def http_client(self, client: HttpClient | None) -> None:
+        self._http_client = client
+
+    def ttl_for(self, code: str) -> float:
+        return self.ttl_overrides.get(code, self.default_ttl)
+
+    def get_quote(self, code: str) -> Quote:
+        code = self._clean(code)
+        quotes, errors = self.get_quotes([code])
+        if code in errors:
+            raise errors[code]
+        return quotes[code]
+
+    async def aget_quote(self, code: str) -> Quote:
+        code = self._clean(code)
+        quotes, errors = await self.aget_quotes([code])
+        if code in errors:
+            raise errors[code]
+        return quotes[code]
+
+    def get_quotes(
+        self, codes: list[str]
+    ) -> tuple[dict[str, Quote], dict[str, ExchangeRateError]]:
+        """
+        Quotes for several currencies. Cache misses are fetched together in a
+        single upstream request. Returns (quotes, errors) keyed by currency code.
+        """
+        quotes, pending, owned = self._claim(codes, self._inflight, Future)
+
+        if owned:
+            try:
+                outcomes = self._resolve_many(list(owned))
+            except Exception as e:
+                outcomes = {code: e for code in owned}
+            self._settle(owned, outcomes, self._inflight)
+
+        errors = {}
+        for code, future in pending.items():
+            try:
+                quotes[code] = future.result()
+            except ExchangeRateError as e:
+                errors[code] = e
+        return quotes, errors
+
+    async def aget_quotes(
+        self, codes: list[str]
+    ) -> tuple[dict[str, Quote], dict[str, ExchangeRateError]]:
+        """Async version of `get_quotes`."""
+        loop = asyncio.get_running_loop()
+        quotes, pending, owned = self._claim(codes, self._ainflight, loop.create_future)
+
+        if owned:
+            # A task, so waiters in other requests are settled even if we get cancelled.
+            task = asyncio.ensure_future(self._asettle(owned))
+            self._settling.add(task)
+            task.add_done_callback(self._settling.discard)
+
+        errors = {}
+        for code, future in pending.items():
+            try:
+                quotes[code] = await asyncio.shield(future)
+            except ExchangeRateError as e:
+                errors[code] = e
+        return quotes, errors
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"cached_currencies": len(self._cache), **self._stats}
+
+    @staticmethod
+    def _clean(code: str) -> str:
+        return code.replace("-BRL", "").strip().upper()
+
+    def _claim(self, codes, inflight: dict, future_factory):
+        """
+        Splits `codes` into fresh cache hits, futures to wait on and the codes this
+        caller must fetch itself (registered as in flight so others wait on them).
+        """
+        quotes, pending, owned = {}, {}, {}
+        with self._lock:
+            for code in dict.fromkeys(self._clean(code) for code in codes):
+                quote = self._cache.get(code)
+                if quote and time.monotonic() - quote.fetched_at < self.ttl_for(code):
+                    self._stats["hits"] += 1
+                    quotes[code] = quote
+                    continue
+
+                self._stats["misses"] += 1
+                if code in inflight:
+                    self._stats["coalesced"] += 1
+                    pending[code] = inflight[code]
+                else:
+                    pending[code] = owned[code] = inflight[code] = future_factory()
+        return quotes, pending, owned
+
+    def _settle(self, owned: dict, outcomes: dict, inflight: dict) -> None:
+        with self._lock:
+            for code, future in owned.items():
+                inflight.pop(code, None)
+                outcome = outcomes[code]
+                if isinstance(outcome, Exception):
+                    if not isinstance(outcome, ExchangeRateError):
+                        outcome = ExchangeRateError(f"Erro técnico: {outcome}")
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+    async def _asettle(self, owned: dict) -> None:
+        try:
+            outcomes = await self._aresolve_many(list(owned))
+        except Exception as e:
+            outcomes = {code: e for code in owned}
+        self._settle(owned, outcomes, self._ainflight)
+
+    def _resolve_many(self, codes: list[str]) -> dict:
+        try:
+            self.rate_limiter.acquire()
+            data = self._fetch(codes)
+        except UnknownPairError as e:
+            if len(codes) == 1:
+                return {codes[0]: self._stale_or_error(codes[0], e)}
+            # The API rejects the whole batch if one pair is unknown: ask one by one.
+            return {code: self._resolve_many([code])[code] for code in codes}
+        except Exception as e:
+            return {code: self._stale_or_error(code, e) for code in codes}
+        return self._store(codes, data)
+
+    async def _aresolve_many(self, codes: list[str]) -> dict:
+        try:
+            await self.rate_limiter.aacquire()
+            data = await self._afetch(codes)
+        except UnknownPairError as e:
+            if len(codes) == 1:
+                return {codes[0]: self._stale_or_error(codes[0], e)}
+            outcomes = {}
+            for code in codes:
+                outcomes.update(await self._aresolve_many([code]))
+            return outcomes
+        except Exception as e:
+            return {code: self._stale_or_error(code, e) for code in codes}
+        return self._store(codes, data)
+
+    def _store(self, codes: list[str], data: dict) -> dict:
+        outcomes = {}
+        now = time.monotonic()
+        with self._lock:
+            for code in codes:
+                info = data.get(f"{code}BRL")
+                if info is None:
+                    outcomes[code] = CurrencyNotFoundError(
+                        f"Moeda {code} não encontrada na API."
+                    )
+                    continue
+                outcomes[code] = self._cache[code] = Quote(code, info["bid"], now)
+        return outcomes
+
+    def _stale_or_error(self, code: str, error: Exception) -> Quote | ExchangeRateError:
+        with self._lock:
+            self._stats["upstream_errors"] += 1
+            quote = self._cache.get(code)
+            age = time.monotonic() - quote.fetched_at if quote else None
+            if quote and age < self.ttl_for(code) + self.max_stale_seconds:
+                self._stats["stale_served"] += 1
+                logger.warning(
+                    f"Cotação de {code} indisponível ({error}), usando valor de {age:.0f}s atrás"
+                )
+                return Quote(code, quote.bid, quote.fetched_at, stale=True)
+        if isinstance(error, UnknownPairError):
+            return CurrencyNotFoundError(f"Moeda {code} não encontrada na API.")
+        return ExchangeRateError(f"Não consegui cotação para {code}.")
+
+    def _url(self, codes: list[str]) -> str:
+        return f"{self.base_url}/last/{','.join(f'{code}-BRL' for code in codes)}"
+
+    def _parse(self, codes: list[str], status_code: int, response) -> dict:
+        if status_code == 404:
+            raise UnknownPairError(f"HTTP 404 para {codes}")
+        if status_code != 200:
+            raise ExchangeRateError(f"HTTP {status_code}")
+        return response.json()
+
+    def _fetch(self, codes: list[str]) -> dict:
+        with self._upstream_call():
+            response = self.http_client.get(self._url(codes))
+        return self._parse(codes, response.status_code, response)
+
+    async def _afetch(self, codes: list[str]) -> dict:
+        with self._upstream_call():
+            response = await self.http_client.aget(self._url(codes))
+        return self._parse(codes, response.status_code, response)
+
+    @contextmanager
+    def _upstream_call(self):
+        """Counts the request unless the circuit breaker rejected it."""
+        reached = True
+        try:
+            yield
+        except CircuitOpenError:
+            reached = False
+            raise
+        finally:
+            if reached:
+                with self._lock:
+                    self._stats["upstream_calls"] += 1
+
+
+exchange_service = ExchangeRateService(
+    base_url=EXCHANGE_API_BASE_URL,
+    default_ttl=EXCHANGE_QUOTE_TTL_SECONDS,
+    ttl_overrides=EXCHANGE_QUOTE_TTL_OVERRIDES,
+    max_stale_seconds=EXCHANGE_QUOTE_MAX_STALE_SECONDS,
+    rate_limiter=RateLimiter(EXCHANGE_RATE_LIMIT_PER_SECOND, EXCHANGE_RATE_LIMIT_BURST),
+)
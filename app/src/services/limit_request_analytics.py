@@ -0,0 +1,291 @@
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+from app.src.config.settings import (
+    LIMIT_ANALYTICS_RETENTION_DAYS,
+    LIMIT_ANALYTICS_SNAPSHOT_EVERY,
+    LIMIT_ANALYTICS_SNAPSHOT_PATH,
+)
+from app.src.repositories.limit_request_log import LIMIT_REQUEST_HEADER, LimitRequestLog
+from app.src.repositories.storage import storage
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def _empty_totals() -> dict:
+    return {
+        "requests": 0,
+        "approved": 0,
+        "rejected": 0,
+        "sum_requested": 0.0,
+        "sum_current": 0.0,
+        "last_request_at": None,
+        "rejections_by_day": {},
+    }
+
+
+class LimitRequestAnalytics:
+    """
+    Running aggregates over the limit-request log: request, approval and
+    rejection counts, sums of requested and current limits and rejections per
+    day, globally and per CPF. Queries read the aggregates, so they cost the
+    same whatever the size of the log.
+
+    The aggregates follow the log files instead of the calls that produced the
+    rows: each refresh parses only the bytes appended since the last one
+    (across rotated segments), so rows written by other uvicorn workers are
+    counted too. The log calls `refresh` after every batch it writes and
+    queries refresh first. Aggregates and read position are saved to
+    `snapshot_path` every `snapshot_every` rows and on close, so a restart
+    only parses the tail; without a usable snapshot every segment is read.
+    Daily rejection buckets older than `retention_days` are dropped.
+    """
+
+    def __init__(
+        self,
+        log: LimitRequestLog,
+        snapshot_path: Path,
+        snapshot_every: int = 10000,
+        retention_days: int = 90,
+    ):
+        self.log = log
+        self.snapshot_path = Path(snapshot_path)
+        self.snapshot_every = snapshot_every
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._reset()
+        log.add_listener(self._on_write)
+
+    def summary(self, days: int = 30) -> dict:
+        """Global counts plus rejections in the last `days` days."""
+        self.refresh()
+        with self._lock:
+            return {
+                **self._view(self._global, days),
+                "clients": len(self._clients),
+            }
+
+    def client(self, cpf: str, days: int = 30) -> dict | None:
+        """Same figures for one CPF, or None if it never asked for a limit."""
+        self.refresh()
+        with self._lock:
+            totals = self._clients.get(cpf)
+            return {"cpf": cpf, **self._view(totals, days)} if totals else None
+
+    def refresh(self) -> int:
+        """Applies rows appended to the log since the last call; returns how many."""
+        with self._lock:
+            if not self._loaded:
+                self._load_snapshot()
+                self._loaded = True
+            if self._up_to_date():
+                return 0
+
+            with self.log.locked():
+                ingested = self._read_new_rows()
+            self._unsaved += ingested
+            if self._unsaved >= self.snapshot_every:
+                self._save_snapshot()
+            return ingested
+
+    def close(self) -> None:
+        with self._lock:
+            if self._loaded and self._unsaved:
+                self._save_snapshot()
+
+    def _on_write(self, rows: list[list]) -> None:
+        # Before the first query the log is read in full then, not by the writer
+        if self._loaded:
+            self.refresh()
+
+    def _reset(self) -> None:
+        self._global = _empty_totals()
+        self._clients: dict[str, dict] = {}
+        # Read position: last fully read rotated segment, then (inode, offset)
+        # of the file being read
+        self._done_upto = ""
+        self._ino: int | None = None
+        self._offset = 0
+        self._unsaved = 0
+
+    def _up_to_date(self) -> bool:
+        try:
+            stat = self.log.path.stat()
+        except FileNotFoundError:
+            return self._ino is None
+        return stat.st_ino == self._ino and stat.st_size == self._offset
+
+    def _read_new_rows(self) -> int:
+        """Parses unread complete lines of every segment. Caller holds the log lock."""
+        ingested = 0
+        for path in self.log.segments():
+            rotated = path != self.log.path
+            if rotated and path.name <= self._done_upto:
+                continue
+            with open(path, "rb") as f:
+                ino = os.fstat(f.fileno()).st_ino
+                offset = self._offset if ino == self._ino else 0
+                f.seek(offset)
+                data = f.read()
+            complete = data[: data.rfind(b"\n") + 1]
+            ingested += self._apply(complete)
+            if rotated:
+                self._done_upto, self._ino, self._offset = path.name, None, 0
+            else:
+                self._ino, self._offset = ino, offset + len(complete)
+        return ingested
+
+    def _apply(self, data: bytes) -> int:
+        applied = 0
+        for row in csv.reader(io.StringIO(data.decode("utf-8"))):
+            if row == LIMIT_REQUEST_HEADER:
+                continue
+            try:
+                cpf, requested_at, current, requested, status = row
+                current, requested = float(current), float(requested)
+            except ValueError:
+                logger.warning(f"Linha inválida no log de solicitações ignorada: {row}")
+                continue
+            for totals in (
+                self._global,
+                self._clients.setdefault(cpf, _empty_totals()),
+            ):
+                totals["requests"] += 1
+                totals["sum_requested"] += requested
+                totals["sum_current"] += current
+                totals["last_request_at"] = max(
+                    totals["last_request_at"] or requested_at, requested_at
+                )
+                if status == "aprovado":
+                    totals["approved"] += 1
+                elif status == "rejeitado":
+                    totals["rejected"] += 1
+                    day = requested_at[:10]
+                    totals["rejections_by_day"][day] = (
+                        totals["rejections_by_day"].get(day, 0) + 1
+                    )
+            applied += 1
+        return applied
+
+    def _view(self, totals: dict, days: int) -> dict:
+        requests = totals["requests"]
+        days = max(1, min(days, self.retention_days))
+        today = date.today()
+        by_day = totals["rejections_by_day"]
+        recent = sum(
+            by_day.get((today - timedelta(days=n)).isoformat(), 0) for n in range(days)
+        )
+        return {
+            "requests": requests,
+            "approved": totals["approved"],
+            "rejected": totals["rejected"],
+            "approval_rate": round(totals["approved"] / requests, 4)
+            if requests
+            else 0.0,
+            "avg_requested_limit": round(totals["sum_requested"] / requests, 2)
+            if requests
+            else 0.0,
+            "avg_current_limit": round(totals["sum_current"] / requests, 2)
+            if requests
+            else 0.0,
+            "last_request_at": totals["last_request_at"],
+            "rejections_last_days": {"days": days, "count": recent},
+        }
+
+    def _prune_days(self) -> None:
+        cutoff = (date.today() - timedelta(days=self.retention_days)).isoformat()
+        for totals in (self._global, *self._clients.values()):
+            by_day = totals["rejections_by_day"]
+            for day in [day for day in by_day if day <= cutoff]:
+                del by_day[day]
+
+    def _save_snapshot(self) -> None:
+        """Atomically replaces the snapshot. Caller holds self._lock."""
+        self._prune_days()
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "position": {
+                "done_upto": self._done_upto,
+                "ino": self._ino,
+                "offset": self._offset,
+            },
+            "global": self._global,
+            "clients": self._clients,
+        }
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.error(f"Erro ao salvar snapshot de análise de solicitações: {e}")
+            return
+        self._unsaved = 0
+
+    def _load_snapshot(self) -> None:
+        """Restores the snapshot if its read position still exists in the log."""
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Snapshot de análise ilegível, relendo o log: {e}")
+            return
+
+        position = snapshot.get("position", {})
+        if snapshot.get("version") != SNAPSHOT_VERSION or not self._position_valid(
+            position
+        ):
+            logger.warning("Snapshot de análise não corresponde ao log, relendo o log")
+            return
+
+        self._global = snapshot["global"]
+        self._clients = snapshot["clients"]
+        self._done_upto = position["done_upto"]
+        self._ino = position["ino"]
+        self._offset = position["offset"]
+        logger.info(
+            f"Análise de solicitações restaurada de {self.snapshot_path}: "
+            f"{self._global['requests']} solicitações"
+        )
+
+    def _position_valid(self, position: dict) -> bool:
+        """The file read last must still exist and be at least as long as the offset."""
+        if position.get("ino") is None:
+            return True
+        for path in self.log.segments():
+            stat = path.stat()
+            if stat.st_ino == position["ino"]:
+                return stat.st_size >= position["offset"]
+        return False
+
+
+def create_limit_request_analytics() -> LimitRequestAnalytics | None:
+    """Analytics over the csv backend's log; None for backends without one."""
+    log = getattr(storage, "limit_log", None)
+    if log is None:
+        return None
+    return LimitRequestAnalytics(
+        log,
+        LIMIT_ANALYTICS_SNAPSHOT_PATH,
+        snapshot_every=LIMIT_ANALYTICS_SNAPSHOT_EVERY,
+        retention_days=LIMIT_ANALYTICS_RETENTION_DAYS,
+    )
+
+
+limit_request_analytics = create_limit_request_analytics()
@@ -1,25 +1,187 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import HTTPException
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
 
+from app.src.config.settings import (
+    CHECKPOINT_TURN_LEASE_SECONDS,
+    GRAPH_ASYNC,
+    SESSION_MAX_SESSIONS,
+    SESSION_TTL_SECONDS,
+)
 from app.src.core.app_state import app_state
+from app.src.core.metrics import Gauge, metrics
+from app.src.core.session_store import StaleSessionError, create_session_store
+from app.src.graph.checkpointer import StaleCheckpointError
+
+logger = logging.getLogger(__name__)
+
+
+def new_session_state() -> dict:
+    """Initial AgentState for a new conversation."""
+    return {
+        "messages": [],
+        "cpf_input": None,
+        "birth_date": None,
+        "authenticated": False,
+        "authentication_attempts": 0,
+        "next_agent": None,
+        "credit_interview": False,
+    }
+
+
+STALE_SESSION_DETAIL = (
+    "A sessão foi atualizada por outra requisição. Reenvie a mensagem."
+)
 
-state1 = {
-    "messages": [],
-    "cpf_input": None,
-    "birth_date": None,
-    "authenticated": False,
-    "authentication_attempts": 0,
-    "next_agent": None,
-    "credit_interview": False,
-}
+session_store = create_session_store(
+    state_factory=new_session_state,
+    max_sessions=SESSION_MAX_SESSIONS,
+    ttl_seconds=SESSION_TTL_SECONDS,
+)
 
+metrics.register(
+    Gauge(
+        "rito_active_sessions",
+        "Conversations currently active in the session store.",
+        lambda: session_store.stats()["active_sessions"],
+    )
+)
+
+
+def _turn_input(session_id: str, state: dict, query: str) -> tuple[dict, dict]:
+    """
+    Graph input and run config for one turn. With a checkpointer the saved thread
+    is the source of truth, so only the new message is sent once it exists; this
+    also resumes conversations from before a restart. A thread idle for longer
+    than SESSION_TTL_SECONDS has expired like its session and is deleted, so the
+    turn starts a new conversation (unauthenticated) instead of resuming it.
+    """
+    message = HumanMessage(content=query)
+    config = {"configurable": {"thread_id": session_id}}
+    checkpointer = app_state.checkpointer
+    if checkpointer is not None:
+        age = checkpointer.thread_age(session_id)
+        if age is not None and age < SESSION_TTL_SECONDS:
+            return {"messages": [message]}, config
+        if age is not None:
+            checkpointer.delete_thread(session_id)
+    return {**state, "messages": [*state["messages"], message]}, config
+
+
+@asynccontextmanager
+async def _thread_lease(session_id: str):
+    """
+    Holds the conversation's checkpoint lease for one turn. A turn of the same
+    conversation already running in another worker makes this raise
+    StaleCheckpointError (409) before anything runs or is written.
+    """
+    checkpointer = app_state.checkpointer
+    if checkpointer is None:
+        yield
+        return
+    token = await asyncio.to_thread(
+        checkpointer.lease_thread, session_id, CHECKPOINT_TURN_LEASE_SECONDS
+    )
+    if token is None:
+        raise StaleCheckpointError(session_id)
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(checkpointer.release_thread, session_id, token)
 
-async def get_model_message(query: str) -> str:
-    global state1
 
-    state1["messages"].append(HumanMessage(content=query))
+def _save_turn(session_id: str, version: int, state: dict) -> None:
+    """
+    Stores the state after a turn. Without a checkpointer the version check
+    decides which of two concurrent turns wins. With one, the thread lease
+    already did and the store only mirrors the thread, so a save beaten by
+    another turn's is skipped.
+    """
     try:
-        state1 = app_state.graph.invoke(state1)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    return state1["messages"][-1].content
+        session_store.save(session_id, state, version)
+    except StaleSessionError:
+        if app_state.checkpointer is None:
+            raise
+
+
+async def get_model_message(
+    query: str, session_id: str | None = None
+) -> tuple[str, str]:
+    """Runs one conversation turn and returns (session_id, agent response)."""
+    session_id, session = session_store.get_or_create(session_id)
+
+    async with session.lock:
+        try:
+            async with _thread_lease(session_id):
+                graph_input, config = await asyncio.to_thread(
+                    _turn_input, session_id, session.state, query
+                )
+                if GRAPH_ASYNC:
+                    state = await app_state.graph.ainvoke(graph_input, config)
+                else:
+                    state = app_state.graph.invoke(graph_input, config)
+                _save_turn(session_id, session.version, state)
+        except StaleSessionError:
+            raise HTTPException(status_code=409, detail=STALE_SESSION_DETAIL) from None
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+    return session_id, state["messages"][-1].content
+
+
+def _stream_event(mode: str, chunk) -> tuple[str, dict] | None:
+    """Maps a LangGraph stream chunk to an SSE (event, data) pair, or None to skip it."""
+    if mode == "tasks":
+        status = "finished" if "result" in chunk or "error" in chunk else "started"
+        return "node", {"node": chunk["name"], "status": status}
+
+    message, metadata = chunk
+    node = metadata.get("langgraph_node")
+    if isinstance(message, AIMessageChunk) and message.content:
+        return "token", {"node": node, "content": message.content}
+    # Replies that were not streamed token by token (templates, fixed messages)
+    if isinstance(message, AIMessage) and not isinstance(message, AIMessageChunk):
+        if message.content:
+            return "message", {"node": node, "content": message.content}
+    return None
+
+
+async def stream_model_message(
+    query: str, session_id: str | None = None
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Runs one conversation turn yielding (event, data) pairs as the graph advances:
+    `session` first, then `node` transitions, LLM `token`s and non-streamed
+    `message`s, and finally `done` with the full response (or `error`).
+    """
+    session_id, session = session_store.get_or_create(session_id)
+    yield "session", {"session_id": session_id}
+
+    async with session.lock:
+        state = session.state
+        try:
+            async with _thread_lease(session_id):
+                graph_input, config = await asyncio.to_thread(
+                    _turn_input, session_id, session.state, query
+                )
+                async for mode, chunk in app_state.graph.astream(
+                    graph_input, config, stream_mode=["tasks", "messages", "values"]
+                ):
+                    if mode == "values":
+                        state = chunk
+                    elif event := _stream_event(mode, chunk):
+                        yield event
+                _save_turn(session_id, session.version, state)
+        except StaleSessionError:
+            yield "error", {"detail": STALE_SESSION_DETAIL}
+            return
+        except Exception as e:
+            logger.error(f"Error streaming session {session_id}: {e}")
+            yield "error", {"detail": str(e)}
+            return
+
+    yield "done", {"session_id": session_id, "response": state["messages"][-1].content}
@@ -0,0 +1,127 @@
+import bisect
+import logging
+import threading
+import time
+
+import numpy as np
+
+from app.src.repositories.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+MAX_SCORE = 1000
+
+
+class ScoreLimitTable:
+    """
+    Score-to-limit rules compiled into a sorted interval table.
+    Integer scores in 0..MAX_SCORE are answered from a dense array; anything
+    else falls back to a bisect over the interval starts. Scores not covered
+    by any rule map to 0.0, like the original row-by-row lookup.
+    """
+
+    def __init__(self, rules: list[dict]):
+        rules = sorted(rules, key=lambda rule: rule["min_score"])
+        self._validate(rules)
+
+        self._starts = np.array([rule["min_score"] for rule in rules], dtype=float)
+        self._ends = np.array([rule["max_score"] for rule in rules], dtype=float)
+        self._limits = np.array([rule["max_limit"] for rule in rules], dtype=float)
+        self._starts_list = self._starts.tolist()
+
+        self._dense = np.zeros(MAX_SCORE + 1, dtype=float)
+        for rule in rules:
+            low = max(0, int(np.ceil(rule["min_score"])))
+            high = min(MAX_SCORE, int(np.floor(rule["max_score"])))
+            if low <= high:
+                self._dense[low : high + 1] = rule["max_limit"]
+
+    def __len__(self) -> int:
+        return len(self._starts_list)
+
+    def max_limit(self, score) -> float:
+        """Maximum limit for a single score."""
+        if isinstance(score, (int, np.integer)) and 0 <= score <= MAX_SCORE:
+            return float(self._dense[score])
+
+        position = bisect.bisect_right(self._starts_list, score) - 1
+        if position >= 0 and score <= self._ends[position]:
+            return float(self._limits[position])
+        return 0.0
+
+    def max_limits(self, scores) -> np.ndarray:
+        """Vectorized lookup: maps an array of scores to their maximum limits."""
+        scores = np.asarray(scores, dtype=float)
+        if not len(self):
+            return np.zeros(scores.shape, dtype=float)
+
+        positions = np.searchsorted(self._starts, scores, side="right") - 1
+        clipped = np.clip(positions, 0, None)
+        covered = (positions >= 0) & (scores <= self._ends[clipped])
+        return np.where(covered, self._limits[clipped], 0.0)
+
+    @staticmethod
+    def _validate(rules: list[dict]) -> None:
+        """Overlapping ranges are ambiguous and rejected; gaps are only logged."""
+        previous = None
+        for rule in rules:
+            if rule["min_score"] > rule["max_score"]:
+                raise ValueError(f"Regra de score inválida (min > max): {rule}")
+            if previous is not None:
+                if rule["min_score"] <= previous["max_score"]:
+                    raise ValueError(
+                        f"Regras de score sobrepostas: {previous} e {rule}"
+                    )
+                if rule["min_score"] > previous["max_score"] + 1:
+                    logger.warning(
+                        f"Lacuna na tabela de score entre {previous['max_score']} "
+                        f"e {rule['min_score']}: limite máximo será 0"
+                    )
+            previous = rule
+
+
+class ScoreLimitRules:
+    """
+    Keeps a compiled ScoreLimitTable in sync with the storage rules.
+    Backends that expose a cheap version (file mtime) are checked on every call;
+    the others are re-read at most every `refresh_seconds`.
+    """
+
+    def __init__(self, storage: StorageBackend, refresh_seconds: float = 30.0):
+        self.storage = storage
+        self.refresh_seconds = refresh_seconds
+        self._table: ScoreLimitTable | None = None
+        self._version = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def table(self) -> ScoreLimitTable | None:
+        """Current compiled table, or None if there are no rules."""
+        version = self.storage.score_rules_version()
+        if self._is_stale(version):
+            with self._lock:
+                if self._is_stale(version):
+                    self._reload(version)
+        return self._table
+
+    def _is_stale(self, version) -> bool:
+        if self._table is None:
+            return True
+        if version is None:
+            return time.monotonic() - self._loaded_at >= self.refresh_seconds
+        return version != self._version
+
+    def _reload(self, version) -> None:
+        rules = self.storage.get_score_rules()
+        try:
+            table = ScoreLimitTable(rules) if rules else None
+        except ValueError as e:
+            if self._table is None:
+                raise
+            logger.error(f"Tabela de score inválida, mantendo a anterior: {e}")
+            table = self._table
+
+        self._table = table
+        self._version = version
+        self._loaded_at = time.monotonic()
+        logger.info(f"Tabela de score carregada: {len(rules)} faixas")
@@ -1,14 +1,13 @@
 import logging
-from pathlib import Path
 
-import pandas as pd
+from app.src.repositories.storage import storage
 
 logger = logging.getLogger(__name__)
 
 
 def authenticate_user(cpf: str, birth_date: str) -> dict:
     """
-    Authenticates the customer by validating CPF and birth date against the clients CSV.
+    Authenticates the customer by validating CPF and birth date against the client storage.
 
     Args:
         cpf: Customer's CPF (11 digits, numbers only)
@@ -21,38 +20,29 @@ def authenticate_user(cpf: str, birth_date: str) -> dict:
         f"Authenticate customer called with CPF: {cpf} and Birth Date: {birth_date}"
     )
     try:
-        csv_path = Path("app/src/data/clients.csv")
-        if not csv_path.exists():
+        if not storage.exists():
             return {"authenticated": False, "message": "Base de dados não encontrada"}
 
-        cpf_clean = "".join(filter(str.isdigit, cpf))
-        if len(cpf_clean) != 11:
-            return {
-                "authenticated": False,
-                "message": "CPF inválido. Deve conter 11 dígitos",
-            }
-
-        df = pd.read_csv(csv_path, dtype={"cpf": str})
-        df["cpf"] = df["cpf"].astype(str).str.strip()
-        df["birth_date"] = df["birth_date"].astype(str).str.strip()
-
-        match = df[(df["cpf"] == cpf_clean) & (df["birth_date"] == birth_date)]
-
-        if not match.empty:
-            return {
-                "authenticated": True,
-                "cpf": cpf_clean,
-                "message": "Cliente autenticado com sucesso",
-            }
-        else:
-            cpf_exists = df[df["cpf"] == cpf_clean]
-            if not cpf_exists.empty:
-                return {
-                    "authenticated": False,
-                    "message": "Data de nascimento não confere",
-                }
-            else:
-                return {"authenticated": False, "message": "CPF não encontrado"}
+        return storage.authenticate(cpf, birth_date)
 
     except Exception as e:
         return {"authenticated": False, "message": f"Erro ao autenticar: {str(e)}"}
+
+
+def is_registered_cpf(cpf: str) -> bool:
+    """True if there is a client with this CPF (11 digits, numbers only)."""
+    try:
+        return storage.get_client(cpf) is not None
+    except Exception as e:
+        logger.error(f"Erro ao consultar CPF {cpf}: {e}")
+        return False
+
+
+def get_client_name(cpf: str) -> str | None:
+    """The registered name for this CPF, or None if unknown."""
+    try:
+        client = storage.get_client(cpf)
+    except Exception as e:
+        logger.error(f"Erro ao consultar CPF {cpf}: {e}")
+        return None
+    return client.get("name") if client else None
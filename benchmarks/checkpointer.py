@@ -0,0 +1,194 @@
+"""
+Cost of durable conversations: replays the benchmark scenarios with no
+checkpointer, LangGraph's InMemorySaver and the SQLite checkpointer, and checks
+that a conversation resumes from its last step after the process "restarts"
+(a new graph and checkpointer on the same database file).
+
+    python -m benchmarks.checkpointer --repeat 20 --output checkpointer.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from benchmarks.currency_stub import CurrencyStub
+from benchmarks.graph_nodes import (
+    GraphBenchmark,
+    _git_commit,
+    _summary,
+    prepare_environment,
+)
+from benchmarks.scenarios import AUTH_LUCAS, SCENARIOS
+
+RESUME_MESSAGE = "qual é o meu limite?"
+
+
+def _overhead(results: dict, baseline: dict) -> dict:
+    """Mean conversation latency added per scenario, in ms and percent."""
+    overhead = {}
+    for name, scenario in results["scenarios"].items():
+        mean = scenario["conversation_ms"]["mean"]
+        base = baseline["scenarios"][name]["conversation_ms"]["mean"]
+        turns = len(scenario["turns"])
+        overhead[name] = {
+            "conversation_ms": round(mean - base, 3),
+            "per_turn_ms": round((mean - base) / turns, 3),
+            "percent": round((mean - base) / base * 100, 1) if base else None,
+        }
+    return overhead
+
+
+def resume_check(mode: str, db_path: Path) -> dict:
+    """Authenticates on one graph, then continues the thread on a fresh one."""
+    from app.src.graph.checkpointer import SqliteCheckpointer
+
+    thread_id = "resume-check"
+    config = {"configurable": {"thread_id": thread_id}}
+
+    before = GraphBenchmark(mode, checkpointer=SqliteCheckpointer(db_path))
+    try:
+        state = before._invoke(
+            {
+                **before.new_session_state(),
+                "messages": [HumanMessage(content=AUTH_LUCAS[0])],
+            },
+            config,
+        )
+        for text in AUTH_LUCAS[1:]:
+            state = before._invoke({"messages": [HumanMessage(content=text)]}, config)
+    finally:
+        before.checkpointer.close()
+        before.close()
+
+    started = time.perf_counter()
+    checkpointer = SqliteCheckpointer(db_path)
+    saved = checkpointer.get_tuple(config)
+    load_seconds = time.perf_counter() - started
+
+    after = GraphBenchmark(mode, checkpointer=checkpointer)
+    try:
+        resumed = after._invoke(
+            {"messages": [HumanMessage(content=RESUME_MESSAGE)]}, config
+        )
+        stats = checkpointer.stats()
+    finally:
+        checkpointer.close()
+        after.close()
+
+    return {
+        "authenticated_before": state["authenticated"],
+        "authenticated_after_restart": resumed["authenticated"],
+        "messages_before": len(state["messages"]),
+        "messages_after_restart": len(resumed["messages"]),
+        "cold_load_ms": round(load_seconds * 1000, 3),
+        "saved_step": saved.metadata.get("step") if saved else None,
+        "ok": bool(saved)
+        and resumed["authenticated"]
+        and len(resumed["messages"]) > len(state["messages"]),
+        "database": stats,
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["async", "sync"], default="async")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Run only these scenarios (repeatable)",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch, CurrencyStub() as stub:
+        scratch = Path(scratch)
+        prepare_environment(scratch / "data", stub.base_url)
+        from app.src.config import settings
+        from app.src.graph.checkpointer import SqliteCheckpointer
+
+        scenarios = {
+            name: turns
+            for name, turns in SCENARIOS.items()
+            if not args.scenario or name in args.scenario
+        }
+        checkpointers = {
+            "none": lambda: None,
+            "memory": InMemorySaver,
+            "sqlite": lambda: SqliteCheckpointer(
+                scratch / "checkpoints.db", keep_last=settings.CHECKPOINT_KEEP_LAST
+            ),
+        }
+
+        results = {}
+        for kind, factory in checkpointers.items():
+            benchmark = GraphBenchmark(args.mode, checkpointer=factory())
+            try:
+                results[kind] = benchmark.run(
+                    scenarios, repeat=args.repeat, warmup=args.warmup
+                )
+            finally:
+                if isinstance(benchmark.checkpointer, SqliteCheckpointer):
+                    results[kind]["database"] = benchmark.checkpointer.stats()
+                    benchmark.checkpointer.close()
+                benchmark.close()
+
+        report = {
+            "meta": {
+                "benchmark": "checkpointer",
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "git_commit": _git_commit(),
+                "python": platform.python_version(),
+                "mode": args.mode,
+                "repeat": args.repeat,
+                "warmup": args.warmup,
+                "settings": {"CHECKPOINT_KEEP_LAST": settings.CHECKPOINT_KEEP_LAST},
+            },
+            "conversation_ms": {
+                kind: {
+                    name: scenario["conversation_ms"]
+                    for name, scenario in result["scenarios"].items()
+                }
+                for kind, result in results.items()
+            },
+            "overhead_vs_none": {
+                kind: _overhead(results[kind], results["none"])
+                for kind in ("memory", "sqlite")
+            },
+            "sqlite_vs_memory_per_turn_ms": _summary(
+                [
+                    (
+                        results["sqlite"]["scenarios"][name]["conversation_ms"]["mean"]
+                        - results["memory"]["scenarios"][name]["conversation_ms"][
+                            "mean"
+                        ]
+                    )
+                    / len(turns)
+                    / 1000
+                    for name, turns in scenarios.items()
+                ]
+            ),
+            "database": results["sqlite"].get("database"),
+            "resume": resume_check(args.mode, scratch / "resume.db"),
+        }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
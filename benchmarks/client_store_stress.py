@@ -0,0 +1,197 @@
+"""
+Concurrency stress test of the csv client store: several processes, each with
+several threads, update the credit limits of a synthetic client base at the
+same time, then a fresh store checks that every client holds the last value
+its writer set. Exits with status 1 if any update was lost.
+
+    python -m benchmarks.client_store_stress --processes 4 --threads 4 --updates 200
+
+Every writer owns a disjoint set of clients spread over all CPF prefixes, so
+writers constantly rewrite the same shards; `--layout journal` runs the same
+load against clients.csv plus journal for comparison.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.graph_nodes import _git_commit
+
+
+def _value(process: int, thread: int, n: int) -> float:
+    """credit_limit written by (process, thread) on its n-th update."""
+    return float(process * 10_000_000 + thread * 100_000 + n)
+
+
+def write_clients(path: Path, count: int, seed: int = 7) -> list[str]:
+    """clients.csv with `count` random CPFs over every 2-digit prefix."""
+    rng = random.Random(seed)
+    cpfs = list(
+        dict.fromkeys(f"{rng.randrange(10**11):011d}" for _ in range(count * 2))
+    )
+    cpfs = cpfs[:count]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["cpf", "birth_date", "name", "score", "credit_limit"])
+        for index, cpf in enumerate(cpfs):
+            writer.writerow([cpf, "1990-01-01", f"Cliente {index}", 500, 1000.0])
+    return cpfs
+
+
+def _store(layout: str, data_dir: Path):
+    from app.src.repositories.storage import create_client_store
+
+    return create_client_store(layout, data_dir)
+
+
+def _process(
+    layout: str, data_dir: str, process: int, owned: list[list[str]], updates: int
+) -> tuple[int, int]:
+    """Runs one writer thread per CPF list; returns (updates done, errors)."""
+    store = _store(layout, Path(data_dir))
+    done = [0] * len(owned)
+    errors = [0] * (len(owned) + 1)
+
+    def writer(thread: int, cpfs: list[str]) -> None:
+        for n in range(updates):
+            cpf = cpfs[n % len(cpfs)]
+            try:
+                if store.update(cpf, "credit_limit", _value(process, thread, n)):
+                    done[thread] += 1
+            except Exception:
+                errors[thread] += 1
+
+    threads = [
+        threading.Thread(target=writer, args=(thread, cpfs))
+        for thread, cpfs in enumerate(owned)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        store.compact()
+    except Exception:
+        errors[-1] += 1
+    return sum(done), sum(errors)
+
+
+def expected_values(
+    assignment: list[list[list[str]]], updates: int
+) -> dict[str, float]:
+    """Last credit_limit each writer set on each of its clients."""
+    expected = {}
+    for process, owned in enumerate(assignment):
+        for thread, cpfs in enumerate(owned):
+            for n in range(updates):
+                expected[cpfs[n % len(cpfs)]] = _value(process, thread, n)
+    return expected
+
+
+def run(layout: str, processes: int, threads: int, updates: int, clients: int) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = Path(scratch)
+        cpfs = write_clients(data_dir / "clients.csv", clients)
+        # Shards (if any) are built before the writers start
+        _store(layout, data_dir).get(cpfs[0])
+
+        writers = processes * threads
+        per_writer = [cpfs[index::writers] for index in range(writers)]
+        assignment = [
+            per_writer[process * threads : (process + 1) * threads]
+            for process in range(processes)
+        ]
+
+        started = time.perf_counter()
+        with multiprocessing.get_context("spawn").Pool(processes) as pool:
+            results = pool.starmap(
+                _process,
+                [
+                    (layout, str(data_dir), process, owned, updates)
+                    for process, owned in enumerate(assignment)
+                ],
+            )
+        elapsed = time.perf_counter() - started
+
+        store = _store(layout, data_dir)
+        lost = {
+            cpf: {
+                "expected": value,
+                "found": (store.get(cpf) or {}).get("credit_limit"),
+            }
+            for cpf, value in expected_values(assignment, updates).items()
+            if (store.get(cpf) or {}).get("credit_limit") != value
+        }
+        shard_sizes = [
+            path.stat().st_size for path in (data_dir / "clients").glob("*.csv")
+        ]
+
+    done = sum(count for count, _ in results)
+    return {
+        "layout": layout,
+        "processes": processes,
+        "threads_per_process": threads,
+        "clients": clients,
+        "updates": done,
+        "seconds": round(elapsed, 3),
+        "updates_per_second": round(done / elapsed, 1),
+        "errors": sum(errors for _, errors in results),
+        "clients_checked": len(expected_values(assignment, updates)),
+        "lost_updates": len(lost),
+        "lost_sample": dict(list(lost.items())[:5]),
+        "shards": len(shard_sizes),
+        "mean_shard_bytes": round(sum(shard_sizes) / len(shard_sizes))
+        if shard_sizes
+        else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--layout", action="append", choices=["sharded", "journal"], help="Repeatable"
+    )
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=200, help="Per writer thread")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "benchmark": "client_store_stress",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+        },
+        "runs": [
+            run(layout, args.processes, args.threads, args.updates, args.clients)
+            for layout in args.layout or ["sharded"]
+        ],
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+    if any(
+        run["lost_updates"] or run["errors"]
+        for run in report["runs"]
+        if run["layout"] == "sharded"
+    ):
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
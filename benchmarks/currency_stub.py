@@ -0,0 +1,53 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Fixed bids in BRL, in the AwesomeAPI "/last/USD-BRL,EUR-BRL" response format
+RATES = {
+    "USD": "5.4321",
+    "EUR": "5.8765",
+    "GBP": "6.9012",
+    "BTC": "345678.90",
+}
+
+
+class _QuoteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        pairs = self.path.rsplit("/", 1)[-1].split(",")
+        body = {
+            f"{code}BRL": {"code": code, "codein": "BRL", "bid": RATES[code]}
+            for code in (pair.split("-")[0].upper() for pair in pairs)
+            if code in RATES
+        }
+        status = 200 if body else 404
+        payload = json.dumps(body or {"status": 404}).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CurrencyStub:
+    """Local exchange-rate API on 127.0.0.1 (random port) for offline runs."""
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _QuoteHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "CurrencyStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
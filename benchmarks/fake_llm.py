@@ -0,0 +1,160 @@
+import asyncio
+import re
+import time
+import uuid
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.src.core.text import normalize_text
+from app.src.llm import prompts
+
+# Words the scripted currency agent understands, after normalize_text()
+CURRENCY_WORDS = {
+    "dolar": "USD",
+    "dolares": "USD",
+    "euro": "EUR",
+    "euros": "EUR",
+    "libra": "GBP",
+    "libras": "GBP",
+    "bitcoin": "BTC",
+}
+
+
+def _tool_call(name: str, **args) -> AIMessage:
+    return AIMessage(
+        content="", tool_calls=[{"name": name, "args": args, "id": uuid.uuid4().hex}]
+    )
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for ChatOpenAI. The reply depends only on which
+    PromptTemplate built the prompt (its static first message) and on the
+    conversation, so a replayed scenario always takes the same path through
+    the graph. `latency` simulates the provider round trip (0 measures the
+    graph alone). Bound tools are ignored: the script knows the tool names.
+    """
+
+    latency: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+    def _result(self, messages: list[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        reply = self.reply(messages)
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        reply.usage_metadata = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": len(reply.content) // 4 + 1,
+            "total_tokens": prompt_chars // 4 + len(reply.content) // 4 + 1,
+        }
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+    def reply(self, messages: list[BaseMessage]) -> AIMessage:
+        static = messages[0].content if messages else ""
+        conversation = [m for m in messages if not isinstance(m, SystemMessage)]
+        last = conversation[-1] if conversation else None
+        humans = [m for m in conversation if isinstance(m, HumanMessage)]
+        text = normalize_text(humans[-1].content) if humans else ""
+        after_tool = isinstance(last, ToolMessage)
+
+        if static == prompts.SUPERVISOR_CLASSIFY.static:
+            return AIMessage(content=self._classify(text))
+
+        if static == prompts.TRIAGE_COLLECT_CPF.static:
+            digits = re.sub(r"\D", "", humans[-1].content) if humans else ""
+            if digits:
+                return _tool_call("save_cpf", cpf=digits)
+            return AIMessage(content="Olá! Para começar, informe seu CPF.")
+
+        if static == prompts.TRIAGE_COLLECT_BIRTH_DATE.static:
+            return _tool_call("save_birth_date", birth_date=humans[-1].content)
+
+        if static == prompts.CREDIT_AGENT.static and not after_tool:
+            cpf = self._context_cpf(messages)
+            amount = re.search(r"\d+", text) if "aumentar" in text else None
+            if amount:
+                return _tool_call(
+                    "process_limit_increase_request",
+                    cpf=cpf,
+                    requested_limit=float(amount.group()),
+                )
+            return _tool_call("get_score_and_or_limit", cpf=cpf)
+
+        if static == prompts.CURRENCY_AGENT.static and not after_tool:
+            codes = list(
+                dict.fromkeys(
+                    CURRENCY_WORDS[word]
+                    for word in text.split()
+                    if word in CURRENCY_WORDS
+                )
+            ) or ["USD"]
+            if len(codes) == 1:
+                return _tool_call("get_exchange_rate_tool", coin_code=codes[0])
+            return _tool_call("get_exchange_rates_tool", coin_codes=codes)
+
+        if static == prompts.INTERVIEW_AGENT.static:
+            if "dividas" in text:
+                return _tool_call(
+                    "submit_credit_interview",
+                    cpf=self._context_cpf(messages),
+                    renda_mensal=8000.0,
+                    tipo_emprego="formal",
+                    despesas_fixas=2000.0,
+                    num_dependentes=1,
+                    tem_dividas_ativas=False,
+                )
+            return AIMessage(content="Qual é a sua renda mensal e o tipo de emprego?")
+
+        if static == prompts.MEMORY_SUMMARY.static:
+            return AIMessage(
+                content="Cliente autenticado; conversa sobre crédito e câmbio."
+            )
+
+        if after_tool:
+            return AIMessage(content=f"Pronto, aqui está: {str(last.content)[:80]}")
+        return AIMessage(content="Olá! Como posso ajudar?")
+
+    @staticmethod
+    def _classify(text: str) -> str:
+        if "entrevista" in text:
+            return "INTERVIEW"
+        if "limite" in text or "score" in text:
+            return "CREDIT"
+        if any(word in CURRENCY_WORDS for word in text.split()) or "cotacao" in text:
+            return "CURRENCY"
+        if "tchau" in text or "sair" in text:
+            return "EXIT"
+        return "DIRECT"
+
+    @staticmethod
+    def _context_cpf(messages: list[BaseMessage]) -> str:
+        for message in reversed(messages):
+            found = re.search(r"\d{11}", str(message.content))
+            if found:
+                return found.group()
+        return ""
@@ -0,0 +1,339 @@
+"""
+Offline benchmark of the agent graph: replays the canned conversations in
+`benchmarks/scenarios.py` against `build_graph()` with a scripted chat model and
+a local exchange-rate API, so the numbers are the graph's own overhead (routing,
+state merges, tools, storage) without OpenAI latency.
+
+    python -m benchmarks.graph_nodes --mode async --repeat 20 --output bench.json
+
+Latency comes from plain runs; allocations from one extra run under tracemalloc,
+which would otherwise distort the timings.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from benchmarks.currency_stub import CurrencyStub
+from benchmarks.fake_llm import ScriptedChatModel
+from benchmarks.scenarios import SCENARIOS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_DATA_DIR = REPO_ROOT / "app" / "src" / "data"
+
+
+class NodeProfiler(BaseCallbackHandler):
+    """
+    Times every graph node run (LangGraph reports each node as a chain run whose
+    name is the node name) and, when tracemalloc is on, its net and peak
+    allocations. Records are (node, seconds, net_bytes, peak_bytes).
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.records: list[tuple[str, float, int, int]] = []
+        self._open: dict[UUID, tuple[str, float, int]] = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name")
+        if not metadata or name != metadata.get("langgraph_node"):
+            return
+        if any(node == name for node, _, _ in self._open.values()):
+            return  # inner runnable of a node already being timed
+        allocated = 0
+        if tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._open[run_id] = (name, time.perf_counter(), allocated)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._close(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._close(run_id)
+
+    def _close(self, run_id: UUID) -> None:
+        opened = self._open.pop(run_id, None)
+        if opened is None:
+            return
+        name, started, allocated = opened
+        elapsed = time.perf_counter() - started
+        net = peak = 0
+        if tracemalloc.is_tracing():
+            current, peak_now = tracemalloc.get_traced_memory()
+            net, peak = current - allocated, peak_now - allocated
+        self.records.append((name, elapsed, net, peak))
+
+
+def prepare_environment(data_dir: Path, exchange_url: str) -> None:
+    """Points the app at a scratch copy of the sample data and the local API."""
+    shutil.copytree(SAMPLE_DATA_DIR, data_dir, dirs_exist_ok=True)
+    os.environ.update(
+        {
+            "DATA_DIR": str(data_dir),
+            "STORAGE_BACKEND": "csv",
+            "EXCHANGE_API_BASE_URL": exchange_url,
+            # Every quote goes to the local API instead of the quote cache
+            "EXCHANGE_QUOTE_TTL_SECONDS": "0",
+            "EXCHANGE_QUOTE_TTL_OVERRIDES": "",
+            "EXCHANGE_RATE_LIMIT_PER_SECOND": "1000000",
+            "EXCHANGE_RATE_LIMIT_BURST": "1000000",
+        }
+    )
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+
+def _summary(values: list[float], scale: float = 1000.0) -> dict:
+    ordered = sorted(value * scale for value in values)
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "min": round(ordered[0], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class GraphBenchmark:
+    """Replays each scenario on a fresh session and aggregates the measurements."""
+
+    def __init__(self, mode: str, llm_latency: float = 0.0, checkpointer=None):
+        # Imported here: settings are read at import time, after prepare_environment
+        from app.src.graph.flow import build_graph
+        from app.src.graph.response_cache import response_cache
+        from app.src.llm.registry import llm_registry
+        from app.src.services.model_service import new_session_state
+
+        self.mode = mode
+        self.llm = ScriptedChatModel(latency=llm_latency)
+        for name in ("base", "triage", "credit", "currency", "interview"):
+            setattr(llm_registry, name, self.llm)
+        self.checkpointer = checkpointer
+        self.graph = build_graph(use_async=mode == "async", checkpointer=checkpointer)
+        # One loop for the whole run, as under uvicorn (pools stay bound to it)
+        self.loop = asyncio.new_event_loop() if mode == "async" else None
+        self.new_session_state = new_session_state
+        self.response_cache = response_cache
+
+    def replay(self, turns: list[str], profiler: NodeProfiler) -> list[dict]:
+        """One pass over a conversation; returns the per-turn measurements."""
+        self.response_cache.clear()
+        state = self.new_session_state()
+        # With a checkpointer the thread keeps the state: only new messages are sent
+        config = {"configurable": {"thread_id": uuid4().hex}}
+        results = []
+        for text in turns:
+            message = HumanMessage(content=text)
+            if self.checkpointer is not None and results:
+                graph_input = {"messages": [message]}
+            else:
+                graph_input = {**state, "messages": [*state["messages"], message]}
+            before = len(state["messages"]) + 1
+            llm_calls = self.llm.calls
+            first_record = len(profiler.records)
+
+            allocated = 0
+            if tracemalloc.is_tracing():
+                allocated = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            state = self._invoke(graph_input, {**config, "callbacks": [profiler]})
+            elapsed = time.perf_counter() - started
+
+            nodes = profiler.records[first_record:]
+            turn = {
+                "seconds": elapsed,
+                "nodes": [node for node, *_ in nodes],
+                "llm_calls": self.llm.calls - llm_calls,
+                "tool_messages": sum(
+                    isinstance(message, ToolMessage)
+                    for message in state["messages"][before:]
+                ),
+                "messages_added": len(state["messages"]) - before,
+                "messages_in_state": len(state["messages"]),
+            }
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                turn["net_bytes"] = current - allocated
+                turn["peak_bytes"] = max(
+                    [peak - allocated, *(record[3] for record in nodes)]
+                )
+            results.append(turn)
+        return results
+
+    def _invoke(self, graph_input: dict, config: dict) -> dict:
+        if self.mode == "async":
+            return self.loop.run_until_complete(self.graph.ainvoke(graph_input, config))
+        return self.graph.invoke(graph_input, config)
+
+    def run(self, scenarios: dict[str, list[str]], repeat: int, warmup: int) -> dict:
+        scenario_results = {}
+        profiler, traced_profiler = NodeProfiler(), NodeProfiler()
+
+        for name, turns in scenarios.items():
+            for _ in range(warmup):
+                self.replay(turns, NodeProfiler())
+
+            timed = [self.replay(turns, profiler) for _ in range(repeat)]
+
+            tracemalloc.start()
+            try:
+                traced = self.replay(turns, traced_profiler)
+            finally:
+                tracemalloc.stop()
+
+            scenario_results[name] = {
+                "turns": [
+                    {
+                        "message": text,
+                        "nodes": traced[index]["nodes"],
+                        "llm_calls": traced[index]["llm_calls"],
+                        "tool_messages": traced[index]["tool_messages"],
+                        "messages_added": traced[index]["messages_added"],
+                        "messages_in_state": traced[index]["messages_in_state"],
+                        "latency_ms": _summary(
+                            [run[index]["seconds"] for run in timed]
+                        ),
+                        "alloc_kib": {
+                            "net": round(traced[index]["net_bytes"] / 1024, 1),
+                            "peak": round(traced[index]["peak_bytes"] / 1024, 1),
+                        },
+                    }
+                    for index, text in enumerate(turns)
+                ],
+                "conversation_ms": _summary(
+                    [sum(turn["seconds"] for turn in run) for run in timed]
+                ),
+                "llm_calls": sum(turn["llm_calls"] for turn in traced),
+            }
+
+        return {
+            "scenarios": scenario_results,
+            "nodes": self._nodes(profiler.records, traced_profiler.records),
+        }
+
+    def close(self) -> None:
+        if self.loop is not None:
+            self.loop.close()
+
+    @staticmethod
+    def _nodes(timed: list[tuple], traced: list[tuple]) -> dict:
+        """Latency per node from the timed runs, allocations from the traced one."""
+        seconds: dict[str, list[float]] = {}
+        for node, elapsed, _, _ in timed:
+            seconds.setdefault(node, []).append(elapsed)
+        allocations: dict[str, list[tuple[int, int]]] = {}
+        for node, _, net, peak in traced:
+            allocations.setdefault(node, []).append((net, peak))
+
+        return {
+            node: {
+                "calls": len(seconds[node]),
+                "latency_ms": _summary(seconds[node]),
+                "alloc_kib": {
+                    "mean_net": round(
+                        statistics.fmean(net for net, _ in allocations[node]) / 1024, 1
+                    ),
+                    "max_peak": round(
+                        max(peak for _, peak in allocations[node]) / 1024, 1
+                    ),
+                },
+            }
+            for node in sorted(seconds)
+        }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["async", "sync"], default="async")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--llm-latency",
+        type=float,
+        default=0.0,
+        help="Simulated provider round trip per LLM call, in seconds",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Run only these scenarios (repeatable)",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch, CurrencyStub() as stub:
+        prepare_environment(Path(scratch) / "data", stub.base_url)
+        benchmark = GraphBenchmark(args.mode, llm_latency=args.llm_latency)
+        scenarios = {
+            name: turns
+            for name, turns in SCENARIOS.items()
+            if not args.scenario or name in args.scenario
+        }
+        try:
+            results = benchmark.run(scenarios, repeat=args.repeat, warmup=args.warmup)
+        finally:
+            benchmark.close()
+
+        from app.src.config import settings
+
+        report = {
+            "meta": {
+                "benchmark": "graph_nodes",
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "git_commit": _git_commit(),
+                "python": platform.python_version(),
+                "mode": args.mode,
+                "repeat": args.repeat,
+                "warmup": args.warmup,
+                "llm_latency_s": args.llm_latency,
+                "settings": {
+                    "SUPERVISOR_FAST_PATH": settings.SUPERVISOR_FAST_PATH,
+                    "RESPONSE_TEMPLATE_MODE": settings.RESPONSE_TEMPLATE_MODE,
+                    "RESPONSE_CACHE_ENABLED": settings.RESPONSE_CACHE_ENABLED,
+                    "MEMORY_MAX_MESSAGES": settings.MEMORY_MAX_MESSAGES,
+                },
+            },
+            **results,
+        }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
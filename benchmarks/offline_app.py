@@ -0,0 +1,19 @@
+"""
+`app.main:app` with the scripted chat model in place of OpenAI, for load tests
+that run real uvicorn workers (each worker imports this module):
+
+    uvicorn benchmarks.offline_app:app --workers 4
+
+BENCHMARK_LLM_LATENCY simulates the provider round trip per LLM call, in seconds.
+"""
+
+import os
+
+from app.src.llm.registry import llm_registry
+from benchmarks.fake_llm import ScriptedChatModel
+
+llm = ScriptedChatModel(latency=float(os.getenv("BENCHMARK_LLM_LATENCY", "0")))
+for name in ("base", "triage", "credit", "currency", "interview"):
+    setattr(llm_registry, name, llm)
+
+from app.main import app  # noqa: E402, F401
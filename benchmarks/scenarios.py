@@ -0,0 +1,37 @@
+# Canned conversations replayed by the benchmarks. Clients come from the sample
+# data in app/src/data; every scenario is idempotent so runs can be repeated on
+# the same data directory.
+AUTH_LUCAS = ["oi", "meu cpf é 123.456.789-00", "15/05/1990"]
+AUTH_JOAO = ["olá", "meu cpf é 111.222.333-44", "10/03/1995"]
+
+SCENARIOS: dict[str, list[str]] = {
+    "auth": AUTH_LUCAS,
+    "limit_approved": AUTH_LUCAS
+    + [
+        "qual é o meu limite?",
+        "quero aumentar meu limite para 20000",
+    ],
+    "limit_rejected": AUTH_LUCAS
+    + [
+        "quero aumentar meu limite para 90000",
+    ],
+    "interview": AUTH_JOAO
+    + [
+        "quero fazer a entrevista de crédito",
+        "ganho 8000 por mês com carteira assinada",
+        "gasto 2000 por mês, tenho 1 dependente e não tenho dívidas",
+    ],
+    "currency_cross_rate": AUTH_LUCAS
+    + [
+        "qual a cotação do dólar?",
+        "quanto vale 100 euros em dólares e libras?",
+    ],
+    "exit": AUTH_LUCAS
+    + [
+        "obrigado",
+        "obrigado",
+        "obrigado",
+        "obrigado",
+        "tchau",
+    ],
+}
@@ -0,0 +1,212 @@
+"""
+Throughput of the batch score recalculation: a synthetic cohort of interview
+answers is parsed, scored with `compute_scores` and written to a sharded
+client store of the same size with one bulk update, end to end through
+`CreditService.recalculate_scores`.
+
+    python -m benchmarks.score_batch --rows 1000000
+
+For comparison, the per-client path is timed on samples and extrapolated:
+`score_components` row by row, and `update_client` (one shard rewrite per
+client). A fresh store then checks that the written scores match the
+per-client formula.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.graph_nodes import _git_commit
+
+EMPLOYMENT = ["formal", "autonomo", "autônomo", "desempregado", "Formal ", "estagiario"]
+
+
+def write_cohort(data_dir: Path, rows: int, seed: int = 7) -> Path:
+    """clients.csv with `rows` clients and interviews.csv with one answer each."""
+    rng = np.random.default_rng(seed)
+    cpfs = pd.Series(rng.choice(10**11, size=rows, replace=False)).map("{:011d}".format)
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {
+            "cpf": cpfs,
+            "birth_date": "1990-01-01",
+            "name": "Cliente",
+            "score": 500,
+            "credit_limit": 1000.0,
+        }
+    ).to_csv(data_dir / "clients.csv", index=False)
+
+    interviews = data_dir / "interviews.csv"
+    pd.DataFrame(
+        {
+            "cpf": cpfs,
+            "renda": rng.uniform(0, 20000, rows).round(2),
+            "emprego": rng.choice(EMPLOYMENT, rows),
+            "despesas": rng.uniform(0, 10000, rows).round(2),
+            "dependentes": rng.integers(0, 6, rows),
+            "tem_dividas": rng.choice(["true", "false", "sim", "não"], rows),
+        }
+    ).to_csv(interviews, index=False)
+    return interviews
+
+
+def _storage(data_dir: Path):
+    from app.src.repositories.csv_storage import CsvStorage
+    from app.src.repositories.storage import (
+        create_client_store,
+        create_limit_request_log,
+    )
+
+    return CsvStorage(
+        clients=create_client_store("sharded", data_dir),
+        rules_path=data_dir / "score_limit.csv",
+        limit_log=create_limit_request_log(data_dir),
+    )
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def _per_second(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds else 0.0
+
+
+def _row_answers(answers: pd.DataFrame) -> list[tuple]:
+    from app.src.services.credit_service import _as_boolean
+
+    return [
+        (renda, emprego, despesas, int(dependentes), _as_boolean(tem_dividas))
+        for renda, emprego, despesas, dependentes, tem_dividas in zip(
+            answers["renda"],
+            answers["emprego"],
+            answers["despesas"],
+            answers["dependentes"],
+            answers["tem_dividas"],
+            strict=True,
+        )
+    ]
+
+
+def _loop_scores(rows: list[tuple]) -> list[int]:
+    from app.src.services.credit_service import score_components
+
+    return [int(max(0, min(1000, sum(score_components(*row))))) for row in rows]
+
+
+def run(rows: int, loop_sample: int, write_sample: int, check_sample: int) -> dict:
+    from app.src.services.credit_service import (
+        CreditService,
+        compute_scores,
+        read_interview_csv,
+    )
+
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = Path(scratch)
+        interviews = write_cohort(data_dir, rows)
+        storage = _storage(data_dir)
+        storage.get_client("0")  # shards are built before timing
+        service = CreditService(storage)
+
+        answers, parse_seconds = _timed(read_interview_csv, interviews)
+        scored, compute_seconds = _timed(compute_scores, answers)
+        result, total_seconds = _timed(service.recalculate_scores, answers)
+
+        sample = answers.head(loop_sample)
+        sample_rows = _row_answers(sample)
+        loop, loop_seconds = _timed(_loop_scores, sample_rows)
+        matches = loop == scored["score"].head(loop_sample).tolist()
+
+        write_cpfs = answers["cpf"].head(write_sample).tolist()
+        _, write_seconds = _timed(
+            lambda: [storage.update_client(cpf, "score", 0) for cpf in write_cpfs]
+        )
+        # Put the batch scores back after the per-client write sample
+        service.recalculate_scores(answers.head(write_sample))
+
+        fresh = _storage(data_dir)
+        check = random.Random(1).sample(range(rows), min(check_sample, rows))
+        mismatches = sum(
+            fresh.get_client(answers["cpf"].iat[index])["score"]
+            != int(scored["score"].iat[index])
+            for index in check
+        )
+        shards = len(list((data_dir / "clients").glob("*.csv")))
+
+    return {
+        "rows": rows,
+        "shards": shards,
+        "result": result,
+        "parse_csv_s": round(parse_seconds, 3),
+        "compute_scores_s": round(compute_seconds, 3),
+        "compute_rows_per_second": _per_second(rows, compute_seconds),
+        "recalculate_total_s": round(total_seconds, 3),
+        "recalculate_rows_per_second": _per_second(rows, total_seconds),
+        "bulk_write_s": round(total_seconds - compute_seconds, 3),
+        "per_row": {
+            "score_loop_rows_per_second": _per_second(loop_sample, loop_seconds),
+            "score_loop_extrapolated_s": round(loop_seconds * rows / loop_sample, 1),
+            "update_client_writes_per_second": _per_second(write_sample, write_seconds),
+            "update_client_extrapolated_s": round(
+                write_seconds * rows / write_sample, 1
+            ),
+        },
+        "loop_matches_vectorized": matches,
+        "written_scores_checked": len(check),
+        "written_score_mismatches": mismatches,
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--loop-sample", type=int, default=100_000)
+    parser.add_argument("--write-sample", type=int, default=200)
+    parser.add_argument("--check-sample", type=int, default=10_000)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "benchmark": "score_batch",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "run": run(
+            args.rows,
+            min(args.loop_sample, args.rows),
+            min(args.write_sample, args.rows),
+            args.check_sample,
+        ),
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+    if (
+        not report["run"]["loop_matches_vectorized"]
+        or report["run"]["written_score_mismatches"]
+    ):
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Throughput of the API with N uvicorn workers sharing the SQLite session store:
+starts `benchmarks.offline_app` (scripted chat model, local exchange-rate API)
+with 1, 2, 4 and 8 workers and drives it with concurrent clients replaying the
+benchmark scenarios, each on its own session.
+
+    python -m benchmarks.workers --workers 1 2 4 8 --clients 32 --duration 20
+
+Clients run in this process, on the same host: scaling stops at the number of
+cores (reported in `meta.cpu_count`), minus what the load generator uses.
+
+A race check then runs two workers and sends pairs of turns of one
+conversation at once: every turn answered 200 must be in the checkpointed
+thread exactly once and no turn answered 409 may be, or the run fails.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.currency_stub import CurrencyStub
+from benchmarks.graph_nodes import REPO_ROOT, _git_commit, _summary, prepare_environment
+from benchmarks.scenarios import SCENARIOS
+
+STARTUP_TIMEOUT_SECONDS = 60
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, log_path: Path) -> subprocess.Popen:
+    """uvicorn with `workers` processes, using the environment of this process."""
+    log = log_path.open("wb")
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "benchmarks.offline_app:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=REPO_ROOT,
+        env=os.environ.copy(),
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    log.close()
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            tail = log_path.read_text(errors="replace")[-2000:]
+            raise RuntimeError(f"uvicorn saiu com código {server.returncode}:\n{tail}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/stats/sessions").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError("uvicorn não respondeu a tempo")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGINT)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+async def _client(
+    http: httpx.AsyncClient,
+    scenarios: itertools.cycle,
+    deadline: float,
+    latencies: list[float],
+    statuses: Counter,
+) -> None:
+    """Replays scenarios back to back, one new session each, until the deadline."""
+    while time.monotonic() < deadline:
+        session_id = None
+        for text in next(scenarios):
+            if time.monotonic() >= deadline:
+                return
+            params = {"query": text}
+            if session_id:
+                params["session_id"] = session_id
+            started = time.perf_counter()
+            try:
+                response = await http.post("/chat/message", params=params)
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+                break
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] += 1
+            if response.status_code != 200:
+                break
+            session_id = response.json()["session_id"]
+
+
+async def drive(port: int, clients: int, duration: float) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    scenarios = itertools.cycle(SCENARIOS.values())
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+    ) as http:
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(
+            *(
+                _client(http, scenarios, deadline, latencies, statuses)
+                for _ in range(clients)
+            )
+        )
+        elapsed = time.monotonic() - started
+        sessions = (await http.get("/stats/sessions")).json()
+
+    ok = statuses.get("200", 0)
+    return {
+        "turns": ok,
+        "turns_per_second": round(ok / elapsed, 2),
+        "seconds": round(elapsed, 2),
+        "statuses": dict(statuses),
+        "conflicts": statuses.get("409", 0),
+        "latency_ms": _summary(latencies) if latencies else None,
+        "sessions_in_store": sessions["active_sessions"],
+    }
+
+
+async def race(port: int, rounds: int) -> dict:
+    """Sends two turns of one session at once, `rounds` times."""
+    statuses: Counter = Counter()
+    accepted: list[str] = []
+    rejected: list[str] = []
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", timeout=60
+    ) as http:
+        response = await http.post("/chat/message", params={"query": "oi"})
+        session_id = response.json()["session_id"]
+        for round_ in range(rounds):
+            texts = [f"corrida {round_} {side}" for side in "ab"]
+            responses = await asyncio.gather(
+                *(
+                    http.post(
+                        "/chat/message",
+                        params={"query": text, "session_id": session_id},
+                    )
+                    for text in texts
+                )
+            )
+            for text, response in zip(texts, responses, strict=True):
+                statuses[str(response.status_code)] += 1
+                if response.status_code == 200:
+                    accepted.append(text)
+                elif response.status_code == 409:
+                    rejected.append(text)
+    return {
+        "session_id": session_id,
+        "statuses": statuses,
+        "accepted": accepted,
+        "rejected": rejected,
+    }
+
+
+def _thread_texts(data_dir: Path, session_id: str) -> list[str]:
+    """User messages of the session's checkpointed thread."""
+    from app.src.graph.checkpointer import SqliteCheckpointer
+
+    checkpointer = SqliteCheckpointer(
+        os.getenv("CHECKPOINT_DB_PATH") or data_dir / "checkpoints.db"
+    )
+    try:
+        saved = checkpointer.get_tuple({"configurable": {"thread_id": session_id}})
+    finally:
+        checkpointer.close()
+    messages = saved.checkpoint["channel_values"]["messages"] if saved else []
+    return [message.content for message in messages if message.type == "human"]
+
+
+def run_race(rounds: int) -> dict:
+    """Two workers, concurrent turns of the same conversation."""
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = Path(scratch) / "data"
+        prepare_environment(data_dir, os.environ["EXCHANGE_API_BASE_URL"])
+        port = _free_port()
+        server = start_server(2, port, Path(scratch) / "uvicorn.log")
+        try:
+            result = asyncio.run(race(port, rounds))
+        finally:
+            stop_server(server)
+        thread = Counter(
+            text
+            for text in _thread_texts(data_dir, result["session_id"])
+            if text.startswith("corrida")
+        )
+
+    accepted = Counter(result["accepted"])
+    return {
+        "rounds": rounds,
+        "statuses": dict(result["statuses"]),
+        "conflicts": len(result["rejected"]),
+        "accepted_missing": sorted((accepted - thread).elements()),
+        "rejected_persisted": sorted(
+            text for text in result["rejected"] if text in thread
+        ),
+        "consistent": thread == accepted,
+    }
+
+
+def run(workers: int, clients: int, duration: float, warmup: float) -> dict:
+    """One server with `workers` processes on a fresh copy of the data."""
+    with tempfile.TemporaryDirectory() as scratch:
+        prepare_environment(Path(scratch) / "data", os.environ["EXCHANGE_API_BASE_URL"])
+        port = _free_port()
+        server = start_server(workers, port, Path(scratch) / "uvicorn.log")
+        try:
+            if warmup:
+                asyncio.run(drive(port, clients, warmup))
+            return asyncio.run(drive(port, clients, duration))
+        finally:
+            stop_server(server)
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds per run")
+    parser.add_argument(
+        "--llm-latency",
+        type=float,
+        default=0.0,
+        help="Simulated provider round trip per LLM call, in seconds",
+    )
+    parser.add_argument(
+        "--race-rounds",
+        type=int,
+        default=20,
+        help="Pairs of concurrent turns in the race check (0 skips it)",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    with CurrencyStub() as stub:
+        os.environ.update(
+            {
+                "EXCHANGE_API_BASE_URL": stub.base_url,
+                "SESSION_STORE": "sqlite",
+                "BENCHMARK_LLM_LATENCY": str(args.llm_latency),
+            }
+        )
+        results = {
+            workers: run(workers, args.clients, args.duration, args.warmup)
+            for workers in args.workers
+        }
+        checkpointed = os.getenv("CHECKPOINTER", "sqlite") != "none"
+        race_result = (
+            run_race(args.race_rounds) if args.race_rounds and checkpointed else None
+        )
+
+    baseline = results[args.workers[0]]["turns_per_second"] / args.workers[0]
+    for workers, result in results.items():
+        speedup = result["turns_per_second"] / baseline if baseline else 0.0
+        result["speedup"] = round(speedup, 2)
+        result["efficiency"] = round(speedup / workers, 2)
+
+    report = {
+        "meta": {
+            "benchmark": "workers",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "llm_latency_s": args.llm_latency,
+            "settings": {
+                "SESSION_STORE": "sqlite",
+                "CHECKPOINTER": os.getenv("CHECKPOINTER", "sqlite"),
+            },
+        },
+        "workers": {str(workers): result for workers, result in results.items()},
+        "race": race_result,
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+    if race_result and not race_result["consistent"]:
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()